@@ -1,16 +1,52 @@
 """The Trello integration."""
 from __future__ import annotations
 
-from trello import Member, TrelloClient
+from datetime import timedelta
+import time
+from typing import Any
 
+from homeassistant.components import webhook
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_API_KEY, CONF_API_TOKEN, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
 
-from .const import CONF_BOARD_IDS, DOMAIN
+from .api import TrelloClient, build_url
+from .coalesce import async_get_coalescer
+from .const import (
+    CONF_BOARD_IDS,
+    CONF_CARD_EVENTS,
+    CONF_CARD_SENSORS,
+    CONF_FREQUENT_BOARD_IDS,
+    CONF_INFREQUENT_BOARD_IDS,
+    CONF_STALE_LIMIT,
+    CONF_TODO_LISTS,
+    CONF_UPDATE_MODE,
+    CONF_WEBHOOK_ID,
+    CONF_WORKSPACE_IDS,
+    DATA_MEMBER_BOARDS,
+    DEFAULT_STALE_LIMIT,
+    DOMAIN,
+    FREQUENT_UPDATE_INTERVAL,
+    INFREQUENT_UPDATE_INTERVAL,
+    MEMBER_BOARDS_CACHE_TTL,
+    PUSH_RECONCILE_INTERVAL,
+    STORAGE_VERSION,
+    UPDATE_MODE_POLL,
+    UPDATE_MODE_PUSH,
+    Member,
+)
 from .coordinator import TrelloDataUpdateCoordinator
+from .push import async_setup_webhooks
+from .ratelimit import async_get_governor
+from .services import async_setup_services, async_unload_services
 
 PLATFORMS: list[str] = [Platform.SENSOR]
+# Todo lists are only available from Home Assistant 2023.11
+if hasattr(Platform, "TODO"):
+    PLATFORMS.append(Platform.TODO)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -18,54 +54,223 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     config_boards = entry.options[CONF_BOARD_IDS]
     config_data = entry.data
     trello_client = TrelloClient(
+        async_get_clientsession(hass),
         api_key=config_data[CONF_API_KEY],
-        api_secret=config_data[CONF_API_TOKEN],
+        api_token=config_data[CONF_API_TOKEN],
+        governor=async_get_governor(
+            hass, config_data[CONF_API_KEY], config_data[CONF_API_TOKEN]
+        ),
+        coalescer=async_get_coalescer(hass),
     )
-    trello_coordinator = TrelloDataUpdateCoordinator(hass, trello_client, config_boards)
-    await trello_coordinator.async_config_entry_first_refresh()
+    trello_coordinator = TrelloDataUpdateCoordinator(
+        hass,
+        trello_client,
+        config_boards,
+        entry.options.get(CONF_UPDATE_MODE, UPDATE_MODE_POLL),
+        store=_get_store(hass, entry),
+        card_sensors=entry.options.get(CONF_CARD_SENSORS, []),
+        todo_lists=entry.options.get(CONF_TODO_LISTS, False),
+        card_events=entry.options.get(CONF_CARD_EVENTS, False),
+        stale_limit=_get_stale_limit(entry),
+        board_intervals=_get_board_intervals(entry),
+        workspace_ids=entry.options.get(CONF_WORKSPACE_IDS, []),
+    )
+    if await trello_coordinator.async_load_snapshot():
+        # Start with the saved data rather than waiting on Trello
+        entry.async_create_background_task(
+            hass, trello_coordinator.async_refresh(), "trello first refresh"
+        )
+    else:
+        await trello_coordinator.async_config_entry_first_refresh()
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = trello_coordinator
 
+    if entry.options.get(CONF_UPDATE_MODE) == UPDATE_MODE_PUSH:
+        if CONF_WEBHOOK_ID not in entry.data:
+            hass.config_entries.async_update_entry(
+                entry, data={**entry.data, CONF_WEBHOOK_ID: webhook.async_generate_id()}
+            )
+        if await async_setup_webhooks(hass, entry, trello_coordinator):
+            trello_coordinator.set_intervals(
+                PUSH_RECONCILE_INTERVAL, trello_coordinator.board_intervals
+            )
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_update_entry))
+    async_setup_services(hass)
 
     return True
 
 
 async def async_update_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Update a given config entry."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Update a given config entry.
+
+    Board selection, staleness limit, board interval and sensor summary
+    changes are applied to the running entry, any other change, including
+    workspace selection, reloads the entry.
+    """
+    trello_coordinator: TrelloDataUpdateCoordinator = hass.data[DOMAIN][
+        entry.entry_id
+    ]
+    if (
+        entry.options.get(CONF_UPDATE_MODE, UPDATE_MODE_POLL)
+        != trello_coordinator.update_mode
+        or entry.options.get(CONF_CARD_SENSORS, []) != trello_coordinator.card_sensors
+        or entry.options.get(CONF_TODO_LISTS, False)
+        != (trello_coordinator.card_index is not None)
+        or entry.options.get(CONF_CARD_EVENTS, False)
+        != (trello_coordinator.card_moves is not None)
+        or entry.options.get(CONF_WORKSPACE_IDS, []) != trello_coordinator.workspace_ids
+    ):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    trello_coordinator.stale_limit = _get_stale_limit(entry)
+    if (board_intervals := _get_board_intervals(entry)) != (
+        trello_coordinator.board_intervals
+    ):
+        trello_coordinator.set_intervals(
+            trello_coordinator.default_interval, board_intervals
+        )
+    board_ids = entry.options[CONF_BOARD_IDS]
+    if board_ids == trello_coordinator.selected_board_ids:
+        # Platforms read their options, like summarized boards, on updates
+        trello_coordinator.async_update_listeners()
+        return
+    tracked_board_ids = trello_coordinator.board_ids
+    await trello_coordinator.async_set_board_ids(board_ids)
+    removed_board_ids = set(tracked_board_ids) - set(trello_coordinator.board_ids)
+
+    device_registry = dr.async_get(hass)
+    for board_id in removed_board_ids:
+        if device := device_registry.async_get_device({(DOMAIN, board_id)}):
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=entry.entry_id
+            )
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
+    hass.data[DOMAIN].pop(entry.entry_id)
+    async_unload_services(hass)
     return True
 
 
 async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle removal of an entry."""
     await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    await _get_store(hass, entry).async_remove()
+
+
+def _get_stale_limit(entry: ConfigEntry) -> timedelta:
+    return timedelta(minutes=entry.options.get(CONF_STALE_LIMIT, DEFAULT_STALE_LIMIT))
+
+
+def _get_board_intervals(entry: ConfigEntry) -> dict[str, timedelta]:
+    board_intervals = dict.fromkeys(
+        entry.options.get(CONF_INFREQUENT_BOARD_IDS, []), INFREQUENT_UPDATE_INTERVAL
+    )
+    board_intervals.update(
+        dict.fromkeys(
+            entry.options.get(CONF_FREQUENT_BOARD_IDS, []), FREQUENT_UPDATE_INTERVAL
+        )
+    )
+    return board_intervals
+
+
+def _get_store(hass: HomeAssistant, entry: ConfigEntry) -> Store[dict[str, Any]]:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
 
 
 class TrelloAdapter:
-    """Adapter for Trello lib's client."""
+    """Adapter for the Trello API client."""
 
-    def __init__(self, client: TrelloClient) -> None:
-        """Initialize with Trello lib client."""
+    def __init__(
+        self,
+        client: TrelloClient,
+        cache: dict[
+            tuple[str, str],
+            tuple[float, Member, dict[str, dict[str, str]], dict[str, str]],
+        ]
+        | None = None,
+    ) -> None:
+        """Initialize with Trello API client.
+
+        :param cache: Recently fetched member, boards and workspaces by API key
+            and token.
+        """
         self.client = client
+        self._cache = cache if cache is not None else {}
 
     @classmethod
-    def from_creds(cls, api_key: str, api_token: str) -> TrelloAdapter:
+    def from_creds(
+        cls, hass: HomeAssistant, api_key: str, api_token: str
+    ) -> TrelloAdapter:
         """Initialize with API Key and API Token."""
-        return cls(TrelloClient(api_key=api_key, api_secret=api_token))
+        return cls(
+            TrelloClient(
+                async_get_clientsession(hass),
+                api_key=api_key,
+                api_token=api_token,
+                governor=async_get_governor(hass, api_key, api_token),
+            ),
+            hass.data.setdefault(DATA_MEMBER_BOARDS, {}),
+        )
 
-    def get_member(self) -> Member:
-        """Get member information."""
-        return self.client.get_member("me")
+    async def async_get_member_boards(
+        self,
+    ) -> tuple[Member, dict[str, dict[str, str]]]:
+        """Get member information and all the member's open boards.
 
-    def get_boards(self) -> dict[str, dict[str, str]]:
-        """Get all user's boards."""
-        return {
-            board.id: {"id": board.id, "name": board.name}
-            for board in self.client.list_boards(board_filter="open")
+        Both come from a single request, which is cached for a short time.
+        """
+        _, member, boards, _ = await self._async_get_member()
+        return member, boards
+
+    async def async_get_workspaces(self) -> dict[str, str]:
+        """Get the names of the member's workspaces by ID."""
+        *_, workspaces = await self._async_get_member()
+        return workspaces
+
+    async def _async_get_member(
+        self,
+    ) -> tuple[float, Member, dict[str, dict[str, str]], dict[str, str]]:
+        """Get the member with their boards and workspaces in a single request."""
+        # Keyed on both, as a token only works with the key it was made for
+        cache_key = (self.client.api_key, self.client.api_token)
+        cached = self._cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return cached
+
+        member_json = await self.client.async_fetch_json(
+            build_url(
+                "/members/me",
+                fields="id,email",
+                boards="open",
+                board_fields="name",
+                organizations="all",
+                organization_fields="displayName",
+            )
+        )
+        member = Member(member_json["id"], member_json.get("email") or "")
+        boards = {
+            board["id"]: {"id": board["id"], "name": board["name"]}
+            for board in member_json["boards"]
+        }
+        workspaces = {
+            workspace["id"]: workspace["displayName"]
+            for workspace in member_json.get("organizations", [])
         }
+        self._cache[cache_key] = cached = (
+            time.monotonic() + MEMBER_BOARDS_CACHE_TTL,
+            member,
+            boards,
+            workspaces,
+        )
+        return cached
+
+    async def async_get_boards(self) -> dict[str, dict[str, str]]:
+        """Get all user's boards."""
+        _, boards = await self.async_get_member_boards()
+        return boards
@@ -0,0 +1,183 @@
+"""Apply Trello actions to the coordinator's board data."""
+from __future__ import annotations
+
+from collections.abc import Container
+from dataclasses import replace
+from typing import Any
+
+from .card_index import CardIndex
+from .const import Board, Card, List
+
+CARD_ADDED_ACTIONS = {
+    "createCard",
+    "copyCard",
+    "convertToCardFromCheckItem",
+    "emailCard",
+    "moveCardToBoard",
+}
+CARD_REMOVED_ACTIONS = {"deleteCard", "moveCardFromBoard"}
+# Cards are usually archived before they're deleted, leaving the count then
+CARD_DELETED_ACTIONS = {"deleteCard"}
+LIST_ACTIONS = {"createList", "updateList", "moveListToBoard", "moveListFromBoard"}
+
+HANDLED_ACTION_TYPES = (
+    CARD_ADDED_ACTIONS | CARD_REMOVED_ACTIONS | LIST_ACTIONS | {"updateCard"}
+)
+
+
+def apply_action(
+    boards: dict[str, Board],
+    action: dict[str, Any],
+    open_card_ids: Container[str] | None = None,
+) -> bool:
+    """Replace the action's board in the boards from a single Trello action.
+
+    Return False if the action can't be applied from its own data and the
+    boards need to be fetched again to be accurate.
+
+    :param open_card_ids: The open cards of the action's board, if known.
+        Actions don't say whether a deleted card, or one moved between
+        lists, was open, so they can't be applied without them.
+    """
+    action_type = action["type"]
+    data = action["data"]
+    board = boards.get(data.get("board", {}).get("id"))
+    if board is None:
+        return False
+
+    if action_type in CARD_ADDED_ACTIONS:
+        return _add_cards(boards, board, data["list"]["id"], 1)
+    if action_type in CARD_DELETED_ACTIONS:
+        if open_card_ids is None:
+            return False
+        if data["card"]["id"] not in open_card_ids:
+            # Archived before it was deleted, which already counted it
+            return True
+    if action_type in CARD_REMOVED_ACTIONS:
+        return _add_cards(boards, board, data["list"]["id"], -1)
+    if action_type == "updateCard":
+        return _apply_update_card(boards, board, data, open_card_ids)
+    if action_type == "createList":
+        list_ = data["list"]
+        _replace_list(boards, board, List(list_["id"], list_["name"], 0))
+        return True
+    if action_type == "updateList":
+        return _apply_update_list(boards, board, data)
+
+    # Lists moved between boards arrive with an unknown number of cards
+    return False
+
+
+def apply_card_action(card_index: CardIndex, action: dict[str, Any]) -> bool:
+    """Update the indexed cards from a single Trello action.
+
+    Return False if the action changes cards in a way its data doesn't
+    show, and the board's cards need to be fetched again.
+    """
+    action_type = action["type"]
+    data = action["data"]
+    if action_type == "createCard":
+        card = data["card"]
+        # Cards are created without a due date, which is set by an update
+        card_index.upsert(
+            Card(card["id"], data["list"]["id"], card["name"], None, False)
+        )
+        return True
+    if action_type in CARD_REMOVED_ACTIONS:
+        card_index.remove(data["card"]["id"])
+        return True
+    if action_type == "updateCard":
+        return _apply_update_indexed_card(card_index, data)
+    if action_type == "createList":
+        return True
+    if action_type == "updateList":
+        # Only renaming a list leaves its cards as they were
+        return data.get("old", {}).keys() <= {"name"}
+    # Cards copied or moved in, and lists moved, arrive without their fields
+    return False
+
+
+def _apply_update_indexed_card(card_index: CardIndex, data: dict[str, Any]) -> bool:
+    card = data["card"]
+    old = data.get("old", {})
+    if "closed" in old:
+        if card["closed"]:
+            card_index.remove(card["id"])
+            return True
+        # A reopened card's other fields aren't part of the action
+        return False
+    if (previous := card_index.get(card["id"])) is None or "pos" in old:
+        return False
+    card_index.upsert(
+        replace(
+            previous,
+            list_id=data["listAfter"]["id"] if "idList" in old else previous.list_id,
+            name=card["name"] if "name" in old else previous.name,
+            due=card["due"] if "due" in old else previous.due,
+            due_complete=(
+                card["dueComplete"] if "dueComplete" in old else previous.due_complete
+            ),
+        )
+    )
+    return True
+
+
+def _apply_update_card(
+    boards: dict[str, Board],
+    board: Board,
+    data: dict[str, Any],
+    open_card_ids: Container[str] | None,
+) -> bool:
+    card = data["card"]
+    old = data.get("old", {})
+    if "idList" in old:
+        if open_card_ids is None:
+            return False
+        if card["id"] not in open_card_ids:
+            # An archived card moved between lists isn't counted in either
+            return True
+        if not _add_cards(boards, board, data["listBefore"]["id"], -1):
+            return False
+        return _add_cards(boards, boards[board.id], data["listAfter"]["id"], 1)
+    if "closed" in old:
+        return _add_cards(
+            boards, board, data["list"]["id"], -1 if card["closed"] else 1
+        )
+    return True
+
+
+def _apply_update_list(
+    boards: dict[str, Board], board: Board, data: dict[str, Any]
+) -> bool:
+    list_ = data["list"]
+    old = data.get("old", {})
+    if "closed" in old:
+        if list_["closed"]:
+            lists = {
+                list_id: other
+                for list_id, other in board.lists.items()
+                if list_id != list_["id"]
+            }
+            boards[board.id] = replace(board, lists=lists)
+            return True
+        # A reopened list's cards aren't part of the action
+        return False
+    if "name" in old and (previous := board.lists.get(list_["id"])):
+        _replace_list(boards, board, replace(previous, name=list_["name"]))
+    return True
+
+
+def _add_cards(
+    boards: dict[str, Board], board: Board, list_id: str, count: int
+) -> bool:
+    if (list_ := board.lists.get(list_id)) is None:
+        return False
+    _replace_list(
+        boards, board, replace(list_, card_count=max(list_.card_count + count, 0))
+    )
+    return True
+
+
+def _replace_list(boards: dict[str, Board], board: Board, list_: List) -> None:
+    """Replace the board with a copy that has the given list."""
+    boards[board.id] = replace(board, lists={**board.lists, list_.id: list_})
@@ -0,0 +1,98 @@
+"""Count a board's cards for card sensors in a single pass."""
+from __future__ import annotations
+
+from typing import Any
+
+from .const import (
+    CARD_SENSOR_DUE_SOON,
+    CARD_SENSOR_LABELS,
+    CARD_SENSOR_MEMBERS,
+    CARD_SENSOR_NO_MEMBERS,
+    CARD_SENSOR_OVERDUE,
+    CardAggregates,
+)
+
+# Actions changing card sensors without changing card counts
+CARD_SENSOR_ACTIONS = {
+    "addLabelToCard",
+    "removeLabelFromCard",
+    "addMemberToCard",
+    "removeMemberFromCard",
+    "createLabel",
+    "updateLabel",
+    "deleteLabel",
+}
+
+
+def get_card_fields(card_sensors: list[str]) -> str:
+    """Return the card fields the enabled card sensors need."""
+    # The card ID is always returned, only it is needed to count
+    fields = ["id"]
+    if CARD_SENSOR_LABELS in card_sensors:
+        fields.append("idLabels")
+    if CARD_SENSOR_MEMBERS in card_sensors or CARD_SENSOR_NO_MEMBERS in card_sensors:
+        fields.append("idMembers")
+    if CARD_SENSOR_OVERDUE in card_sensors or CARD_SENSOR_DUE_SOON in card_sensors:
+        fields.extend(("due", "dueComplete"))
+    return ",".join(fields)
+
+
+def get_board_params(card_sensors: list[str]) -> dict[str, str]:
+    """Return the board request parameters the enabled card sensors need."""
+    params = {}
+    if CARD_SENSOR_LABELS in card_sensors:
+        params.update(labels="all", label_fields="name,color")
+    if CARD_SENSOR_MEMBERS in card_sensors:
+        params.update(members="all", member_fields="fullName")
+    return params
+
+
+def aggregate_cards(
+    board: dict[str, Any], lists: list[dict[str, Any]], card_sensors: list[str]
+) -> CardAggregates | None:
+    """Count the board's cards for all enabled card sensors at once.
+
+    Each card is visited once however many card sensors are enabled.
+    """
+    if not card_sensors:
+        return None
+    count_labels = CARD_SENSOR_LABELS in card_sensors
+    count_members = CARD_SENSOR_MEMBERS in card_sensors
+    count_no_members = CARD_SENSOR_NO_MEMBERS in card_sensors
+    count_dues = (
+        CARD_SENSOR_OVERDUE in card_sensors or CARD_SENSOR_DUE_SOON in card_sensors
+    )
+
+    label_names = {
+        label["id"]: label["name"] or label["color"] or label["id"]
+        for label in board.get("labels", [])
+    }
+    member_names = {
+        member["id"]: member["fullName"] for member in board.get("members", [])
+    }
+    label_counts = dict.fromkeys(label_names, 0)
+    member_counts = dict.fromkeys(member_names, 0)
+    no_members = 0
+    dues: list[str] = []
+    for list_ in lists:
+        for card in list_["cards"]:
+            if count_labels:
+                for label_id in card["idLabels"]:
+                    label_counts[label_id] = label_counts.get(label_id, 0) + 1
+            if count_members:
+                for member_id in card["idMembers"]:
+                    member_counts[member_id] = member_counts.get(member_id, 0) + 1
+            if count_no_members and not card["idMembers"]:
+                no_members += 1
+            if count_dues and card["due"] and not card["dueComplete"]:
+                dues.append(card["due"])
+    dues.sort()
+
+    return CardAggregates(
+        label_names,
+        label_counts,
+        member_names,
+        member_counts,
+        no_members,
+        tuple(dues),
+    )
@@ -0,0 +1,174 @@
+"""Asynchronous client for the Trello REST API."""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+from urllib.parse import urlencode
+
+from aiohttp import ClientError, ClientSession
+
+from homeassistant.util.json import json_loads
+
+from .coalesce import BatchCoalescer
+from .metrics import BatchMetrics, current_refresh, record_parse_time
+from .ratelimit import RateLimitGovernor
+from .stream import BatchParser, get_compact
+
+API_URL = "https://api.trello.com/1"
+REQUEST_TIMEOUT = 30
+RATE_LIMIT_RETRIES = 4
+# Bytes of a batch response parsed at a time
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class TrelloError(Exception):
+    """Base error for Trello API requests."""
+
+
+class Unauthorized(TrelloError):
+    """The API key or token was rejected."""
+
+
+class ResourceUnavailable(TrelloError):
+    """Trello responded with a non-successful status."""
+
+
+class RateLimited(ResourceUnavailable):
+    """Trello kept rejecting requests for exceeding its rate limits."""
+
+
+class TrelloClient:
+    """Client for the Trello REST API using a shared aiohttp session."""
+
+    def __init__(
+        self,
+        session: ClientSession,
+        api_key: str,
+        api_token: str,
+        governor: RateLimitGovernor,
+        coalescer: BatchCoalescer | None = None,
+    ) -> None:
+        """Initialize with an aiohttp session, credentials and their rate limit.
+
+        :param coalescer: Shares batched responses with other clients.
+        """
+        self._session = session
+        self.api_key = api_key
+        self.api_token = api_token
+        self.governor = governor
+        self._coalescer = coalescer
+
+    async def async_fetch_json(
+        self,
+        path: str,
+        params: dict[str, str] | None = None,
+        http_method: str = "GET",
+        cost: int = 1,
+        parser: BatchParser | None = None,
+    ) -> Any:
+        """Fetch JSON from the given API path.
+
+        :param cost: Number of requests Trello counts towards its rate limits.
+        :param parser: Parses a successful response as it's received, rather
+            than once it was received in full.
+        """
+        query = {"key": self.api_key, "token": self.api_token, **(params or {})}
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            await self.governor.async_acquire(cost)
+            try:
+                async with asyncio.timeout(REQUEST_TIMEOUT):
+                    response = await self._session.request(
+                        http_method, f"{API_URL}{path}", params=query
+                    )
+                    if parser is not None and response.status == 200:
+                        body = b""
+                        size = 0
+                        async for chunk in response.content.iter_chunked(
+                            STREAM_CHUNK_SIZE
+                        ):
+                            size += len(chunk)
+                            with record_parse_time():
+                                parser.feed(chunk)
+                    else:
+                        body = await response.read()
+                        size = len(body)
+            except (ClientError, asyncio.TimeoutError) as ex:
+                raise TrelloError(f"Error requesting {path}: {ex}") from ex
+
+            if metrics := current_refresh.get():
+                metrics.request_count += 1
+                metrics.bytes_received += size
+            self.governor.update_from_headers(response.headers)
+            if response.status != 429:
+                break
+            if attempt < RATE_LIMIT_RETRIES:
+                await self.governor.async_backoff(attempt)
+        else:
+            raise RateLimited(f"Rate limit exceeded at {path}")
+
+        if response.status == 401:
+            raise Unauthorized(f"{body.decode()} at {path}")
+        if response.status != 200:
+            raise ResourceUnavailable(f"{response.status} {body.decode()} at {path}")
+
+        with record_parse_time():
+            if parser is not None:
+                return parser.close()
+            return json_loads(body)
+
+    async def async_fetch_batch(self, urls: list[str]) -> list[dict[str, Any]]:
+        """Fetch multiple API paths in one request.
+
+        Each response is either ``{"200": payload}`` or an error object with
+        ``statusCode``, ``name`` and ``message``. The body is parsed as it's
+        received, and lists fetched only to count their cards hold a
+        ``cardCount`` instead of their cards.
+        """
+        if self._coalescer is None:
+            return await self._async_fetch_batch(urls)
+
+        fetched_count = 0
+
+        async def fetch(fetch_urls: list[str]) -> list[dict[str, Any]]:
+            nonlocal fetched_count
+            fetched_count += len(fetch_urls)
+            return await self._async_fetch_batch(fetch_urls)
+
+        responses = await self._coalescer.async_fetch_batch(
+            self.api_token, urls, fetch
+        )
+        if metrics := current_refresh.get():
+            metrics.shared_requests += max(len(urls) - fetched_count, 0)
+        return responses
+
+    async def _async_fetch_batch(self, urls: list[str]) -> list[dict[str, Any]]:
+        start = time.perf_counter()
+        try:
+            responses: list[dict[str, Any]] = await self.async_fetch_json(
+                "/batch",
+                {"urls": ",".join(urls)},
+                cost=len(urls),
+                parser=BatchParser(get_compact(urls)),
+            )
+        except TrelloError:
+            _record_batch(urls, start, urls)
+            raise
+        _record_batch(
+            urls,
+            start,
+            [url for url, response in zip(urls, responses) if "200" not in response],
+        )
+        return responses
+
+
+def _record_batch(urls: list[str], start: float, failed_urls: list[str]) -> None:
+    if metrics := current_refresh.get():
+        metrics.batches.append(
+            BatchMetrics(urls, time.perf_counter() - start, failed_urls)
+        )
+
+
+def build_url(path: str, **params: str) -> str:
+    """Build a relative API URL suitable for use within a batch request."""
+    return f"{path}?{urlencode(params)}" if params else path
@@ -0,0 +1,102 @@
+"""Index of open cards kept current between refreshes."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from .const import Card
+
+# Card fields fetched with the lists to index cards
+CARD_INDEX_FIELDS = "name,due,dueComplete"
+
+
+class CardIndex:
+    """Open cards by ID and by list.
+
+    Only boards fetched since the last refresh are indexed again. A list
+    whose cards didn't change keeps the same tuple, so changes can be
+    detected by identity.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without any cards."""
+        self._cards: dict[str, Card] = {}
+        self._list_cards: dict[str, tuple[Card, ...]] = {}
+        self._board_list_ids: dict[str, list[str]] = {}
+
+    def __contains__(self, card_id: object) -> bool:
+        """Return whether the card is open and indexed."""
+        return card_id in self._cards
+
+    def get(self, card_id: str) -> Card | None:
+        """Return an indexed card."""
+        return self._cards.get(card_id)
+
+    def has_board(self, board_id: str) -> bool:
+        """Return whether the board's cards are indexed."""
+        return board_id in self._board_list_ids
+
+    def list_cards(self, list_id: str) -> tuple[Card, ...]:
+        """Return the open cards of a list in their order on the board."""
+        return self._list_cards.get(list_id, ())
+
+    def replace_board(self, board_id: str, lists: list[dict[str, Any]]) -> None:
+        """Index a board's cards from its fetched lists and their cards."""
+        previous_list_ids = self._board_list_ids.get(board_id, [])
+        for list_id in previous_list_ids:
+            self._forget_cards(self._list_cards.get(list_id, ()))
+        list_ids = [list_["id"] for list_ in lists]
+        for list_id in set(previous_list_ids) - set(list_ids):
+            del self._list_cards[list_id]
+
+        for list_ in lists:
+            cards = tuple(
+                Card(
+                    card["id"],
+                    list_["id"],
+                    card["name"],
+                    card["due"],
+                    card["dueComplete"],
+                )
+                for card in list_["cards"]
+            )
+            if self._list_cards.get(list_["id"]) == cards:
+                cards = self._list_cards[list_["id"]]
+            self._list_cards[list_["id"]] = cards
+            self._cards.update((card.id, card) for card in cards)
+        self._board_list_ids[board_id] = list_ids
+
+    def remove_boards(self, board_ids: Iterable[str]) -> None:
+        """Forget the cards of boards no longer tracked."""
+        for board_id in board_ids:
+            for list_id in self._board_list_ids.pop(board_id, []):
+                self._forget_cards(self._list_cards.pop(list_id, ()))
+
+    def upsert(self, card: Card) -> None:
+        """Add a card, or replace it keeping its position in its list."""
+        previous = self._cards.get(card.id)
+        if previous is not None and previous.list_id != card.list_id:
+            self.remove(card.id)
+            previous = None
+        cards = self._list_cards.get(card.list_id, ())
+        if previous is None:
+            cards = (*cards, card)
+        else:
+            cards = tuple(card if other.id == card.id else other for other in cards)
+        self._list_cards[card.list_id] = cards
+        self._cards[card.id] = card
+
+    def remove(self, card_id: str) -> Card | None:
+        """Remove a card, returning it if it was indexed."""
+        if (card := self._cards.pop(card_id, None)) is None:
+            return None
+        self._list_cards[card.list_id] = tuple(
+            other for other in self._list_cards[card.list_id] if other.id != card_id
+        )
+        return card
+
+    def _forget_cards(self, cards: Iterable[Card]) -> None:
+        for card in cards:
+            # A card moved between boards may already be indexed elsewhere
+            if self._cards.get(card.id) is card:
+                del self._cards[card.id]
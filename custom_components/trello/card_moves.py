@@ -0,0 +1,96 @@
+"""Index of each list's card IDs, to tell which cards moved between refreshes."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+_NO_CARDS: frozenset[str] = frozenset()
+
+
+@dataclass(frozen=True, slots=True)
+class CardMove:
+    """A card added to, moved between or removed from tracked lists."""
+
+    card_id: str
+    # None when the card was removed
+    board_id: str | None
+    list_id: str | None
+    # None when the card was added
+    old_board_id: str | None
+    old_list_id: str | None
+
+
+class CardMoveIndex:
+    """Open card IDs of each list of the indexed boards.
+
+    Each fetched board's card IDs are collected into a frozenset per list,
+    which takes a pass over its cards. Lists whose set equals the indexed
+    one are skipped, only the sets of changed lists are diffed. Changes are
+    collected until popped, so a card leaving one board and reaching
+    another fetched in the same refresh is a move.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without any boards."""
+        self._list_cards: dict[str, frozenset[str]] = {}
+        self._board_list_ids: dict[str, set[str]] = {}
+        # Board and list each changed card left or arrived in
+        self._left: dict[str, tuple[str, str]] = {}
+        self._arrived: dict[str, tuple[str, str]] = {}
+
+    def has_board(self, board_id: str) -> bool:
+        """Return whether the board's cards are indexed."""
+        return board_id in self._board_list_ids
+
+    def get_list_id(self, card_id: str) -> str | None:
+        """Return the ID of the list an indexed card is in."""
+        for list_id, card_ids in self._list_cards.items():
+            if card_id in card_ids:
+                return list_id
+        return None
+
+    def replace_board(self, board_id: str, lists: list[dict[str, Any]]) -> None:
+        """Index a board's cards from its lists, collecting cards that changed.
+
+        Nothing is collected for a board that wasn't indexed yet.
+        """
+        list_cards = {
+            list_["id"]: frozenset(card["id"] for card in list_["cards"])
+            for list_ in lists
+        }
+        previous_list_ids = self._board_list_ids.get(board_id)
+        if previous_list_ids is not None:
+            for list_id in previous_list_ids | list_cards.keys():
+                old = self._list_cards.get(list_id, _NO_CARDS)
+                new = list_cards.get(list_id, _NO_CARDS)
+                if old == new:
+                    continue
+                for card_id in old - new:
+                    self._left[card_id] = (board_id, list_id)
+                for card_id in new - old:
+                    self._arrived[card_id] = (board_id, list_id)
+            for list_id in previous_list_ids - list_cards.keys():
+                del self._list_cards[list_id]
+        self._list_cards.update(list_cards)
+        self._board_list_ids[board_id] = set(list_cards)
+
+    def remove_boards(self, board_ids: Iterable[str]) -> None:
+        """Stop indexing boards no longer tracked, without collecting changes."""
+        for board_id in board_ids:
+            for list_id in self._board_list_ids.pop(board_id, ()):
+                self._list_cards.pop(list_id, None)
+
+    def pop_changes(self) -> list[CardMove]:
+        """Return the cards that changed since the last call."""
+        changes: list[CardMove] = []
+        for card_id, (board_id, list_id) in self._arrived.items():
+            old_board_id, old_list_id = self._left.pop(card_id, (None, None))
+            changes.append(
+                CardMove(card_id, board_id, list_id, old_board_id, old_list_id)
+            )
+        for card_id, (old_board_id, old_list_id) in self._left.items():
+            changes.append(CardMove(card_id, None, None, old_board_id, old_list_id))
+        self._arrived = {}
+        self._left = {}
+        return changes
@@ -0,0 +1,137 @@
+"""Share batched responses between config entries watching the same boards."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import LOGGER
+
+DATA_BATCH_COALESCER = "trello_batch_coalescer"
+
+# Seconds a successful response is shared with other tokens
+SHARED_RESPONSE_TTL = 30.0
+# Seconds a token's own successful request proves it can access a board
+ACCESS_TTL = 3600.0
+
+FetchBatch = Callable[[list[str]], Awaitable[list[dict[str, Any]]]]
+
+
+class BatchCoalescer:
+    """Deduplicate batched requests for the same URL across API tokens.
+
+    A response is only shared with other tokens that fetched the same board
+    themselves recently, so no token sees a board it can't access. A token's
+    own responses aren't reused, so it can always fetch current data.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without any responses."""
+        # Expiry, fetching token and response of recent successful requests
+        self._responses: dict[str, tuple[float, str, dict[str, Any]]] = {}
+        self._in_flight: dict[str, asyncio.Future[dict[str, Any] | None]] = {}
+        self._access: dict[tuple[str, str], float] = {}
+
+    async def async_fetch_batch(
+        self, api_token: str, urls: list[str], fetch: FetchBatch
+    ) -> list[dict[str, Any]]:
+        """Fetch the URLs, reusing recent and in-flight responses when allowed.
+
+        :param fetch: Fetches URLs as a batch using the token.
+        """
+        now = time.monotonic()
+        self._prune(now)
+        responses: dict[str, dict[str, Any]] = {}
+        waiting: dict[str, asyncio.Future[dict[str, Any] | None]] = {}
+        missing: list[str] = []
+        for url in urls:
+            if not self._has_access(api_token, url, now):
+                missing.append(url)
+            elif (shared := self._responses.get(url)) and shared[1] != api_token:
+                responses[url] = shared[2]
+            elif (future := self._in_flight.get(url)) is not None:
+                waiting[url] = future
+            else:
+                missing.append(url)
+
+        if missing:
+            responses.update(await self._async_fetch(api_token, missing, fetch))
+        if waiting:
+            await asyncio.wait(waiting.values())
+            failed_urls = []
+            for url, future in waiting.items():
+                if (response := future.result()) is None:
+                    failed_urls.append(url)
+                else:
+                    responses[url] = response
+            if failed_urls:
+                # Other tokens' errors aren't shared, get this token's own
+                responses.update(
+                    await self._async_fetch(api_token, failed_urls, fetch)
+                )
+
+        if len(missing) < len(urls):
+            LOGGER.debug(
+                "Reused %s of %s batched requests", len(urls) - len(missing), len(urls)
+            )
+        return [responses[url] for url in urls]
+
+    async def _async_fetch(
+        self, api_token: str, urls: list[str], fetch: FetchBatch
+    ) -> dict[str, dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        futures = {
+            url: loop.create_future() for url in urls if url not in self._in_flight
+        }
+        self._in_flight.update(futures)
+        responses: dict[str, dict[str, Any]] = {}
+        try:
+            responses = dict(zip(urls, await fetch(urls)))
+        finally:
+            now = time.monotonic()
+            for url, response in responses.items():
+                if "200" not in response:
+                    continue
+                self._responses[url] = (now + SHARED_RESPONSE_TTL, api_token, response)
+                if board_id := board_id_from_url(url):
+                    self._access[(api_token, board_id)] = now + ACCESS_TTL
+            for url, future in futures.items():
+                del self._in_flight[url]
+                response = responses.get(url)
+                future.set_result(
+                    response if response and "200" in response else None
+                )
+        return responses
+
+    def _has_access(self, api_token: str, url: str, now: float) -> bool:
+        if (board_id := board_id_from_url(url)) is None:
+            return False
+        return self._access.get((api_token, board_id), 0) > now
+
+    def _prune(self, now: float) -> None:
+        for url in [
+            url for url, (expires, _, _) in self._responses.items() if expires <= now
+        ]:
+            del self._responses[url]
+        for key in [key for key, expires in self._access.items() if expires <= now]:
+            del self._access[key]
+
+
+@callback
+def async_get_coalescer(hass: HomeAssistant) -> BatchCoalescer:
+    """Get the coalescer shared by all config entries."""
+    coalescer: BatchCoalescer = hass.data.setdefault(
+        DATA_BATCH_COALESCER, BatchCoalescer()
+    )
+    return coalescer
+
+
+def board_id_from_url(url: str) -> str | None:
+    """Return the ID of the board a relative API URL requests, if any."""
+    path = url.split("?")[0].split("/")
+    if len(path) > 2 and path[1] == "boards":
+        return path[2]
+    return None
@@ -1,17 +1,43 @@
 """Config flow for Trello integration."""
 from typing import Any
 
-from trello import Member, Unauthorized
 import voluptuous as vol
 from voluptuous.schema_builder import Schema
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_API_KEY, CONF_API_TOKEN
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import config_validation as cv
 
 from . import TrelloAdapter
-from .const import CONF_BOARD_IDS, CONF_USER_EMAIL, CONF_USER_ID, DOMAIN, LOGGER
+from .api import TrelloError, Unauthorized
+from .const import (
+    CARD_SENSOR_DUE_SOON,
+    CARD_SENSOR_LABELS,
+    CARD_SENSOR_MEMBERS,
+    CARD_SENSOR_NO_MEMBERS,
+    CARD_SENSOR_OVERDUE,
+    CONF_BOARD_IDS,
+    CONF_CARD_EVENTS,
+    CONF_CARD_SENSORS,
+    CONF_FREQUENT_BOARD_IDS,
+    CONF_INFREQUENT_BOARD_IDS,
+    CONF_PROMOTED_LIST_IDS,
+    CONF_STALE_LIMIT,
+    CONF_SUMMARY_BOARD_IDS,
+    CONF_TODO_LISTS,
+    CONF_UPDATE_MODE,
+    CONF_USER_EMAIL,
+    CONF_USER_ID,
+    CONF_WORKSPACE_IDS,
+    DEFAULT_STALE_LIMIT,
+    DOMAIN,
+    LOGGER,
+    UPDATE_MODE_DELTA,
+    UPDATE_MODE_POLL,
+    UPDATE_MODE_PUSH,
+)
 
 CREDS_FORM_SCHEMA = vol.Schema(
     {
@@ -33,8 +59,17 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self.user_email: str = ""
         self.user_id: str = ""
         self.ids_boards: dict[str, dict[str, str]] = {}
+        self.workspaces: dict[str, str] = {}
         self.trello_adapter: TrelloAdapter
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -49,24 +84,31 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self.api_key = user_input[CONF_API_KEY]
         self.api_token = user_input[CONF_API_TOKEN]
         self.trello_adapter = TrelloAdapter.from_creds(
-            user_input[CONF_API_KEY], user_input[CONF_API_TOKEN]
+            self.hass,
+            user_input[CONF_API_KEY],
+            user_input[CONF_API_TOKEN],
         )
 
         try:
-            member = await self._get_current_member()
+            adapter = self.trello_adapter
+            member, self.ids_boards = await adapter.async_get_member_boards()
+            self.workspaces = await adapter.async_get_workspaces()
         except Unauthorized as ex:
-            return await self._show_error_creds_form(ex)
+            LOGGER.error("Unauthorized: %s", ex)
+            return await self._show_error_creds_form("invalid_auth")
+        except TrelloError as ex:
+            LOGGER.error("Unable to connect to Trello: %s", ex)
+            return await self._show_error_creds_form("cannot_connect")
 
         self.user_id = member.id
         self.user_email = member.email
-        self.ids_boards = await self._fetch_all_boards()
 
-        return await self._show_board_form(self.ids_boards)
+        return await self._show_board_form(self.ids_boards, self.workspaces)
 
     async def async_step_boards(self, user_input: dict[str, Any]) -> FlowResult:
-        """Select desired boards to have card counts of per list.
+        """Select desired boards and workspaces to have card counts of per list.
 
-        :param user_input: User's selected boards
+        :param user_input: User's selected boards and workspaces
         """
         board_ids = user_input[CONF_BOARD_IDS]
 
@@ -74,7 +116,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._abort_if_unique_id_configured()
 
         config_data: dict[str, str] = self._get_config_data()
-        config_options = {CONF_BOARD_IDS: board_ids}
+        config_options: dict[str, list[str]] = {CONF_BOARD_IDS: board_ids}
+        if workspace_ids := user_input.get(CONF_WORKSPACE_IDS):
+            config_options[CONF_WORKSPACE_IDS] = workspace_ids
 
         return self.async_create_entry(
             title=self.user_email, data=config_data, options=config_options
@@ -94,29 +138,161 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
     async def _show_board_form(
-        self, ids_boards: dict[str, dict[str, str]]
+        self, ids_boards: dict[str, dict[str, str]], workspaces: dict[str, str]
     ) -> FlowResult:
         return self.async_show_form(
             step_id="boards",
-            data_schema=_get_board_select_schema(ids_boards),
+            data_schema=_get_board_select_schema(ids_boards, workspaces),
         )
 
-    async def _show_error_creds_form(self, ex: Unauthorized) -> FlowResult:
-        LOGGER.error("Unauthorized: %s)", ex)
+    async def _show_error_creds_form(self, error: str) -> FlowResult:
         return self.async_show_form(
             step_id="creds",
             data_schema=CREDS_FORM_SCHEMA,
-            errors={"base": "invalid_auth"},
+            errors={"base": error},
             last_step=False,
         )
 
-    async def _fetch_all_boards(self) -> dict[str, dict[str, str]]:
-        return await self.hass.async_add_executor_job(self.trello_adapter.get_boards)
 
-    async def _get_current_member(self) -> Member:
-        return await self.hass.async_add_executor_job(self.trello_adapter.get_member)
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle options for an existing Trello integration."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Select boards and how their data is kept up to date.
+
+        :param user_input: User's selected boards and update mode
+        """
+        if user_input is not None:
+            return self.async_create_entry(
+                title="", data={**self.config_entry.options, **user_input}
+            )
 
+        trello_adapter = TrelloAdapter.from_creds(
+            self.hass,
+            self.config_entry.data[CONF_API_KEY],
+            self.config_entry.data[CONF_API_TOKEN],
+        )
+        try:
+            ids_boards = await trello_adapter.async_get_boards()
+            workspaces = await trello_adapter.async_get_workspaces()
+        except Unauthorized:
+            return self.async_abort(reason="invalid_auth")
+        except TrelloError as ex:
+            LOGGER.error("Unable to fetch boards: %s", ex)
+            return self.async_abort(reason="cannot_connect")
 
-def _get_board_select_schema(boards: dict[str, dict]) -> Schema:
+        return self.async_show_form(
+            step_id="init",
+            data_schema=_get_options_schema(
+                ids_boards,
+                workspaces,
+                self._get_lists(),
+                self.config_entry.options,
+            ),
+        )
+
+    def _get_lists(self) -> dict[str, str]:
+        """Get the names of the lists on the boards tracked by the entry."""
+        coordinator = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        if coordinator is None or coordinator.data is None:
+            return {}
+        return {
+            list_.id: f"{board.name} / {list_.name}"
+            for board in coordinator.data.values()
+            for list_ in board.lists.values()
+        }
+
+
+def _get_options_schema(
+    boards: dict[str, dict[str, str]],
+    workspaces: dict[str, str],
+    lists: dict[str, str],
+    options: dict[str, Any],
+) -> Schema:
+    board_options = {key: value["name"] for key, value in boards.items()}
+    return vol.Schema(
+        {
+            vol.Required(
+                CONF_BOARD_IDS,
+                default=_get_selected(options, CONF_BOARD_IDS, board_options),
+            ): cv.multi_select(board_options),
+            vol.Required(
+                CONF_WORKSPACE_IDS,
+                default=_get_selected(options, CONF_WORKSPACE_IDS, workspaces),
+            ): cv.multi_select(workspaces),
+            vol.Required(
+                CONF_UPDATE_MODE,
+                default=options.get(CONF_UPDATE_MODE, UPDATE_MODE_POLL),
+            ): vol.In(
+                {
+                    UPDATE_MODE_POLL: "Polling",
+                    UPDATE_MODE_DELTA: "Polling (changes only)",
+                    UPDATE_MODE_PUSH: "Push (Trello webhooks)",
+                }
+            ),
+            vol.Required(
+                CONF_FREQUENT_BOARD_IDS,
+                default=_get_selected(options, CONF_FREQUENT_BOARD_IDS, board_options),
+            ): cv.multi_select(board_options),
+            vol.Required(
+                CONF_INFREQUENT_BOARD_IDS,
+                default=_get_selected(
+                    options, CONF_INFREQUENT_BOARD_IDS, board_options
+                ),
+            ): cv.multi_select(board_options),
+            vol.Required(
+                CONF_SUMMARY_BOARD_IDS,
+                default=_get_selected(options, CONF_SUMMARY_BOARD_IDS, board_options),
+            ): cv.multi_select(board_options),
+            vol.Required(
+                CONF_PROMOTED_LIST_IDS,
+                default=_get_selected(options, CONF_PROMOTED_LIST_IDS, lists),
+            ): cv.multi_select(lists),
+            vol.Required(
+                CONF_CARD_SENSORS, default=options.get(CONF_CARD_SENSORS, [])
+            ): cv.multi_select(
+                {
+                    CARD_SENSOR_LABELS: "Cards per label",
+                    CARD_SENSOR_MEMBERS: "Cards per member",
+                    CARD_SENSOR_NO_MEMBERS: "Cards without members",
+                    CARD_SENSOR_OVERDUE: "Overdue cards",
+                    CARD_SENSOR_DUE_SOON: "Cards due soon",
+                }
+            ),
+            vol.Required(
+                CONF_TODO_LISTS, default=options.get(CONF_TODO_LISTS, False)
+            ): bool,
+            vol.Required(
+                CONF_CARD_EVENTS, default=options.get(CONF_CARD_EVENTS, False)
+            ): bool,
+            vol.Required(
+                CONF_STALE_LIMIT,
+                default=options.get(CONF_STALE_LIMIT, DEFAULT_STALE_LIMIT),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        }
+    )
+
+
+def _get_selected(
+    options: dict[str, Any], key: str, choices: dict[str, str]
+) -> list[str]:
+    """Return the boards, workspaces or lists selected that still exist."""
+    return [choice for choice in options.get(key, []) if choice in choices]
+
+
+def _get_board_select_schema(
+    boards: dict[str, dict], workspaces: dict[str, str]
+) -> Schema:
     options = {key: value["name"] for key, value in boards.items()}
-    return vol.Schema({vol.Required(CONF_BOARD_IDS): cv.multi_select(options)})
+    return vol.Schema(
+        {
+            vol.Required(CONF_BOARD_IDS): cv.multi_select(options),
+            vol.Optional(CONF_WORKSPACE_IDS, default=[]): cv.multi_select(workspaces),
+        }
+    )
@@ -1,7 +1,9 @@
 """Constants for the trello integration."""
 from __future__ import annotations
 
+from bisect import bisect_left
 from dataclasses import dataclass
+from datetime import datetime, timedelta
 import logging
 from typing import Final
 
@@ -12,21 +14,139 @@ LOGGER = logging.getLogger(__package__)
 CONF_USER_ID = "user_id"
 CONF_USER_EMAIL = "user_email"
 CONF_BOARD_IDS = "board_ids"
+CONF_UPDATE_MODE = "update_mode"
+CONF_WEBHOOK_ID = "webhook_id"
+CONF_CARD_SENSORS = "card_sensors"
+CONF_TODO_LISTS = "todo_lists"
+CONF_CARD_EVENTS = "card_events"
+CONF_STALE_LIMIT = "stale_limit"
+CONF_FREQUENT_BOARD_IDS = "frequent_board_ids"
+CONF_INFREQUENT_BOARD_IDS = "infrequent_board_ids"
+CONF_WORKSPACE_IDS = "workspace_ids"
+CONF_SUMMARY_BOARD_IDS = "summary_board_ids"
+CONF_PROMOTED_LIST_IDS = "promoted_list_ids"
 
+DATA_MEMBER_BOARDS = "trello_member_boards"
+# Seconds a member's board list is reused by config and options flows
+MEMBER_BOARDS_CACHE_TTL: Final = 300
 
-@dataclass
+# Fired when open cards are added to, moved between or removed from lists
+EVENT_CARD_ADDED: Final = f"{DOMAIN}_card_added"
+EVENT_CARD_MOVED: Final = f"{DOMAIN}_card_moved"
+EVENT_CARD_REMOVED: Final = f"{DOMAIN}_card_removed"
+
+UPDATE_MODE_POLL = "poll"
+UPDATE_MODE_DELTA = "delta"
+UPDATE_MODE_PUSH = "push"
+
+CARD_SENSOR_LABELS = "labels"
+CARD_SENSOR_MEMBERS = "members"
+CARD_SENSOR_OVERDUE = "overdue"
+CARD_SENSOR_DUE_SOON = "due_soon"
+CARD_SENSOR_NO_MEMBERS = "no_members"
+# Incomplete cards due within this time are due soon
+DUE_SOON: Final = timedelta(days=1)
+
+UPDATE_INTERVAL: Final = timedelta(seconds=60)
+FREQUENT_UPDATE_INTERVAL: Final = timedelta(seconds=30)
+INFREQUENT_UPDATE_INTERVAL: Final = timedelta(minutes=15)
+# How often boards due for a refresh are looked for
+SCHEDULER_TICK: Final = timedelta(seconds=5)
+# Seconds a board's refresh is randomly delayed by
+SCHEDULE_JITTER: Final = 5.0
+STORAGE_VERSION: Final = 1
+SNAPSHOT_SAVE_DELAY: Final = 10
+# Webhooks keep the data current, polling only corrects any drift
+PUSH_RECONCILE_INTERVAL: Final = timedelta(minutes=15)
+
+# Minutes a board's last good data is kept while it can't be fetched
+DEFAULT_STALE_LIMIT: Final = 30
+# Times a board failing with a server error is fetched again within a refresh
+BOARD_RETRIES: Final = 2
+BOARD_RETRY_DELAY: Final = 1.0
+
+# Trello's /batch endpoint accepts at most this many URLs per request
+BATCH_URL_LIMIT: Final = 10
+MAX_CONCURRENT_BATCHES: Final = 4
+# Boards fetched per page of a workspace's boards
+WORKSPACE_PAGE_SIZE: Final = 20
+# More actions than this since the last refresh and the board is fetched again
+ACTIONS_PAGE_LIMIT: Final = 50
+# Seconds writes are queued for, to be sent together
+WRITE_COALESCE_DELAY: Final = 0.2
+MAX_CONCURRENT_WRITES: Final = 10
+# Seconds a pushed action about a card or list written here is an echo
+WRITE_ECHO_TTL: Final = 60
+
+
+@dataclass(frozen=True, slots=True)
+class Member:
+    """A Trello member."""
+
+    id: str
+    email: str
+
+
+@dataclass(frozen=True, slots=True)
 class Board:
-    """A Trello board."""
+    """A Trello board.
+
+    Boards and lists are immutable. An unchanged list or board keeps the
+    same instance between refreshes, so changes can be detected by identity.
+    """
 
     id: str
     name: str
     lists: dict[str, List]
+    # False when the board couldn't be fetched, so its lists are unknown
+    available: bool = True
+    # None unless card sensors are enabled and the board's cards were fetched
+    aggregates: CardAggregates | None = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class List:
     """A Trello list."""
 
     id: str
     name: str
     card_count: int
+
+
+@dataclass(frozen=True, slots=True)
+class Card:
+    """An open Trello card."""
+
+    id: str
+    list_id: str
+    name: str
+    due: str | None
+    due_complete: bool
+
+
+@dataclass(frozen=True, slots=True)
+class CardAggregates:
+    """Counts of a board's open cards for card sensors."""
+
+    label_names: dict[str, str]
+    label_counts: dict[str, int]
+    member_names: dict[str, str]
+    member_counts: dict[str, int]
+    no_members: int
+    # Sorted due dates of incomplete cards, as returned by Trello
+    dues: tuple[str, ...]
+
+    def overdue(self, now: datetime) -> int:
+        """Return the number of incomplete cards due before now."""
+        return bisect_left(self.dues, _trello_date(now))
+
+    def due_soon(self, now: datetime) -> int:
+        """Return the number of incomplete cards due within DUE_SOON of now."""
+        return bisect_left(self.dues, _trello_date(now + DUE_SOON)) - self.overdue(
+            now
+        )
+
+
+def _trello_date(date: datetime) -> str:
+    """Format a UTC date like Trello, so dates compare as strings."""
+    return date.strftime("%Y-%m-%dT%H:%M:%S.") + f"{date.microsecond // 1000:03d}Z"
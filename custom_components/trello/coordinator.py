@@ -1,17 +1,62 @@
 """Data update coordinator for the Trello integration."""
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import replace
+from datetime import datetime, timedelta
+from functools import partial
+import random
+import time
+import zlib
+from typing import Any, TypeVar
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from trello import Board as TrelloBoard
-from trello import List as TrelloList
-from trello import TrelloClient
-from trello.batch.board import Board as BatchBoard
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import LOGGER, Board, List
+from .actions import HANDLED_ACTION_TYPES, apply_action, apply_card_action
+from .aggregates import (
+    CARD_SENSOR_ACTIONS,
+    aggregate_cards,
+    get_board_params,
+    get_card_fields,
+)
+from .api import ResourceUnavailable, TrelloClient, build_url
+from .card_index import CARD_INDEX_FIELDS, CardIndex
+from .card_moves import CardMove, CardMoveIndex
+from .const import (
+    ACTIONS_PAGE_LIMIT,
+    BATCH_URL_LIMIT,
+    BOARD_RETRIES,
+    BOARD_RETRY_DELAY,
+    DEFAULT_STALE_LIMIT,
+    EVENT_CARD_ADDED,
+    EVENT_CARD_MOVED,
+    EVENT_CARD_REMOVED,
+    LOGGER,
+    MAX_CONCURRENT_BATCHES,
+    SCHEDULE_JITTER,
+    SCHEDULER_TICK,
+    SNAPSHOT_SAVE_DELAY,
+    UPDATE_INTERVAL,
+    UPDATE_MODE_DELTA,
+    UPDATE_MODE_POLL,
+    WORKSPACE_PAGE_SIZE,
+    Board,
+    List,
+)
+from .metrics import MetricsHistory, RefreshMetrics, current_refresh, record_parse_time
+from .writes import WriteQueue
+
+# Each board needs a board and a lists sub-request
+REQUESTS_PER_BOARD = 2
+ACTION_FILTER = ",".join(sorted(HANDLED_ACTION_TYPES))
+CARD_SENSOR_ACTION_FILTER = ",".join(sorted(HANDLED_ACTION_TYPES | CARD_SENSOR_ACTIONS))
+
+_T = TypeVar("_T")
 
 
 class TrelloDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Board]]):
@@ -20,63 +65,1070 @@ class TrelloDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Board]]):
     config_entry: ConfigEntry
 
     def __init__(
-        self, hass: HomeAssistant, trello_client: TrelloClient, board_ids: list[str]
+        self,
+        hass: HomeAssistant,
+        trello_client: TrelloClient,
+        board_ids: list[str],
+        update_mode: str = UPDATE_MODE_POLL,
+        store: Store[dict[str, Any]] | None = None,
+        card_sensors: list[str] | None = None,
+        todo_lists: bool = False,
+        card_events: bool = False,
+        stale_limit: timedelta = timedelta(minutes=DEFAULT_STALE_LIMIT),
+        board_intervals: dict[str, timedelta] | None = None,
+        workspace_ids: list[str] | None = None,
     ) -> None:
-        """Initialize the coordinator."""
+        """Initialize the coordinator.
+
+        :param store: Where the latest data is saved to start from next time.
+        :param card_sensors: Card sensors to count each board's cards for.
+        :param todo_lists: Whether to index each list's cards for todo lists.
+        :param card_events: Whether to fire events for cards that were added
+            to, moved between or removed from lists.
+        :param stale_limit: How long a board's last good data is kept while
+            it can't be fetched.
+        :param board_intervals: How often boards are refreshed, if not every
+            UPDATE_INTERVAL.
+        :param workspace_ids: Workspaces whose open boards are all tracked.
+        """
+        # Each tick only refreshes the boards that are due
         super().__init__(
             hass=hass,
             logger=LOGGER,
             name="trello",
-            update_interval=timedelta(seconds=60),
+            update_interval=SCHEDULER_TICK,
         )
         self.client = trello_client
+        # Boards selected on their own, and all tracked boards
+        self.selected_board_ids = board_ids
         self.board_ids = board_ids
+        self.workspace_ids = workspace_ids or []
+        # Open boards of each workspace as of its last fetch
+        self._workspace_board_ids: dict[str, list[str]] = {}
+        self.update_mode = update_mode
+        self.card_sensors = card_sensors or []
+        self.stale_limit = stale_limit
+        self.default_interval = UPDATE_INTERVAL
+        self.board_intervals = board_intervals or {}
+        # Phase of this entry's refreshes, so entries don't refresh in lockstep
+        self._phase = (
+            zlib.crc32(self.config_entry.entry_id.encode()) / 2**32
+            if self.config_entry
+            else random.random()
+        )
+        # Base and jittered time of each board's next refresh
+        self._next_refresh: dict[str, tuple[datetime, datetime]] = {}
+        # Boards and workspaces to refresh on the next tick, whether due or not
+        self._requested_ids: set[str] = set()
+        # Set when a tick had no boards due, so listeners aren't updated
+        self._idle = False
+        self.card_index = CardIndex() if todo_lists else None
+        card_fields = get_card_fields(self.card_sensors).split(",")
+        if self.card_index is not None:
+            card_fields.extend(CARD_INDEX_FIELDS.split(","))
+        self.card_moves = CardMoveIndex() if card_events else None
+        if self.card_moves is not None:
+            # Lists fetched with only their cards' IDs are reduced to a count
+            card_fields.append("idList")
+        self._card_fields = ",".join(dict.fromkeys(card_fields))
+        self._action_filter = (
+            CARD_SENSOR_ACTION_FILTER if self.card_sensors else ACTION_FILTER
+        )
+        # ID of the newest action applied per board, None if it has no actions
+        self._last_action_ids: dict[str, str | None] = {}
+        # Board's dateLastActivity when its lists were last fetched
+        self._last_activity: dict[str, str | None] = {}
+        # When each board's data was last known to be current
+        self._fetched: dict[str, datetime] = {}
+        # Boards served from their last good data because they couldn't be fetched
+        self.stale_board_ids: set[str] = set()
+        # Each list as of the last listener update
+        self._lists: dict[str, List] = {}
+        self._last_update_success_notified = True
+        self._store = store
+        self.metrics = MetricsHistory()
+        self.writes = WriteQueue(hass, trello_client, self._async_reconcile_boards)
+
+    @property
+    def needs_cards(self) -> bool:
+        """Return whether boards are fetched again, not updated from actions.
+
+        Actions don't include everything card sensors and card events need.
+        Todo lists' cards are updated from actions.
+        """
+        return bool(self.card_sensors) or self.card_moves is not None
+
+    def apply_trello_action(
+        self, boards: dict[str, Board], action: dict[str, Any]
+    ) -> bool:
+        """Apply a Trello action to the boards and to the indexed cards.
+
+        Return False if it can't be applied from its own data, including when
+        it lacks data its type should have, and its board needs to be fetched
+        again. The boards may then be partly updated.
+        """
+        try:
+            if not apply_action(boards, action, self.card_index):
+                return False
+            return self.card_index is None or apply_card_action(
+                self.card_index, action
+            )
+        except KeyError as ex:
+            LOGGER.debug("Trello %s action is missing %s", action["type"], ex)
+            return False
+
+    async def async_load_snapshot(self) -> bool:
+        """Use the data saved by a previous run until the first refresh.
+
+        Return False if there's no saved data for any of the boards.
+        """
+        if self._store is None:
+            return False
+        if (snapshot := await self._store.async_load()) is None:
+            return False
+        saved_boards = snapshot["boards"]
+        self._workspace_board_ids = {
+            workspace_id: board_ids
+            for workspace_id, board_ids in snapshot.get("workspaces", {}).items()
+            if workspace_id in self.workspace_ids
+        }
+        self.board_ids = self._get_tracked_board_ids()
+        if not any(board_id in saved_boards for board_id in self.board_ids):
+            return False
 
-    def _update(self) -> dict[str, Board]:
-        """Fetch data for all sensors as a batch."""
-        batch_requests = []
+        boards: dict[str, Board] = {}
         for board_id in self.board_ids:
-            batch_requests.append(BatchBoard.GetBoard(board_id, ['name']))
-            batch_requests.append(BatchBoard.GetLists(board_id, ['name'], 'open', ['idCard']))
-        LOGGER.debug("Fetching boards lists")
-        batch_responses = self.client.fetch_batch(batch_requests)
+            if board_id not in saved_boards:
+                boards[board_id] = Board(board_id, "", {}, available=False)
+                continue
+            name, lists = saved_boards[board_id]
+            boards[board_id] = Board(
+                board_id,
+                name,
+                {
+                    list_id: List(list_id, list_name, card_count)
+                    for list_id, list_name, card_count in lists
+                },
+            )
+            if board_id in snapshot["last_activity"]:
+                self._last_activity[board_id] = snapshot["last_activity"][board_id]
+            if (
+                self.update_mode == UPDATE_MODE_DELTA
+                and board_id in snapshot["last_action_ids"]
+            ):
+                self._last_action_ids[board_id] = snapshot["last_action_ids"][
+                    board_id
+                ]
+
+        LOGGER.debug("Loaded saved data for %s boards", len(saved_boards))
+        self.data = boards
+        return True
 
-        return _get_boards(batch_responses, self.board_ids)
+    def _snapshot(self) -> dict[str, Any]:
+        """Serialize the available boards and where their data is current to."""
+        boards = {
+            board.id: [
+                board.name,
+                [
+                    [list_.id, list_.name, list_.card_count]
+                    for list_ in board.lists.values()
+                ],
+            ]
+            for board in self.data.values()
+            if board.available
+        }
+        return {
+            "boards": boards,
+            "last_activity": {
+                board_id: last_activity
+                for board_id, last_activity in self._last_activity.items()
+                if board_id in boards
+            },
+            "last_action_ids": {
+                board_id: last_action_id
+                for board_id, last_action_id in self._last_action_ids.items()
+                if board_id in boards
+            },
+            "workspaces": self._workspace_board_ids,
+        }
+
+    async def async_set_board_ids(self, board_ids: list[str]) -> None:
+        """Change which boards are selected, fetching only newly added boards.
+
+        Boards of the tracked workspaces stay tracked when deselected.
+        """
+        self.selected_board_ids = board_ids
+        board_ids = self._get_tracked_board_ids()
+        added_board_ids = [
+            board_id for board_id in board_ids if board_id not in self.board_ids
+        ]
+        self._set_tracked_board_ids(board_ids)
+
+        added_boards: dict[str, Board] = {}
+        if added_board_ids:
+            try:
+                added_boards = await self._async_fetch_all_boards(added_board_ids)
+            except UpdateFailed as ex:
+                LOGGER.error("Unable to fetch added boards: %s", ex)
+                added_boards = {
+                    board_id: Board(board_id, "", {}, available=False)
+                    for board_id in added_board_ids
+                }
+            self._schedule_next_refresh(added_board_ids)
+        # A refresh may have completed meanwhile, or still be running
+        boards = {**(self.data or {}), **added_boards}
+        self.async_set_updated_data(
+            {
+                board_id: boards[board_id]
+                for board_id in self.board_ids
+                if board_id in boards
+            }
+        )
+
+    def _get_tracked_board_ids(self) -> list[str]:
+        """Return the selected boards followed by the workspaces' other boards."""
+        return list(
+            dict.fromkeys(
+                [
+                    *self.selected_board_ids,
+                    *(
+                        board_id
+                        for board_ids in self._workspace_board_ids.values()
+                        for board_id in board_ids
+                    ),
+                ]
+            )
+        )
+
+    def _set_tracked_board_ids(self, board_ids: list[str]) -> None:
+        """Track the given boards, forgetting all about the others."""
+        for board_id in set(self.board_ids) - set(board_ids):
+            self._last_action_ids.pop(board_id, None)
+            self._last_activity.pop(board_id, None)
+            self._fetched.pop(board_id, None)
+            self._next_refresh.pop(board_id, None)
+            self.stale_board_ids.discard(board_id)
+            if self.card_index is not None:
+                self.card_index.remove_boards([board_id])
+            if self.card_moves is not None:
+                self.card_moves.remove_boards([board_id])
+        self.board_ids = board_ids
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners whose list was added, removed or changed.
+
+        Listeners without a context, and all listeners when the coordinator
+        became (un)available, are always updated. Nothing is updated after a
+        tick without any boards due. Card events are then fired for the
+        cards that changed lists.
+        """
+        if self._idle:
+            self._idle = False
+            return
+        lists = _get_lists(self.data or {})
+        update_all = self.last_update_success != self._last_update_success_notified
+        changed_list_ids = {
+            list_id
+            for list_id in lists.keys() | self._lists.keys()
+            # Unchanged lists are usually the same instance
+            if lists.get(list_id) is not self._lists.get(list_id)
+            and lists.get(list_id) != self._lists.get(list_id)
+        }
+        previous_lists = self._lists
+        self._lists = lists
+        self._last_update_success_notified = self.last_update_success
+        if self._store and self.data is not None and self.last_update_success:
+            self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
+
+        for update_callback, context in list(self._listeners.values()):
+            if update_all or context is None or context in changed_list_ids:
+                update_callback()
+
+        if self.card_moves is not None:
+            for card_move in self.card_moves.pop_changes():
+                self._fire_card_event(card_move, previous_lists, lists)
+
+    def _fire_card_event(
+        self,
+        card_move: CardMove,
+        previous_lists: dict[str, List],
+        lists: dict[str, List],
+    ) -> None:
+        """Fire the event for a card added to, moved between or removed from lists."""
+
+        def list_name(list_id: str) -> str | None:
+            list_ = lists.get(list_id) or previous_lists.get(list_id)
+            return list_.name if list_ else None
+
+        event_data: dict[str, Any] = {"card_id": card_move.card_id}
+        if card_move.list_id is not None:
+            event_data.update(
+                board_id=card_move.board_id,
+                list_id=card_move.list_id,
+                list_name=list_name(card_move.list_id),
+            )
+        if card_move.old_list_id is None:
+            self.hass.bus.async_fire(EVENT_CARD_ADDED, event_data)
+        elif card_move.list_id is None:
+            event_data.update(
+                board_id=card_move.old_board_id,
+                list_id=card_move.old_list_id,
+                list_name=list_name(card_move.old_list_id),
+            )
+            self.hass.bus.async_fire(EVENT_CARD_REMOVED, event_data)
+        else:
+            event_data.update(
+                old_board_id=card_move.old_board_id,
+                old_list_id=card_move.old_list_id,
+                old_list_name=list_name(card_move.old_list_id),
+            )
+            self.hass.bus.async_fire(EVENT_CARD_MOVED, event_data)
+
+    def set_intervals(
+        self, default_interval: timedelta, board_intervals: dict[str, timedelta]
+    ) -> None:
+        """Change how often boards are refreshed, spreading them out again."""
+        self.default_interval = default_interval
+        self.board_intervals = board_intervals
+        self._next_refresh.clear()
+        self._schedule_next_refresh(self._get_scheduled_ids())
+
+    def _get_scheduled_ids(self) -> list[str]:
+        """Return the boards refreshed on their own, then the workspaces.
+
+        A workspace's boards are all refreshed along with the workspace.
+        """
+        workspace_board_ids = {
+            board_id
+            for board_ids in self._workspace_board_ids.values()
+            for board_id in board_ids
+        }
+        return [
+            board_id
+            for board_id in self.selected_board_ids
+            if board_id not in workspace_board_ids
+        ] + self.workspace_ids
+
+    async def async_request_board_refresh(self, board_ids: Iterable[str]) -> None:
+        """Refresh the given boards soon, even if they aren't due.
+
+        A workspace's board refreshes its workspace. Their scheduled
+        refreshes are kept.
+        """
+        scheduled_ids = self._get_scheduled_ids()
+        for board_id in board_ids:
+            if board_id in scheduled_ids:
+                self._requested_ids.add(board_id)
+                continue
+            self._requested_ids.update(
+                workspace_id
+                for workspace_id, workspace_board_ids in (
+                    self._workspace_board_ids.items()
+                )
+                if board_id in workspace_board_ids
+            )
+        await self.async_request_refresh()
+
+    def _due_ids(self) -> list[str]:
+        """Return the boards and workspaces due for a refresh."""
+        now = dt_util.utcnow()
+        return [
+            scheduled_id
+            for scheduled_id in self._get_scheduled_ids()
+            if scheduled_id not in self._next_refresh
+            or self._next_refresh[scheduled_id][1] <= now
+        ]
+
+    def _schedule_next_refresh(self, board_ids: list[str]) -> None:
+        """Schedule the next refresh of boards or workspaces just refreshed.
+
+        Boards keep their place in their interval. Boards without one yet
+        are spread evenly over their interval, offset by this entry's phase.
+        """
+        now = dt_util.utcnow()
+        unscheduled: dict[timedelta, list[str]] = {}
+        for board_id in board_ids:
+            interval = self.board_intervals.get(board_id, self.default_interval)
+            if board_id not in self._next_refresh:
+                unscheduled.setdefault(interval, []).append(board_id)
+                continue
+            base = self._next_refresh[board_id][0]
+            # Skip refreshes missed while Home Assistant was busy
+            base += interval * (max((now - base) // interval, 0) + 1)
+            self._set_next_refresh(board_id, base)
+
+        for interval, interval_board_ids in unscheduled.items():
+            for i, board_id in enumerate(interval_board_ids):
+                self._set_next_refresh(
+                    board_id,
+                    now + interval * ((i + self._phase) / len(interval_board_ids)),
+                )
+
+    def _set_next_refresh(self, board_id: str, base: datetime) -> None:
+        jitter = timedelta(seconds=random.uniform(0, SCHEDULE_JITTER))
+        self._next_refresh[board_id] = (base, base + jitter)
 
     async def _async_update_data(self) -> dict[str, Board]:
-        """Send request to the executor."""
-        return await self.hass.async_add_executor_job(self._update)
+        """Fetch data for the boards that are due, recording where the time went."""
+        due_ids = self._due_ids()
+        requested_ids = [
+            scheduled_id
+            for scheduled_id in self._get_scheduled_ids()
+            if scheduled_id in self._requested_ids and scheduled_id not in due_ids
+        ]
+        self._requested_ids.clear()
+        if self.data is not None and not due_ids and not requested_ids:
+            if not self.last_update_success:
+                # Stay unavailable until the boards that failed are due again
+                raise UpdateFailed(str(self.last_exception))
+            self._idle = True
+            return self.data
+
+        metrics = RefreshMetrics(dt_util.utcnow())
+        token = current_refresh.set(metrics)
+        start = time.perf_counter()
+        try:
+            return await self._async_fetch_data(due_ids + requested_ids)
+        finally:
+            # Boards refreshed on request keep their scheduled refresh
+            self._schedule_next_refresh(due_ids)
+            metrics.latency = time.perf_counter() - start
+            metrics.rate_limit_remaining = self.client.governor.remaining
+            current_refresh.reset(token)
+            self.metrics.record(metrics)
+            LOGGER.debug(
+                "Refreshed in %.3f seconds with %s requests and %s bytes",
+                metrics.latency,
+                metrics.request_count,
+                metrics.bytes_received,
+            )
+
+    async def _async_fetch_data(self, due_ids: list[str]) -> dict[str, Board]:
+        """Fetch data for the given boards and workspaces.
+
+        Only changes of boards are fetched if possible, a workspace's boards
+        are always fetched in full. Other boards keep their current data,
+        including pushed actions and writes applied during the refresh.
+        """
+        workspace_ids = [due_id for due_id in due_ids if due_id in self.workspace_ids]
+        board_ids = [board_id for board_id in due_ids if board_id not in workspace_ids]
+        fetched: dict[str, Board] = {}
+        if workspace_ids:
+            fetched.update(await self._async_fetch_workspaces(workspace_ids))
+        if self.data is None:
+            fetched.update(await self._async_fetch_all_boards(board_ids))
+        elif self.update_mode == UPDATE_MODE_DELTA:
+            fetched.update(await self._async_update_from_actions(board_ids))
+        else:
+            fetched.update(await self._async_update_active_boards(board_ids))
+        boards = {**(self.data or {}), **fetched}
+        return {
+            board_id: boards[board_id]
+            for board_id in self.board_ids
+            if board_id in boards
+        }
 
+    async def _async_fetch_workspaces(
+        self, workspace_ids: list[str]
+    ) -> dict[str, Board]:
+        """Fetch every open board of the given workspaces with their lists.
 
-def _get_boards(batch_response: list[dict], board_ids: list[str]) -> dict[str, Board]:
+        Workspaces are fetched a page of boards at a time, the same page of
+        each workspace in one batch, so the number of requests grows with
+        workspaces rather than boards. Boards new to a workspace are tracked
+        and boards no longer in it are dropped.
+        """
+        workspace_boards: dict[str, dict[str, dict[str, Any]]] = {
+            workspace_id: {} for workspace_id in workspace_ids
+        }
+        errors: dict[str, BaseException] = {}
+        page = 0
+        pending = workspace_ids
+        while pending:
+            chunks = _chunk_board_ids(pending, 1)
+            LOGGER.debug("Fetching page %s of workspaces %s", page, pending)
+            results = await _async_gather_chunks(
+                chunks, partial(self._async_fetch_workspace_page, page)
+            )
+            pending = []
+            for chunk, result in zip(chunks, results):
+                if isinstance(result, BaseException):
+                    errors.update(dict.fromkeys(chunk, result))
+                    continue
+                for workspace_id, response in zip(chunk, result):
+                    if "200" not in response:
+                        errors[workspace_id] = ResourceUnavailable(
+                            f"{response.get('statusCode')} {response.get('message')}"
+                        )
+                        continue
+                    boards = workspace_boards[workspace_id]
+                    new_boards = [
+                        board for board in response["200"] if board["id"] not in boards
+                    ]
+                    boards.update((board["id"], board) for board in new_boards)
+                    # A page repeating earlier boards means paging isn't supported
+                    if len(response["200"]) >= WORKSPACE_PAGE_SIZE and new_boards:
+                        pending.append(workspace_id)
+            page += 1
+
+        chunks = []
+        fetched: list[dict[str, Board] | BaseException] = []
+        for workspace_id in workspace_ids:
+            if workspace_id in errors:
+                chunks.append(self._workspace_board_ids.get(workspace_id, []))
+                fetched.append(errors[workspace_id])
+                continue
+            boards = workspace_boards[workspace_id]
+            self._workspace_board_ids[workspace_id] = list(boards)
+            chunks.append(list(boards))
+            fetched.append(self._get_workspace_boards(boards.values()))
+        self._set_tracked_board_ids(self._get_tracked_board_ids())
+        return self._merge_fetched_boards(chunks, fetched)
+
+    async def _async_fetch_workspace_page(
+        self, page: int, workspace_ids: list[str]
+    ) -> list[dict[str, Any]]:
+        """Fetch a page of each of the given workspaces' boards as a batch."""
+        return await self.client.async_fetch_batch(
+            [self._workspace_url(workspace_id, page) for workspace_id in workspace_ids]
+        )
+
+    def _get_workspace_boards(
+        self, workspace_boards: Iterable[dict[str, Any]]
+    ) -> dict[str, Board]:
+        """Build boards from a workspace's boards, indexing their cards."""
+        boards: dict[str, Board] = {}
+        with record_parse_time():
+            for board in workspace_boards:
+                lists = _get_workspace_board_lists(board)
+                self._mark_current(board["id"])
+                if self.card_index is not None:
+                    self.card_index.replace_board(board["id"], lists)
+                if self.card_moves is not None:
+                    self.card_moves.replace_board(board["id"], lists)
+                boards[board["id"]] = _get_board(
+                    board,
+                    lists,
+                    (self.data or {}).get(board["id"]),
+                    self.card_sensors,
+                )
+        return boards
+
+    def _workspace_url(self, workspace_id: str, page: int) -> str:
+        # Cards aren't nested in their lists, so their list is needed
+        card_fields = ",".join(dict.fromkeys([*self._card_fields.split(","), "idList"]))
+        return build_url(
+            f"/organizations/{workspace_id}/boards",
+            filter="open",
+            fields="name,dateLastActivity",
+            lists="open",
+            list_fields="name",
+            cards="open",
+            card_fields=card_fields,
+            limit=str(WORKSPACE_PAGE_SIZE),
+            page=str(page),
+            **get_board_params(self.card_sensors),
+        )
+
+    async def _async_fetch_all_boards(self, board_ids: list[str]) -> dict[str, Board]:
+        """Fetch batches of requests concurrently."""
+        chunks = _chunk_board_ids(board_ids, REQUESTS_PER_BOARD)
+        LOGGER.debug("Fetching boards lists in %s batches", len(chunks))
+        results = await _async_gather_chunks(chunks, self._async_fetch_boards)
+
+        return self._merge_fetched_boards(chunks, results)
+
+    async def _async_update_active_boards(
+        self, due_board_ids: list[str]
+    ) -> dict[str, Board]:
+        """Fetch lists only for due boards with activity since the last refresh.
+
+        Each board's last activity date is fetched first. Boards whose date
+        hasn't moved keep their current data.
+        """
+        chunks = _chunk_board_ids(due_board_ids, 1)
+        LOGGER.debug("Fetching boards activity in %s batches", len(chunks))
+        results = await _async_gather_chunks(chunks, self._async_fetch_activity)
+
+        board_id_board_responses: dict[str, dict[str, Any]] = {}
+        unknown_board_ids: list[str] = []
+        for board_ids, result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                unknown_board_ids.extend(board_ids)
+                continue
+            board_id_board_responses.update(zip(board_ids, result))
+
+        active_board_ids: list[str] = []
+        updated_boards: dict[str, Board] = {}
+        for board_id, board_response in board_id_board_responses.items():
+            board = (self.data or {}).get(board_id)
+            if (
+                board is None
+                or "200" not in board_response
+                or board_id not in self._last_activity
+                # Saved data doesn't include card sensors' counts or cards
+                or (self.card_sensors and board.aggregates is None)
+                or (self.card_index and not self.card_index.has_board(board_id))
+                or (self.card_moves and not self.card_moves.has_board(board_id))
+                or board_response["200"].get("dateLastActivity")
+                != self._last_activity[board_id]
+            ):
+                active_board_ids.append(board_id)
+                continue
+            self._mark_current(board_id)
+            name = board_response["200"]["name"]
+            updated_boards[board_id] = (
+                board if board.name == name else replace(board, name=name)
+            )
+
+        LOGGER.debug("Fetching lists of active boards with IDs %s", active_board_ids)
+        if active_board_ids:
+            updated_boards.update(
+                await self._async_fetch_active_boards(
+                    active_board_ids, board_id_board_responses
+                )
+            )
+        if unknown_board_ids:
+            updated_boards.update(
+                await self._async_fetch_all_boards(unknown_board_ids)
+            )
+        return updated_boards
+
+    async def _async_fetch_active_boards(
+        self,
+        board_ids: list[str],
+        board_id_board_responses: dict[str, dict[str, Any]],
+    ) -> dict[str, Board]:
+        """Fetch the lists of boards whose activity was already fetched."""
+
+        async def fetch_lists(board_ids: list[str]) -> dict[str, Board]:
+            list_responses = await self.client.async_fetch_batch(
+                [_lists_url(board_id, self._card_fields) for board_id in board_ids]
+            )
+            batch_responses = []
+            for board_id, list_response in zip(board_ids, list_responses):
+                batch_responses.append(board_id_board_responses[board_id])
+                batch_responses.append(list_response)
+            batch_responses = await self._async_retry_boards(
+                board_ids, batch_responses
+            )
+            self._update_board_marks(batch_responses, board_ids)
+            self._update_card_index(batch_responses, board_ids)
+            with record_parse_time():
+                return _get_boards(
+                    batch_responses, board_ids, self.data or {}, self.card_sensors
+                )
+
+        chunks = _chunk_board_ids(board_ids, 1)
+        results = await _async_gather_chunks(chunks, fetch_lists)
+        return self._merge_fetched_boards(chunks, results)
+
+    async def _async_fetch_activity(
+        self, board_ids: list[str]
+    ) -> list[dict[str, Any]]:
+        """Fetch the given boards' last activity date as a batch."""
+        return await self.client.async_fetch_batch(
+            [self._board_url(board_id) for board_id in board_ids]
+        )
+
+    async def _async_update_from_actions(
+        self, due_board_ids: list[str]
+    ) -> dict[str, Board]:
+        """Apply each due board's actions since the last refresh to its data.
+
+        Boards with more actions than fit on a page, or with actions that
+        can't be applied on their own, are fetched again in full.
+        """
+        chunks = _chunk_board_ids(due_board_ids, 1)
+        LOGGER.debug("Fetching boards actions in %s batches", len(chunks))
+        results = await _async_gather_chunks(chunks, self._async_fetch_actions)
+
+        # Applied to the data as of now, the actions having been fetched
+        boards = dict(self.data or {})
+        applied_board_ids: list[str] = []
+        stale_board_ids: list[str] = []
+        for board_ids, result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                stale_board_ids.extend(board_ids)
+                continue
+            for board_id, actions_response in zip(board_ids, result):
+                if self._apply_actions(boards, board_id, actions_response):
+                    applied_board_ids.append(board_id)
+                else:
+                    stale_board_ids.append(board_id)
+
+        updated_boards = {board_id: boards[board_id] for board_id in applied_board_ids}
+        if stale_board_ids:
+            LOGGER.debug("Rebuilding boards with IDs %s", stale_board_ids)
+            updated_boards.update(await self._async_fetch_all_boards(stale_board_ids))
+        return updated_boards
+
+    def _apply_actions(
+        self, boards: dict[str, Board], board_id: str, actions_response: dict[str, Any]
+    ) -> bool:
+        if "200" not in actions_response or board_id not in self._last_action_ids:
+            return False
+        # Actions are returned newest first
+        actions = actions_response["200"]
+        if len(actions) >= ACTIONS_PAGE_LIMIT:
+            return False
+        if self.needs_cards and actions:
+            return False
+        if self.card_sensors and boards[board_id].aggregates is None:
+            return False
+        if self.card_index and not self.card_index.has_board(board_id):
+            return False
+        if self.card_moves and not self.card_moves.has_board(board_id):
+            return False
+        for action in reversed(actions):
+            if not self.apply_trello_action(boards, action):
+                return False
+        if actions:
+            self._last_action_ids[board_id] = actions[0]["id"]
+        self._mark_current(board_id)
+        return True
+
+    async def _async_fetch_actions(self, board_ids: list[str]) -> list[dict[str, Any]]:
+        """Fetch the given boards' actions since the last refresh as a batch."""
+        batch_urls = []
+        for board_id in board_ids:
+            params = {"filter": self._action_filter, "limit": str(ACTIONS_PAGE_LIMIT)}
+            if last_action_id := self._last_action_ids.get(board_id):
+                params["since"] = last_action_id
+            batch_urls.append(build_url(f"/boards/{board_id}/actions", **params))
+        return await self.client.async_fetch_batch(batch_urls)
+
+    async def _async_fetch_boards(self, board_ids: list[str]) -> dict[str, Board]:
+        """Fetch data for the given boards as a single batch."""
+        batch_urls = []
+        for board_id in board_ids:
+            batch_urls.append(self._board_url(board_id))
+            batch_urls.append(_lists_url(board_id, self._card_fields))
+        batch_responses = await self._async_retry_boards(
+            board_ids, await self.client.async_fetch_batch(batch_urls)
+        )
+
+        self._update_board_marks(batch_responses, board_ids)
+        self._update_card_index(batch_responses, board_ids)
+        with record_parse_time():
+            return _get_boards(
+                batch_responses, board_ids, self.data or {}, self.card_sensors
+            )
+
+    def _board_url(self, board_id: str) -> str:
+        params = get_board_params(self.card_sensors)
+        if self.update_mode == UPDATE_MODE_DELTA:
+            # Include the newest action to know where to apply changes from
+            params.update(
+                actions=self._action_filter, actions_limit="1", action_fields="id"
+            )
+        return build_url(
+            f"/boards/{board_id}", fields="name,dateLastActivity", **params
+        )
+
+    def _update_board_marks(
+        self, batch_responses: list[dict[str, Any]], board_ids: list[str]
+    ) -> None:
+        """Record where each successfully fetched board's data is current to."""
+        for board_id, board_response, list_response in zip(
+            board_ids, batch_responses[::2], batch_responses[1::2]
+        ):
+            if "200" not in board_response or "200" not in list_response:
+                self._last_action_ids.pop(board_id, None)
+                self._last_activity.pop(board_id, None)
+                if not _is_server_error(board_response) and not _is_server_error(
+                    list_response
+                ):
+                    # A deleted or inaccessible board isn't kept while stale
+                    self._fetched.pop(board_id, None)
+                continue
+            board = board_response["200"]
+            self._mark_current(board_id)
+            self._last_activity[board_id] = board.get("dateLastActivity")
+            if self.update_mode == UPDATE_MODE_DELTA:
+                actions = board.get("actions", [])
+                self._last_action_ids[board_id] = (
+                    actions[0]["id"] if actions else None
+                )
+
+    async def _async_retry_boards(
+        self, board_ids: list[str], batch_responses: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Fetch boards that failed with a server error again on their own.
+
+        Each retry waits longer, so a board that keeps failing only delays
+        this refresh by a few seconds.
+        """
+        batch_responses = list(batch_responses)
+        for attempt in range(BOARD_RETRIES):
+            retry_indexes = [
+                i
+                for i in range(len(board_ids))
+                if _is_server_error(batch_responses[2 * i])
+                or _is_server_error(batch_responses[2 * i + 1])
+            ]
+            if not retry_indexes:
+                break
+            delay = BOARD_RETRY_DELAY * 2**attempt * random.uniform(0.5, 1.5)
+            LOGGER.debug(
+                "Fetching boards with IDs %s again in %.1f seconds",
+                [board_ids[i] for i in retry_indexes],
+                delay,
+            )
+            await asyncio.sleep(delay)
+            results = await asyncio.gather(
+                *(
+                    self.client.async_fetch_batch(
+                        [
+                            self._board_url(board_ids[i]),
+                            _lists_url(board_ids[i], self._card_fields),
+                        ]
+                    )
+                    for i in retry_indexes
+                ),
+                return_exceptions=True,
+            )
+            for i, result in zip(retry_indexes, results):
+                if not isinstance(result, BaseException):
+                    batch_responses[2 * i : 2 * i + 2] = result
+        return batch_responses
+
+    def _merge_fetched_boards(
+        self,
+        chunks: list[list[str]],
+        results: list[dict[str, Board] | BaseException],
+    ) -> dict[str, Board]:
+        """Merge fetched chunks, keeping boards that failed if fresh enough."""
+        boards = _merge_chunk_results(chunks, results)
+        now = dt_util.utcnow()
+        for board_id, board in boards.items():
+            if board.available:
+                continue
+            previous = (self.data or {}).get(board_id)
+            fetched = self._fetched.get(board_id)
+            if (
+                previous is not None
+                and previous.available
+                and fetched is not None
+                and now - fetched <= self.stale_limit
+            ):
+                LOGGER.debug(
+                    "Keeping data of board with ID %s from %s", board_id, fetched
+                )
+                boards[board_id] = previous
+                self.stale_board_ids.add(board_id)
+            else:
+                self.stale_board_ids.discard(board_id)
+
+        if (
+            chunks
+            and all(isinstance(result, BaseException) for result in results)
+            and not any(board.available for board in boards.values())
+        ):
+            raise UpdateFailed(f"Unable to fetch any boards: {results[0]}")
+        return boards
+
+    def _mark_current(self, board_id: str) -> None:
+        """Record that the board's data was just found to be current."""
+        self._fetched[board_id] = dt_util.utcnow()
+        self.stale_board_ids.discard(board_id)
+
+    def _update_card_index(
+        self, batch_responses: list[dict[str, Any]], board_ids: list[str]
+    ) -> None:
+        """Index the cards of each successfully fetched board."""
+        if self.card_index is None and self.card_moves is None:
+            return
+        for board_id, board_response, list_response in zip(
+            board_ids, batch_responses[::2], batch_responses[1::2]
+        ):
+            if "200" not in board_response or "200" not in list_response:
+                continue
+            # Boards can stop being tracked while they're fetched
+            if board_id not in self.board_ids:
+                continue
+            if self.card_index is not None:
+                self.card_index.replace_board(board_id, list_response["200"])
+            if self.card_moves is not None:
+                self.card_moves.replace_board(board_id, list_response["200"])
+
+    async def _async_reconcile_boards(self, board_ids: list[str]) -> None:
+        """Fetch boards written to, replacing their optimistic data."""
+        board_ids = [board_id for board_id in self.board_ids if board_id in board_ids]
+        if not board_ids or self.data is None:
+            return
+        LOGGER.debug("Reconciling boards with IDs %s", board_ids)
+        try:
+            boards = await self._async_fetch_all_boards(board_ids)
+        except UpdateFailed as ex:
+            LOGGER.error("Unable to fetch boards after writing: %s", ex)
+            return
+        self.async_set_updated_data({**self.data, **boards})
+
+
+def _lists_url(board_id: str, card_fields: str = "id") -> str:
+    return build_url(
+        f"/boards/{board_id}/lists",
+        fields="name",
+        cards="open",
+        card_fields=card_fields,
+    )
+
+
+def _get_workspace_board_lists(board: dict[str, Any]) -> list[dict[str, Any]]:
+    """Nest a workspace board's open cards in its open lists."""
+    lists = [{**list_, "cards": []} for list_ in board.get("lists", [])]
+    list_cards = {list_["id"]: list_["cards"] for list_ in lists}
+    for card in board.get("cards", []):
+        if (cards := list_cards.get(card["idList"])) is not None:
+            cards.append(card)
+    return lists
+
+
+def _is_server_error(response: dict[str, Any]) -> bool:
+    """Return whether a batched request failed in a way worth retrying."""
+    if "200" in response:
+        return False
+    status = response.get("statusCode")
+    return isinstance(status, int) and (status >= 500 or status == 429)
+
+
+def _get_lists(boards: dict[str, Board]) -> dict[str, List]:
+    return {
+        list_id: list_
+        for board in boards.values()
+        for list_id, list_ in board.lists.items()
+    }
+
+
+async def _async_gather_chunks(
+    chunks: list[list[str]],
+    fetch: Callable[[list[str]], Awaitable[_T]],
+) -> list[_T | BaseException]:
+    """Fetch each chunk of board IDs concurrently with a bounded fan-out."""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+
+    async def fetch_chunk(board_ids: list[str]) -> _T:
+        async with semaphore:
+            return await fetch(board_ids)
+
+    return await asyncio.gather(
+        *(fetch_chunk(chunk) for chunk in chunks), return_exceptions=True
+    )
+
+
+def _chunk_board_ids(
+    board_ids: list[str], requests_per_board: int
+) -> list[list[str]]:
+    boards_per_batch = BATCH_URL_LIMIT // requests_per_board
+    return [
+        board_ids[i : i + boards_per_batch]
+        for i in range(0, len(board_ids), boards_per_batch)
+    ]
+
+
+def _merge_chunk_results(
+    chunks: list[list[str]], results: list[dict[str, Board] | BaseException]
+) -> dict[str, Board]:
+    board_id_boards: dict[str, Board] = {}
+    for board_ids, result in zip(chunks, results):
+        if isinstance(result, BaseException):
+            LOGGER.error(
+                "Unable to fetch lists for boards with IDs %s. Error was: %s",
+                board_ids,
+                result,
+            )
+            for board_id in board_ids:
+                board_id_boards[board_id] = Board(board_id, "", {}, available=False)
+            continue
+        board_id_boards.update(result)
+
+    return board_id_boards
+
+
+def _get_boards(
+    batch_response: list[dict[str, Any]],
+    board_ids: list[str],
+    previous_boards: dict[str, Board] | None = None,
+    card_sensors: list[str] | None = None,
+) -> dict[str, Board]:
+    """Build boards from batched board and lists responses.
+
+    :param previous_boards: Boards to reuse the unchanged lists and boards of.
+    :param card_sensors: Card sensors to count each board's cards for.
+    """
+    previous_boards = previous_boards or {}
     board_id_boards: dict[str, Board] = {}
     for i, batch_response_pair in enumerate(
         zip(batch_response[::2], batch_response[1::2])
     ):
         board_response = batch_response_pair[0]
         list_response = batch_response_pair[1]
-        if board_response.success and list_response.success:
-            board = board_response.payload
-            lists = list_response.payload
-            board_id_boards[board.id] = _get_board(board, lists)
+        if "200" in board_response and "200" in list_response:
+            board = board_response["200"]
+            lists = list_response["200"]
+            board_id_boards[board["id"]] = _get_board(
+                board, lists, previous_boards.get(board["id"]), card_sensors
+            )
         else:
+            failed_request, failed_response = (
+                ("board", board_response)
+                if "200" not in board_response
+                else ("lists", list_response)
+            )
             LOGGER.error(
-                "Unable to fetch lists for board with ID '%s'. Response was: %s)",
+                "Unable to fetch %s for board with ID '%s'. Response was: %s %s",
+                failed_request,
                 board_ids[i],
-                board_response.payload.message,
+                failed_response.get("statusCode"),
+                failed_response.get("message"),
             )
-            board_id_boards[board_ids[i]] = Board(board_ids[i], "", {})
+            board_id_boards[board_ids[i]] = Board(board_ids[i], "", {}, available=False)
             continue
 
     return board_id_boards
 
 
-def _get_board(board: TrelloBoard, lists: list[TrelloList]) -> Board:
-    return Board(
-        board.id,
-        board.name,
-        {
-            list_.id: List(list_.id, list_.name, len(list_.cards))
-            for list_ in lists
-        },
-    )
+def _get_board(
+    board: dict[str, Any],
+    lists: list[dict[str, Any]],
+    previous: Board | None = None,
+    card_sensors: list[str] | None = None,
+) -> Board:
+    """Build a board, reusing the previous board's instances that are unchanged."""
+    previous_lists = previous.lists if previous and previous.available else {}
+    board_lists: dict[str, List] = {}
+    for list_ in lists:
+        list_id = list_["id"]
+        # Lists only fetched for counting were reduced to their card count
+        card_count = (
+            list_["cardCount"] if "cardCount" in list_ else len(list_["cards"])
+        )
+        previous_list = previous_lists.get(list_id)
+        if (
+            previous_list is not None
+            and previous_list.name == list_["name"]
+            and previous_list.card_count == card_count
+        ):
+            board_lists[list_id] = previous_list
+        else:
+            board_lists[list_id] = List(list_id, list_["name"], card_count)
+
+    aggregates = aggregate_cards(board, lists, card_sensors or [])
+    if previous is not None and previous.aggregates == aggregates:
+        aggregates = previous.aggregates
+
+    if (
+        previous is not None
+        and previous.available
+        and previous.aggregates is aggregates
+        and previous.name == board["name"]
+        and len(board_lists) == len(previous_lists)
+        and all(
+            previous_lists.get(list_id) is list_
+            for list_id, list_ in board_lists.items()
+        )
+    ):
+        return previous
+    return Board(board["id"], board["name"], board_lists, aggregates=aggregates)
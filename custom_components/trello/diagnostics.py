@@ -0,0 +1,38 @@
+"""Diagnostics support for the Trello integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY, CONF_API_TOKEN
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_USER_EMAIL, CONF_WEBHOOK_ID, DOMAIN
+from .coordinator import TrelloDataUpdateCoordinator
+
+TO_REDACT = {CONF_API_KEY, CONF_API_TOKEN, CONF_USER_EMAIL, CONF_WEBHOOK_ID, "title"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    trello_coordinator: TrelloDataUpdateCoordinator = hass.data[DOMAIN][
+        entry.entry_id
+    ]
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "update_mode": trello_coordinator.update_mode,
+        "last_update_success": trello_coordinator.last_update_success,
+        "boards": {
+            board.id: {
+                "available": board.available,
+                "stale": board.id in trello_coordinator.stale_board_ids,
+                "list_count": len(board.lists),
+            }
+            for board in (trello_coordinator.data or {}).values()
+        },
+        "rate_limit_remaining": trello_coordinator.client.governor.remaining,
+        "metrics": trello_coordinator.metrics.as_dict(),
+    }
@@ -0,0 +1,17 @@
+"""Shared helpers for Trello entities."""
+from __future__ import annotations
+
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+
+from .const import DOMAIN, Board
+
+
+def board_device_info(board: Board) -> DeviceInfo:
+    """Return the device all of a board's entities belong to."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, board.id)},
+        name=board.name,
+        entry_type=DeviceEntryType.SERVICE,
+        manufacturer="Trello",
+        model="Board",
+    )
@@ -0,0 +1,144 @@
+"""Metrics recorded while refreshing Trello data."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+import math
+import time
+from typing import Any
+
+from .coalesce import board_id_from_url
+
+# Number of refreshes percentiles are calculated over
+METRICS_HISTORY = 100
+PERCENTILES = (50, 90, 99)
+
+# Metrics of the refresh in progress, if requests are made as part of one
+current_refresh: ContextVar[RefreshMetrics | None] = ContextVar(
+    "trello_current_refresh", default=None
+)
+
+
+@dataclass
+class BatchMetrics:
+    """A single batch request made during a refresh."""
+
+    urls: list[str]
+    seconds: float
+    # URLs without a successful response, all of them if the batch failed
+    failed_urls: list[str]
+
+    def board_ids(self) -> set[str]:
+        """Return the IDs of the boards this batch requested."""
+        return {
+            board_id for url in self.urls if (board_id := board_id_from_url(url))
+        }
+
+
+@dataclass
+class RefreshMetrics:
+    """Where the time went during a single refresh."""
+
+    started: datetime
+    latency: float = 0.0
+    batches: list[BatchMetrics] = field(default_factory=list)
+    request_count: int = 0
+    bytes_received: int = 0
+    # Batched requests answered with another config entry's response
+    shared_requests: int = 0
+    # Decoding JSON and building boards from it
+    parse_time: float = 0.0
+    rate_limit_remaining: int | None = None
+
+    @property
+    def failed_requests(self) -> int:
+        """Return the number of batched requests without a successful response."""
+        return sum(len(batch.failed_urls) for batch in self.batches)
+
+    def board_latency(self, board_id: str) -> float | None:
+        """Return the time spent on batches requesting the given board."""
+        seconds = [
+            batch.seconds for batch in self.batches if board_id in batch.board_ids()
+        ]
+        return sum(seconds) if seconds else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {**asdict(self), "failed_requests": self.failed_requests}
+
+
+class MetricsHistory:
+    """Metrics of the most recent refreshes."""
+
+    def __init__(self, maxlen: int = METRICS_HISTORY) -> None:
+        """Initialize without any refreshes."""
+        self.refreshes: deque[RefreshMetrics] = deque(maxlen=maxlen)
+
+    @property
+    def last(self) -> RefreshMetrics | None:
+        """Return the metrics of the latest refresh."""
+        return self.refreshes[-1] if self.refreshes else None
+
+    def record(self, metrics: RefreshMetrics) -> None:
+        """Add a finished refresh, dropping the oldest if full."""
+        self.refreshes.append(metrics)
+
+    def board_latency(self, board_id: str) -> float | None:
+        """Return the time spent on the board in the latest refresh fetching it."""
+        for refresh in reversed(self.refreshes):
+            if (latency := refresh.board_latency(board_id)) is not None:
+                return latency
+        return None
+
+    def board_latency_percentiles(self, board_id: str) -> dict[str, float]:
+        """Return percentiles of the time spent on the given board's batches."""
+        return percentiles(
+            latency
+            for refresh in self.refreshes
+            if (latency := refresh.board_latency(board_id)) is not None
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the latest refresh and percentiles over all for diagnostics."""
+        return {
+            "last_refresh": self.last.as_dict() if self.last else None,
+            "refresh_count": len(self.refreshes),
+            "percentiles": {
+                name: percentiles(getattr(refresh, name) for refresh in self.refreshes)
+                for name in (
+                    "latency",
+                    "parse_time",
+                    "request_count",
+                    "shared_requests",
+                    "bytes_received",
+                    "failed_requests",
+                )
+            },
+        }
+
+
+def percentiles(values: Iterable[float]) -> dict[str, float]:
+    """Return the nearest-rank percentiles of the values, if there are any."""
+    ordered = sorted(values)
+    if not ordered:
+        return {}
+    return {
+        f"p{percentile}": ordered[math.ceil(percentile / 100 * len(ordered)) - 1]
+        for percentile in PERCENTILES
+    }
+
+
+@contextmanager
+def record_parse_time() -> Iterator[None]:
+    """Add the time spent in the block to the current refresh's parse time."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics := current_refresh.get():
+            metrics.parse_time += time.perf_counter() - start
+
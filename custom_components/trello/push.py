@@ -0,0 +1,204 @@
+"""Receive board updates pushed by Trello webhooks."""
+from __future__ import annotations
+
+import asyncio
+from functools import partial
+from typing import Any
+
+from aiohttp.web import Request, Response
+
+from homeassistant.components import webhook
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.network import NoURLAvailableError
+
+from .actions import HANDLED_ACTION_TYPES
+from .aggregates import CARD_SENSOR_ACTIONS
+from .api import TrelloError
+from .const import CONF_WEBHOOK_ID, DOMAIN, LOGGER
+from .coordinator import TrelloDataUpdateCoordinator
+
+
+async def async_setup_webhooks(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: TrelloDataUpdateCoordinator
+) -> bool:
+    """Register a Trello webhook for each of the coordinator's boards.
+
+    Return False if Trello can't reach Home Assistant, in which case the
+    coordinator should keep polling.
+    """
+    webhook_id = entry.data[CONF_WEBHOOK_ID]
+    try:
+        callback_url = webhook.async_generate_url(hass, webhook_id)
+    except NoURLAvailableError:
+        LOGGER.warning("No external URL available for Trello webhooks, polling instead")
+        return False
+
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        entry.title,
+        webhook_id,
+        partial(_async_handle_webhook, coordinator),
+        allowed_methods=("HEAD", "POST"),
+    )
+    entry.async_on_unload(lambda: webhook.async_unregister(hass, webhook_id))
+
+    try:
+        board_id_webhook_ids = await _async_sync_trello_webhooks(
+            coordinator,
+            callback_url,
+            coordinator.board_ids,
+            await _async_get_trello_webhooks(coordinator, callback_url),
+        )
+    except TrelloError as ex:
+        LOGGER.warning("Unable to create Trello webhooks, polling instead: %s", ex)
+        webhook.async_unregister(hass, webhook_id)
+        return False
+
+    # Syncs one at a time, each against the boards tracked when it starts
+    sync_lock = asyncio.Lock()
+    synced_board_ids = list(coordinator.board_ids)
+
+    async def async_update_trello_webhooks() -> None:
+        """Create and delete webhooks as boards start and stop being tracked."""
+        nonlocal board_id_webhook_ids
+        async with sync_lock:
+            board_ids = list(coordinator.board_ids)
+            if set(board_ids) == board_id_webhook_ids.keys():
+                return
+            try:
+                board_id_webhook_ids = await _async_sync_trello_webhooks(
+                    coordinator, callback_url, board_ids, board_id_webhook_ids
+                )
+            except TrelloError as ex:
+                LOGGER.warning("Unable to update Trello webhooks: %s", ex)
+
+    @callback
+    def async_board_ids_updated() -> None:
+        """Sync webhooks when selected or workspace boards were tracked or not."""
+        nonlocal synced_board_ids
+        if coordinator.board_ids == synced_board_ids:
+            return
+        synced_board_ids = list(coordinator.board_ids)
+        entry.async_create_background_task(
+            hass, async_update_trello_webhooks(), "trello webhooks update"
+        )
+
+    async def async_delete_trello_webhooks() -> None:
+        async with sync_lock:
+            for trello_webhook_id in board_id_webhook_ids.values():
+                try:
+                    await _async_delete_trello_webhook(coordinator, trello_webhook_id)
+                except TrelloError as ex:
+                    LOGGER.warning("Unable to delete Trello webhook: %s", ex)
+
+    entry.async_on_unload(async_delete_trello_webhooks)
+    entry.async_on_unload(coordinator.async_add_listener(async_board_ids_updated))
+    return True
+
+
+async def _async_get_trello_webhooks(
+    coordinator: TrelloDataUpdateCoordinator, callback_url: str
+) -> dict[str, str]:
+    """Get the IDs of existing webhooks to this callback URL by board ID."""
+    client = coordinator.client
+    existing = await client.async_fetch_json(f"/tokens/{client.api_token}/webhooks")
+    return {
+        trello_webhook["idModel"]: trello_webhook["id"]
+        for trello_webhook in existing
+        if trello_webhook["callbackURL"] == callback_url
+    }
+
+
+async def _async_sync_trello_webhooks(
+    coordinator: TrelloDataUpdateCoordinator,
+    callback_url: str,
+    board_ids: list[str],
+    board_id_webhook_ids: dict[str, str],
+) -> dict[str, str]:
+    """Create webhooks for new boards and delete those of removed boards."""
+    synced_board_id_webhook_ids: dict[str, str] = {}
+    for board_id, trello_webhook_id in board_id_webhook_ids.items():
+        if board_id in board_ids:
+            synced_board_id_webhook_ids[board_id] = trello_webhook_id
+        else:
+            await _async_delete_trello_webhook(coordinator, trello_webhook_id)
+
+    for board_id in board_ids:
+        if board_id in synced_board_id_webhook_ids:
+            continue
+        trello_webhook = await coordinator.client.async_fetch_json(
+            "/webhooks",
+            {
+                "callbackURL": callback_url,
+                "idModel": board_id,
+                "description": "Home Assistant",
+            },
+            http_method="POST",
+        )
+        synced_board_id_webhook_ids[board_id] = trello_webhook["id"]
+
+    return synced_board_id_webhook_ids
+
+
+async def _async_delete_trello_webhook(
+    coordinator: TrelloDataUpdateCoordinator, trello_webhook_id: str
+) -> None:
+    await coordinator.client.async_fetch_json(
+        f"/webhooks/{trello_webhook_id}", http_method="DELETE"
+    )
+
+
+async def _async_handle_webhook(
+    coordinator: TrelloDataUpdateCoordinator,
+    hass: HomeAssistant,
+    webhook_id: str,
+    request: Request,
+) -> Response | None:
+    """Apply an action pushed by Trello to the coordinator's data."""
+    # Trello checks the callback URL responds to HEAD before creating a webhook
+    if request.method == "HEAD":
+        return None
+
+    try:
+        action = (await request.json())["action"]
+    except (ValueError, KeyError):
+        return Response(status=400)
+
+    if action.get("type") not in HANDLED_ACTION_TYPES and not (
+        coordinator.card_sensors and action.get("type") in CARD_SENSOR_ACTIONS
+    ):
+        return None
+
+    if coordinator.data is None:
+        return None
+
+    if coordinator.writes.is_echo(action):
+        # Already applied when written, fetch the board rather than count it twice
+        if board_id := action["data"].get("board", {}).get("id"):
+            coordinator.writes.async_reconcile([board_id])
+        return None
+
+    LOGGER.debug("Applying pushed %s action", action["type"])
+    if not coordinator.needs_cards and _apply_pushed_action(coordinator, action):
+        coordinator.async_update_listeners()
+    elif board_id := action["data"].get("board", {}).get("id"):
+        # Boards are only due every PUSH_RECONCILE_INTERVAL in push mode
+        await coordinator.async_request_board_refresh([board_id])
+    return None
+
+
+def _apply_pushed_action(
+    coordinator: TrelloDataUpdateCoordinator, action: dict[str, Any]
+) -> bool:
+    """Apply the action to a copy of the data, replacing it if it applied.
+
+    Return False if the action couldn't be applied.
+    """
+    boards = dict(coordinator.data)
+    if not coordinator.apply_trello_action(boards, action):
+        return False
+    coordinator.data = boards
+    return True
+
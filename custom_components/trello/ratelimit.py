@@ -0,0 +1,128 @@
+"""Rate limiting shared by every request made with the same API key or token."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+import random
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import LOGGER
+
+DATA_RATE_LIMITS = "trello_rate_limits"
+
+# Trello's documented limits, updated from response headers once known
+KEY_LIMIT = 300
+TOKEN_LIMIT = 100
+LIMIT_INTERVAL = 10.0
+
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+
+
+class TokenBucket:
+    """A budget of requests that refills continuously over an interval."""
+
+    def __init__(self, capacity: int, interval: float) -> None:
+        """Initialize a full bucket."""
+        self.capacity = capacity
+        self.interval = interval
+        self.tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self._updated) * self.capacity / self.interval,
+        )
+        self._updated = now
+
+    async def async_acquire(self, count: int) -> None:
+        """Wait until the given number of requests fit the budget, then use them."""
+        count = min(count, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.tokens < count:
+                await asyncio.sleep(
+                    (count - self.tokens) * self.interval / self.capacity
+                )
+                self._refill()
+            self.tokens -= count
+
+    def update(self, capacity: int, interval: float, remaining: int) -> None:
+        """Update the budget from what Trello reports."""
+        self._refill()
+        self.capacity = capacity
+        self.interval = interval
+        self.tokens = min(self.tokens, float(remaining))
+
+    def exhaust(self) -> None:
+        """Use up the budget so waiting requests back off until it refills."""
+        self._refill()
+        self.tokens = 0.0
+
+
+class RateLimitGovernor:
+    """Rate limit for requests made with one API key and token.
+
+    The key's budget is shared with every token using the same key.
+    """
+
+    def __init__(self, key_bucket: TokenBucket, token_bucket: TokenBucket) -> None:
+        """Initialize with the key's and the token's budgets."""
+        self.key_bucket = key_bucket
+        self.token_bucket = token_bucket
+
+    @property
+    def remaining(self) -> int:
+        """Return the number of requests that can currently be made."""
+        return int(min(self.key_bucket.tokens, self.token_bucket.tokens))
+
+    async def async_acquire(self, count: int = 1) -> None:
+        """Wait until the given number of requests can be made."""
+        await self.key_bucket.async_acquire(count)
+        await self.token_bucket.async_acquire(count)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Update the budgets from Trello's x-rate-limit-* response headers."""
+        for bucket, prefix in (
+            (self.key_bucket, "x-rate-limit-api-key"),
+            (self.token_bucket, "x-rate-limit-api-token"),
+        ):
+            try:
+                bucket.update(
+                    int(headers[f"{prefix}-max"]),
+                    int(headers[f"{prefix}-interval-ms"]) / 1000,
+                    int(headers[f"{prefix}-remaining"]),
+                )
+            except (KeyError, ValueError):
+                continue
+
+    async def async_backoff(self, attempt: int) -> None:
+        """Wait with jittered exponential backoff after being rate limited."""
+        self.key_bucket.exhaust()
+        self.token_bucket.exhaust()
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt)
+        delay *= random.uniform(0.5, 1.5)
+        LOGGER.debug("Rate limited by Trello, retrying in %.1f seconds", delay)
+        await asyncio.sleep(delay)
+
+
+@callback
+def async_get_governor(
+    hass: HomeAssistant, api_key: str, api_token: str
+) -> RateLimitGovernor:
+    """Get the rate limit shared by all requests using the key and token."""
+    buckets: dict[tuple[str, str], TokenBucket] = hass.data.setdefault(
+        DATA_RATE_LIMITS, {}
+    )
+    key_bucket = buckets.setdefault(
+        ("key", api_key), TokenBucket(KEY_LIMIT, LIMIT_INTERVAL)
+    )
+    token_bucket = buckets.setdefault(
+        ("token", api_token), TokenBucket(TOKEN_LIMIT, LIMIT_INTERVAL)
+    )
+    return RateLimitGovernor(key_bucket, token_bucket)
@@ -1,15 +1,42 @@
 """Platform for sensor integration."""
 from __future__ import annotations
 
-from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, Platform, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, Board, List
+from .const import (
+    CARD_SENSOR_DUE_SOON,
+    CARD_SENSOR_LABELS,
+    CARD_SENSOR_MEMBERS,
+    CARD_SENSOR_NO_MEMBERS,
+    CARD_SENSOR_OVERDUE,
+    CONF_PROMOTED_LIST_IDS,
+    CONF_SUMMARY_BOARD_IDS,
+    DOMAIN,
+    Board,
+    CardAggregates,
+    List,
+)
 from .coordinator import TrelloDataUpdateCoordinator
+from .entity import board_device_info
+
+CARD_SENSOR_NAMES = {
+    CARD_SENSOR_NO_MEMBERS: "Cards without members",
+    CARD_SENSOR_OVERDUE: "Overdue cards",
+    CARD_SENSOR_DUE_SOON: "Cards due soon",
+}
 
 
 class TrelloSensor(CoordinatorEntity[TrelloDataUpdateCoordinator], SensorEntity):
@@ -26,26 +53,19 @@ class TrelloSensor(CoordinatorEntity[TrelloDataUpdateCoordinator], SensorEntity)
         coordinator: TrelloDataUpdateCoordinator,
     ) -> None:
         """Initialize sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=list_.id)
         self.board = board
         self.list_id = list_.id
         self._attr_unique_id = f"list_{list_.id}".lower()
         self._attr_name = list_.name
 
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, board.id)},
-            name=board.name,
-            entry_type=DeviceEntryType.SERVICE,
-            manufacturer="Trello",
-            model="Board",
-        )
+        self._attr_device_info = board_device_info(board)
 
     @property
     def available(self) -> bool:
         """Determine if sensor is available."""
-        board = self.coordinator.data[self.board.id]
-        list_id = board.lists.get(self.list_id)
-        return bool(board.lists and list_id)
+        board = self.coordinator.data.get(self.board.id)
+        return bool(board and board.lists.get(self.list_id))
 
     @property
     def native_value(self) -> int | None:
@@ -54,29 +74,333 @@ class TrelloSensor(CoordinatorEntity[TrelloDataUpdateCoordinator], SensorEntity)
 
     @callback
     def _handle_coordinator_update(self) -> None:
+        """Update the name and write state once when the list changed."""
         if self.available:
             board = self.coordinator.data[self.board.id]
             self._attr_name = board.lists[self.list_id].name
-            self.async_write_ha_state()
         super()._handle_coordinator_update()
 
 
+class TrelloBoardSensor(CoordinatorEntity[TrelloDataUpdateCoordinator], SensorEntity):
+    """Open cards of a board, with the card count of each list as an attribute.
+
+    Summarizes a board with many lists in a single entity.
+    """
+
+    _attr_native_unit_of_measurement = "Cards"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_has_entity_name = True
+    _attr_name = "Cards"
+
+    def __init__(self, board: Board, coordinator: TrelloDataUpdateCoordinator) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self.board_id = board.id
+        self._attr_unique_id = f"board_{board.id}_cards".lower()
+        self._attr_device_info = board_device_info(board)
+        self._written_board: Board | None = None
+
+    @property
+    def _board(self) -> Board | None:
+        board = self.coordinator.data.get(self.board_id)
+        return board if board and board.available else None
+
+    @property
+    def available(self) -> bool:
+        """Determine if sensor is available."""
+        return self._board is not None
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the number of open cards on the board."""
+        if (board := self._board) is None:
+            return None
+        return sum(list_.card_count for list_ in board.lists.values())
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the card count of each list by name."""
+        if (board := self._board) is None:
+            return {}
+        list_counts: dict[str, int] = {}
+        for list_ in board.lists.values():
+            name = list_.name if list_.name not in list_counts else list_.id
+            list_counts[name] = list_.card_count
+        return {"lists": list_counts}
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the board changed."""
+        board = self.coordinator.data.get(self.board_id)
+        if board is self._written_board:
+            return
+        self._written_board = board
+        super()._handle_coordinator_update()
+
+
+class TrelloRefreshLatencySensor(
+    CoordinatorEntity[TrelloDataUpdateCoordinator], SensorEntity
+):
+    """Time spent fetching a board during the latest refresh."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_has_entity_name = True
+    _attr_name = "Refresh latency"
+
+    def __init__(self, board: Board, coordinator: TrelloDataUpdateCoordinator) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator)
+        self.board_id = board.id
+        self._attr_unique_id = f"board_{board.id}_refresh_latency".lower()
+        self._attr_device_info = board_device_info(board)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the latest time spent on the board's batches."""
+        if (latency := self.coordinator.metrics.board_latency(self.board_id)) is None:
+            return None
+        return round(latency * 1000, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return percentiles over recent refreshes in milliseconds."""
+        return {
+            name: round(latency * 1000, 1)
+            for name, latency in self.coordinator.metrics.board_latency_percentiles(
+                self.board_id
+            ).items()
+        }
+
+
+class TrelloCardSensor(CoordinatorEntity[TrelloDataUpdateCoordinator], SensorEntity):
+    """Number of a board's open cards counted by a card sensor."""
+
+    _attr_native_unit_of_measurement = "Cards"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        board: Board,
+        card_sensor: str,
+        coordinator: TrelloDataUpdateCoordinator,
+        item_id: str | None = None,
+    ) -> None:
+        """Initialize sensor.
+
+        :param item_id: ID of the label or member counted for, if any.
+        """
+        super().__init__(coordinator)
+        self.board_id = board.id
+        self.card_sensor = card_sensor
+        self.item_id = item_id
+        self._attr_unique_id = _card_sensor_unique_id(board.id, card_sensor, item_id)
+        self._attr_device_info = board_device_info(board)
+        if board.aggregates is not None:
+            self._attr_name = self._get_name(board.aggregates)
+        self._written_state: tuple[Any, ...] | None = None
+
+    @property
+    def _aggregates(self) -> CardAggregates | None:
+        board = self.coordinator.data.get(self.board_id)
+        return board.aggregates if board else None
+
+    @property
+    def available(self) -> bool:
+        """Determine if sensor is available."""
+        return self._aggregates is not None
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the number of cards counted."""
+        if (aggregates := self._aggregates) is None:
+            return None
+        if self.card_sensor == CARD_SENSOR_LABELS:
+            return aggregates.label_counts.get(self.item_id or "", 0)
+        if self.card_sensor == CARD_SENSOR_MEMBERS:
+            return aggregates.member_counts.get(self.item_id or "", 0)
+        if self.card_sensor == CARD_SENSOR_NO_MEMBERS:
+            return aggregates.no_members
+        if self.card_sensor == CARD_SENSOR_OVERDUE:
+            return aggregates.overdue(dt_util.utcnow())
+        return aggregates.due_soon(dt_util.utcnow())
+
+    def _get_name(self, aggregates: CardAggregates) -> str:
+        if self.card_sensor == CARD_SENSOR_LABELS:
+            item_id = self.item_id or ""
+            return f"Label {aggregates.label_names.get(item_id, item_id)}"
+        if self.card_sensor == CARD_SENSOR_MEMBERS:
+            item_id = self.item_id or ""
+            return f"Assigned to {aggregates.member_names.get(item_id, item_id)}"
+        return CARD_SENSOR_NAMES[self.card_sensor]
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the count, name or availability changed.
+
+        Due dates are counted against the current time, so these sensors are
+        updated on every refresh rather than only when their board changed.
+        """
+        if (aggregates := self._aggregates) is not None:
+            self._attr_name = self._get_name(aggregates)
+        state = (self.available, self.native_value, self._attr_name)
+        if state != self._written_state:
+            self._written_state = state
+            super()._handle_coordinator_update()
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Set up trello sensors for config entries."""
+    """Set up trello sensors for config entries.
+
+    Sensors are added for new lists, labels and members and removed for
+    closed lists and deleted labels as the coordinator updates. Summarized
+    boards get a single sensor instead of one per list, except for promoted
+    lists. Options are read on every update, so summarizing and promoting
+    apply without reloading.
+    """
     trello_coordinator: TrelloDataUpdateCoordinator = hass.data[DOMAIN][
         config_entry.entry_id
     ]
-    boards = trello_coordinator.data.values()
+    entity_registry = er.async_get(hass)
+    list_id_board_ids: dict[str, str] = {}
+    board_ids: set[str] = set()
+    summary_board_ids: set[str] = set()
+    # Board ID of each card sensor by unique ID
+    card_sensor_board_ids: dict[str, str] = {}
 
-    async_add_entities(
-        [
+    @callback
+    def async_update_sensors() -> None:
+        boards = trello_coordinator.data.values()
+        summarized = set(config_entry.options.get(CONF_SUMMARY_BOARD_IDS, []))
+        promoted = set(config_entry.options.get(CONF_PROMOTED_LIST_IDS, []))
+        new_sensors: list[SensorEntity] = [
             TrelloSensor(board, list_, trello_coordinator)
             for board in boards
             for list_ in board.lists.values()
-        ],
-        True,
+            if list_.id not in list_id_board_ids
+            and (board.id not in summarized or list_.id in promoted)
+        ]
+        for sensor in new_sensors:
+            list_id_board_ids[sensor.list_id] = sensor.board.id
+        for board in boards:
+            if board.id not in board_ids and board.available:
+                board_ids.add(board.id)
+                new_sensors.append(
+                    TrelloRefreshLatencySensor(board, trello_coordinator)
+                )
+            if (
+                board.id in summarized
+                and board.id not in summary_board_ids
+                and board.available
+            ):
+                summary_board_ids.add(board.id)
+                new_sensors.append(TrelloBoardSensor(board, trello_coordinator))
+        current_card_sensor_ids: set[str] = set()
+        for board in boards:
+            if board.aggregates is None:
+                continue
+            for card_sensor, item_id in _get_card_sensor_keys(
+                board.aggregates, trello_coordinator.card_sensors
+            ):
+                unique_id = _card_sensor_unique_id(board.id, card_sensor, item_id)
+                current_card_sensor_ids.add(unique_id)
+                if unique_id not in card_sensor_board_ids:
+                    card_sensor_board_ids[unique_id] = board.id
+                    new_sensors.append(
+                        TrelloCardSensor(
+                            board, card_sensor, trello_coordinator, item_id
+                        )
+                    )
+        if new_sensors:
+            async_add_entities(new_sensors)
+
+        for list_id, board_id in list(list_id_board_ids.items()):
+            board = trello_coordinator.data.get(board_id)
+            if (
+                board is None
+                or (board.available and list_id not in board.lists)
+                or (board_id in summarized and list_id not in promoted)
+            ):
+                del list_id_board_ids[list_id]
+                _async_remove_sensor(entity_registry, f"list_{list_id}")
+        for board_id in board_ids - trello_coordinator.data.keys():
+            board_ids.remove(board_id)
+            _async_remove_sensor(entity_registry, f"board_{board_id}_refresh_latency")
+        for board_id in summary_board_ids - summarized.intersection(
+            trello_coordinator.data
+        ):
+            summary_board_ids.remove(board_id)
+            _async_remove_sensor(entity_registry, f"board_{board_id}_cards")
+        for unique_id, board_id in list(card_sensor_board_ids.items()):
+            board = trello_coordinator.data.get(board_id)
+            if board is None or (
+                board.aggregates is not None
+                and unique_id not in current_card_sensor_ids
+            ):
+                del card_sensor_board_ids[unique_id]
+                _async_remove_sensor(entity_registry, unique_id)
+
+    _async_remove_unused_sensors(entity_registry, config_entry, trello_coordinator)
+    async_update_sensors()
+    config_entry.async_on_unload(
+        trello_coordinator.async_add_listener(async_update_sensors)
     )
+
+
+@callback
+def _async_remove_unused_sensors(
+    entity_registry: er.EntityRegistry,
+    config_entry: ConfigEntry,
+    coordinator: TrelloDataUpdateCoordinator,
+) -> None:
+    """Remove sensors left by a previous run that the options no longer use."""
+    summarized = set(config_entry.options.get(CONF_SUMMARY_BOARD_IDS, []))
+    promoted = set(config_entry.options.get(CONF_PROMOTED_LIST_IDS, []))
+    for board in coordinator.data.values():
+        if board.id not in summarized:
+            _async_remove_sensor(entity_registry, f"board_{board.id}_cards")
+            continue
+        for list_id in board.lists:
+            if list_id not in promoted:
+                _async_remove_sensor(entity_registry, f"list_{list_id}")
+
+
+def _get_card_sensor_keys(
+    aggregates: CardAggregates, card_sensors: list[str]
+) -> list[tuple[str, str | None]]:
+    """Return the card sensor and label or member ID of each card sensor."""
+    keys: list[tuple[str, str | None]] = []
+    for card_sensor in card_sensors:
+        if card_sensor == CARD_SENSOR_LABELS:
+            keys.extend((card_sensor, label_id) for label_id in aggregates.label_counts)
+        elif card_sensor == CARD_SENSOR_MEMBERS:
+            keys.extend(
+                (card_sensor, member_id) for member_id in aggregates.member_counts
+            )
+        else:
+            keys.append((card_sensor, None))
+    return keys
+
+
+def _card_sensor_unique_id(
+    board_id: str, card_sensor: str, item_id: str | None
+) -> str:
+    if item_id is None:
+        return f"board_{board_id}_{card_sensor}".lower()
+    return f"board_{board_id}_{card_sensor}_{item_id}".lower()
+
+
+@callback
+def _async_remove_sensor(entity_registry: er.EntityRegistry, unique_id: str) -> None:
+    if entity_id := entity_registry.async_get_entity_id(
+        Platform.SENSOR, DOMAIN, unique_id.lower()
+    ):
+        entity_registry.async_remove(entity_id)
@@ -0,0 +1,166 @@
+"""Services writing cards and lists to Trello."""
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_NAME
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+
+from . import writes
+from .const import DOMAIN
+from .coordinator import TrelloDataUpdateCoordinator
+
+ATTR_BOARD_ID = "board_id"
+ATTR_LIST_ID = "list_id"
+ATTR_CARD_ID = "card_id"
+ATTR_DUE_COMPLETE = "due_complete"
+
+SERVICE_CREATE_CARD = "create_card"
+SERVICE_UPDATE_CARD = "update_card"
+SERVICE_DELETE_CARD = "delete_card"
+SERVICE_CREATE_LIST = "create_list"
+SERVICE_UPDATE_LIST = "update_list"
+SERVICE_DELETE_LIST = "delete_list"
+
+CREATE_CARD_SCHEMA = vol.Schema(
+    {vol.Required(ATTR_LIST_ID): cv.string, vol.Required(ATTR_NAME): cv.string}
+)
+UPDATE_CARD_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_CARD_ID): cv.string,
+            vol.Optional(ATTR_NAME): cv.string,
+            vol.Optional(ATTR_LIST_ID): cv.string,
+            vol.Optional(ATTR_DUE_COMPLETE): cv.boolean,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_NAME, ATTR_LIST_ID, ATTR_DUE_COMPLETE),
+)
+DELETE_CARD_SCHEMA = vol.Schema({vol.Required(ATTR_CARD_ID): cv.string})
+CREATE_LIST_SCHEMA = vol.Schema(
+    {vol.Required(ATTR_BOARD_ID): cv.string, vol.Required(ATTR_NAME): cv.string}
+)
+UPDATE_LIST_SCHEMA = vol.Schema(
+    {vol.Required(ATTR_LIST_ID): cv.string, vol.Required(ATTR_NAME): cv.string}
+)
+DELETE_LIST_SCHEMA = vol.Schema({vol.Required(ATTR_LIST_ID): cv.string})
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services shared by all config entries.
+
+    Calls return once the write is queued and applied to the coordinator's
+    data. Writes are sent together shortly after, and failures are logged.
+    """
+    if hass.services.has_service(DOMAIN, SERVICE_CREATE_CARD):
+        return
+
+    @callback
+    def async_create_card(call: ServiceCall) -> None:
+        list_id = call.data[ATTR_LIST_ID]
+        writes.async_create_card(
+            _get_list_coordinator(hass, list_id), list_id, call.data[ATTR_NAME]
+        )
+
+    @callback
+    def async_update_card(call: ServiceCall) -> None:
+        card_id = call.data[ATTR_CARD_ID]
+        list_id = call.data.get(ATTR_LIST_ID)
+        coordinator = (
+            _get_list_coordinator(hass, list_id)
+            if list_id
+            else _get_card_coordinator(hass, card_id)
+        )
+        writes.async_update_card(
+            coordinator,
+            card_id,
+            name=call.data.get(ATTR_NAME),
+            list_id=list_id,
+            due_complete=call.data.get(ATTR_DUE_COMPLETE),
+        )
+
+    @callback
+    def async_delete_card(call: ServiceCall) -> None:
+        card_id = call.data[ATTR_CARD_ID]
+        writes.async_archive_card(_get_card_coordinator(hass, card_id), card_id)
+
+    @callback
+    def async_create_list(call: ServiceCall) -> None:
+        board_id = call.data[ATTR_BOARD_ID]
+        for coordinator in _get_coordinators(hass):
+            if board_id in coordinator.board_ids:
+                writes.async_create_list(coordinator, board_id, call.data[ATTR_NAME])
+                return
+        raise HomeAssistantError(f"Board {board_id} is not tracked")
+
+    @callback
+    def async_update_list(call: ServiceCall) -> None:
+        list_id = call.data[ATTR_LIST_ID]
+        writes.async_update_list(
+            _get_list_coordinator(hass, list_id), list_id, call.data[ATTR_NAME]
+        )
+
+    @callback
+    def async_delete_list(call: ServiceCall) -> None:
+        list_id = call.data[ATTR_LIST_ID]
+        writes.async_archive_list(_get_list_coordinator(hass, list_id), list_id)
+
+    for service, service_func, schema in (
+        (SERVICE_CREATE_CARD, async_create_card, CREATE_CARD_SCHEMA),
+        (SERVICE_UPDATE_CARD, async_update_card, UPDATE_CARD_SCHEMA),
+        (SERVICE_DELETE_CARD, async_delete_card, DELETE_CARD_SCHEMA),
+        (SERVICE_CREATE_LIST, async_create_list, CREATE_LIST_SCHEMA),
+        (SERVICE_UPDATE_LIST, async_update_list, UPDATE_LIST_SCHEMA),
+        (SERVICE_DELETE_LIST, async_delete_list, DELETE_LIST_SCHEMA),
+    ):
+        hass.services.async_register(DOMAIN, service, service_func, schema=schema)
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the services once no config entry is loaded."""
+    if _get_coordinators(hass):
+        return
+    for service in (
+        SERVICE_CREATE_CARD,
+        SERVICE_UPDATE_CARD,
+        SERVICE_DELETE_CARD,
+        SERVICE_CREATE_LIST,
+        SERVICE_UPDATE_LIST,
+        SERVICE_DELETE_LIST,
+    ):
+        hass.services.async_remove(DOMAIN, service)
+
+
+def _get_coordinators(hass: HomeAssistant) -> list[TrelloDataUpdateCoordinator]:
+    return list(hass.data.get(DOMAIN, {}).values())
+
+
+def _get_list_coordinator(
+    hass: HomeAssistant, list_id: str
+) -> TrelloDataUpdateCoordinator:
+    """Get the coordinator of the board the list is on."""
+    for coordinator in _get_coordinators(hass):
+        if any(list_id in board.lists for board in (coordinator.data or {}).values()):
+            return coordinator
+    raise HomeAssistantError(f"List {list_id} is not on a tracked board")
+
+
+def _get_card_coordinator(
+    hass: HomeAssistant, card_id: str
+) -> TrelloDataUpdateCoordinator:
+    """Get the coordinator indexing the card, or the only one there is.
+
+    Without todo lists cards aren't indexed, so the config entry they belong
+    to is only known if there's one.
+    """
+    coordinators = _get_coordinators(hass)
+    for coordinator in coordinators:
+        if coordinator.card_index is not None and card_id in coordinator.card_index:
+            return coordinator
+    if len(coordinators) == 1:
+        return coordinators[0]
+    raise HomeAssistantError(f"Card {card_id} is not on a tracked list")
@@ -0,0 +1,252 @@
+"""Parse batch responses as they are received, one array item at a time."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import codecs
+import json
+import re
+from typing import Any
+from urllib.parse import parse_qs
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Start of a batched response whose payload is an array, like a board's lists
+_ARRAY_RESPONSE = re.compile(r'\{[ \t\n\r]*("\d+")[ \t\n\r]*:[ \t\n\r]*\[')
+# Characters after which a response that isn't an array has been recognized
+_ARRAY_RESPONSE_LOOKAHEAD = 16
+# Text up to the next bracket or unfinished string, skipping whole strings.
+# Unrolled so there's one way to match, and an unfinished string fails fast.
+_SKIP = re.compile(r'[^"{}\[\]]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"{}\[\]]*)*', re.S)
+# Rest of a string up to its closing quote or a backslash ending the text
+_STRING_REST = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.S)
+# A number, true, false or null
+_SCALAR = re.compile(r'[^ \t\n\r,\]}]+')
+
+# Returned while a value wasn't received in full, as null decodes to None
+_INCOMPLETE = object()
+
+_START = "start"
+_FIRST_RESPONSE = "first_response"
+_RESPONSE = "response"
+_AFTER_RESPONSE = "after_response"
+_FIRST_ITEM = "first_item"
+_ITEM = "item"
+_AFTER_ITEM = "after_item"
+_END_ARRAY = "end_array"
+_DONE = "done"
+
+Compact = Callable[[int, Any], Any]
+
+
+class BatchParser:
+    """Incremental parser of a ``/batch`` response body.
+
+    Each batched response is decoded once it was received in full, except
+    for array payloads, whose items are decoded one at a time and passed
+    through ``compact`` along with the index of their response. Only what
+    ``compact`` returns is kept, so a board's lists can be reduced to their
+    card counts before the next list is decoded.
+
+    Received chunks of a value are only scanned once, tracking bracket
+    depth and whether they end within a string, and the value is decoded
+    once its closing bracket was received. Parsing is linear in the size of
+    the body, however large a single value is.
+    """
+
+    def __init__(self, compact: Compact | None = None) -> None:
+        """Initialize before any of the body was received.
+
+        :param compact: Reduces an item of the response at the given index.
+        """
+        self._compact = compact
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        # Received text that wasn't parsed yet
+        self._text = ""
+        self._pos = 0
+        # Chunks of the value being received, and where its scan is at
+        self._value_chunks: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._state = _START
+        self._responses: list[dict[str, Any]] = []
+        # Status and items of the array payload being parsed
+        self._status = ""
+        self._items: list[Any] = []
+
+    def feed(self, chunk: bytes) -> None:
+        """Parse the next chunk of the body, as far as it's complete."""
+        self._text += self._utf8.decode(chunk)
+        self._parse(final=False)
+        self._text = self._text[self._pos :]
+        self._pos = 0
+
+    def close(self) -> list[dict[str, Any]]:
+        """Return the batched responses once the whole body was fed.
+
+        Raise ValueError if the body isn't a complete batch response.
+        """
+        self._text += self._utf8.decode(b"", final=True)
+        self._parse(final=True)
+        if self._state != _DONE:
+            raise ValueError("Batch response ended early")
+        return self._responses
+
+    def _parse(self, final: bool) -> None:
+        text = self._text
+        while True:
+            if self._value_chunks:
+                # Continue the value received so far, whitespace included
+                if (value := self._decode(final)) is _INCOMPLETE:
+                    return
+                self._add_value(value)
+                continue
+            self._pos = _WHITESPACE.match(text, self._pos).end()
+            if self._pos == len(text):
+                return
+            char = text[self._pos]
+            state = self._state
+            if state == _START:
+                self._expect(char, "[", _FIRST_RESPONSE)
+            elif state in (_FIRST_RESPONSE, _FIRST_ITEM) and char == "]":
+                self._pos += 1
+                self._state = _DONE if state == _FIRST_RESPONSE else _END_ARRAY
+            elif state in (_FIRST_RESPONSE, _RESPONSE):
+                if match := _ARRAY_RESPONSE.match(text, self._pos):
+                    self._status = json.loads(match.group(1))
+                    self._items = []
+                    self._pos = match.end()
+                    self._state = _FIRST_ITEM
+                    continue
+                if not final and len(text) - self._pos < _ARRAY_RESPONSE_LOOKAHEAD:
+                    return
+                if (response := self._decode(final)) is _INCOMPLETE:
+                    return
+                self._add_value(response)
+            elif state in (_FIRST_ITEM, _ITEM):
+                if (item := self._decode(final)) is _INCOMPLETE:
+                    return
+                self._add_value(item)
+            elif state == _AFTER_ITEM and char == "]":
+                self._pos += 1
+                self._state = _END_ARRAY
+            elif state == _AFTER_ITEM:
+                self._expect(char, ",", _ITEM)
+            elif state == _END_ARRAY:
+                self._expect(char, "}", _AFTER_RESPONSE)
+                self._responses.append({self._status: self._items})
+                self._items = []
+            elif state == _AFTER_RESPONSE and char == "]":
+                self._pos += 1
+                self._state = _DONE
+            elif state == _AFTER_RESPONSE:
+                self._expect(char, ",", _RESPONSE)
+            else:
+                raise ValueError(f"Unexpected {char!r} after batch response")
+
+    def _add_value(self, value: Any) -> None:
+        """Add a decoded response, or item of an array response."""
+        if self._state in (_FIRST_ITEM, _ITEM):
+            if self._compact is not None:
+                value = self._compact(len(self._responses), value)
+            self._items.append(value)
+            self._state = _AFTER_ITEM
+        else:
+            self._responses.append(value)
+            self._state = _AFTER_RESPONSE
+
+    def _expect(self, char: str, expected: str, next_state: str) -> None:
+        if char != expected:
+            raise ValueError(f"Expected {expected!r} at {self._pos}, got {char!r}")
+        self._pos += 1
+        self._state = next_state
+
+    def _decode(self, final: bool) -> Any:
+        """Decode the value at the current position.
+
+        Return _INCOMPLETE if it wasn't received in full yet, keeping what
+        was received of an object, array or string to continue from.
+        """
+        text = self._text
+        start = scan_start = self._pos
+        if not self._value_chunks:
+            if text[start] not in '{["':
+                return self._decode_scalar(final)
+            self._depth = 0
+            self._in_string = text[start] == '"'
+            self._escape = False
+            if self._in_string:
+                scan_start += 1
+        end = self._scan(text, scan_start)
+        if end is None:
+            self._value_chunks.append(text[start:])
+            self._pos = len(text)
+            return _INCOMPLETE
+        self._value_chunks.append(text[start:end])
+        value_text = "".join(self._value_chunks)
+        self._value_chunks = []
+        self._pos = end
+        return json.loads(value_text)
+
+    def _decode_scalar(self, final: bool) -> Any:
+        if (match := _SCALAR.match(self._text, self._pos)) is None:
+            raise ValueError(f"Unexpected {self._text[self._pos]!r} at {self._pos}")
+        if match.end() == len(self._text) and not final:
+            # A number may continue in the next chunk
+            return _INCOMPLETE
+        self._pos = match.end()
+        return json.loads(match.group())
+
+    def _scan(self, text: str, pos: int) -> int | None:
+        """Return the end of the value being received, if it's in the text."""
+        while pos < len(text):
+            if self._escape:
+                self._escape = False
+                pos += 1
+            elif self._in_string:
+                pos = _STRING_REST.match(text, pos).end()
+                if pos == len(text):
+                    return None
+                if text[pos] == "\\":
+                    # The escaped character is in the next chunk
+                    self._escape = True
+                else:
+                    self._in_string = False
+                pos += 1
+                if not self._in_string and self._depth == 0:
+                    return pos
+            else:
+                pos = _SKIP.match(text, pos).end()
+                if pos == len(text):
+                    return None
+                char = text[pos]
+                pos += 1
+                if char == '"':
+                    self._in_string = True
+                    continue
+                self._depth += 1 if char in "{[" else -1
+                if self._depth == 0:
+                    return pos
+        return None
+
+
+def get_compact(urls: list[str]) -> Compact:
+    """Return how to compact the items of the responses to the batched URLs.
+
+    Lists requested with only their cards' IDs are reduced to their card
+    count, as nothing else about their cards is used.
+    """
+    count_indexes = {i for i, url in enumerate(urls) if _counts_cards(url)}
+
+    def compact(index: int, item: Any) -> Any:
+        if index not in count_indexes or "cards" not in item:
+            return item
+        cards = item.pop("cards")
+        item["cardCount"] = len(cards)
+        return item
+
+    return compact
+
+
+def _counts_cards(url: str) -> bool:
+    path, _, query = url.partition("?")
+    return path.endswith("/lists") and parse_qs(query).get("card_fields") == ["id"]
@@ -0,0 +1,174 @@
+"""Platform for todo integration."""
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.components.todo import (
+    TodoItem,
+    TodoItemStatus,
+    TodoListEntity,
+    TodoListEntityFeature,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .api import TrelloError
+from .card_index import CardIndex
+from .const import DOMAIN, Board, Card, List
+from .coordinator import TrelloDataUpdateCoordinator
+from .entity import board_device_info
+from .writes import async_archive_card, async_create_card, async_update_card
+
+
+class TrelloTodoListEntity(
+    CoordinatorEntity[TrelloDataUpdateCoordinator], TodoListEntity
+):
+    """A Trello list's open cards as a todo list."""
+
+    _attr_has_entity_name = True
+    _attr_supported_features = (
+        TodoListEntityFeature.CREATE_TODO_ITEM
+        | TodoListEntityFeature.UPDATE_TODO_ITEM
+        | TodoListEntityFeature.DELETE_TODO_ITEM
+    )
+
+    def __init__(
+        self,
+        board: Board,
+        list_: List,
+        coordinator: TrelloDataUpdateCoordinator,
+        card_index: CardIndex,
+    ) -> None:
+        """Initialize todo list."""
+        super().__init__(coordinator)
+        self.board_id = board.id
+        self.list_id = list_.id
+        self._card_index = card_index
+        self._attr_unique_id = f"todo_{list_.id}".lower()
+        self._attr_name = list_.name
+        self._attr_device_info = board_device_info(board)
+        self._written_cards: tuple[Card, ...] | None = None
+
+    @property
+    def available(self) -> bool:
+        """Determine if todo list is available."""
+        board = self.coordinator.data.get(self.board_id)
+        return bool(board and board.lists.get(self.list_id))
+
+    @property
+    def todo_items(self) -> list[TodoItem]:
+        """Return the list's open cards, completed if their due date is."""
+        return [
+            TodoItem(
+                summary=card.name,
+                uid=card.id,
+                status=(
+                    TodoItemStatus.COMPLETED
+                    if card.due_complete
+                    else TodoItemStatus.NEEDS_ACTION
+                ),
+            )
+            for card in self._card_index.list_cards(self.list_id)
+        ]
+
+    async def async_create_todo_item(self, item: TodoItem) -> None:
+        """Add a card to the bottom of the list."""
+        try:
+            await async_create_card(
+                self.coordinator, self.list_id, item.summary or ""
+            ).async_wait()
+        except TrelloError as ex:
+            raise HomeAssistantError(f"Unable to create card: {ex}") from ex
+
+    async def async_update_todo_item(self, item: TodoItem) -> None:
+        """Rename a card, or mark its due date complete."""
+        if item.uid is None:
+            return
+        try:
+            await async_update_card(
+                self.coordinator,
+                item.uid,
+                name=item.summary,
+                due_complete=(
+                    None
+                    if item.status is None
+                    else item.status == TodoItemStatus.COMPLETED
+                ),
+            ).async_wait()
+        except TrelloError as ex:
+            raise HomeAssistantError(f"Unable to update card: {ex}") from ex
+
+    async def async_delete_todo_items(self, uids: list[str]) -> None:
+        """Archive cards, so they can still be restored in Trello."""
+        results = await asyncio.gather(
+            *(
+                async_archive_card(self.coordinator, uid).async_wait()
+                for uid in uids
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, TrelloError):
+                raise HomeAssistantError(
+                    f"Unable to archive card: {result}"
+                ) from result
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the list or its cards changed."""
+        board = self.coordinator.data.get(self.board_id)
+        cards = self._card_index.list_cards(self.list_id)
+        list_ = board.lists.get(self.list_id) if board else None
+        name = list_.name if list_ else self._attr_name
+        if cards is self._written_cards and name == self._attr_name:
+            return
+        self._written_cards = cards
+        self._attr_name = name
+        super()._handle_coordinator_update()
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up a todo list per Trello list when todo lists are enabled."""
+    trello_coordinator: TrelloDataUpdateCoordinator = hass.data[DOMAIN][
+        config_entry.entry_id
+    ]
+    if (card_index := trello_coordinator.card_index) is None:
+        return
+    entity_registry = er.async_get(hass)
+    list_id_board_ids: dict[str, str] = {}
+
+    @callback
+    def async_update_todo_lists() -> None:
+        new_todo_lists = [
+            TrelloTodoListEntity(board, list_, trello_coordinator, card_index)
+            for board in trello_coordinator.data.values()
+            for list_ in board.lists.values()
+            if list_.id not in list_id_board_ids
+        ]
+        for todo_list in new_todo_lists:
+            list_id_board_ids[todo_list.list_id] = todo_list.board_id
+        if new_todo_lists:
+            async_add_entities(new_todo_lists)
+
+        for list_id, board_id in list(list_id_board_ids.items()):
+            board = trello_coordinator.data.get(board_id)
+            if board is None or (board.available and list_id not in board.lists):
+                del list_id_board_ids[list_id]
+                if entity_id := entity_registry.async_get_entity_id(
+                    Platform.TODO, DOMAIN, f"todo_{list_id}".lower()
+                ):
+                    entity_registry.async_remove(entity_id)
+
+    async_update_todo_lists()
+    config_entry.async_on_unload(
+        trello_coordinator.async_add_listener(async_update_todo_lists)
+    )
@@ -0,0 +1,348 @@
+"""Queue writes to Trello so they are sent together and reconciled once."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import replace
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .actions import apply_action
+from .api import TrelloClient
+from .const import (
+    LOGGER,
+    MAX_CONCURRENT_WRITES,
+    WRITE_COALESCE_DELAY,
+    WRITE_ECHO_TTL,
+    Card,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import TrelloDataUpdateCoordinator
+
+
+class Write:
+    """A queued request, merged with later updates of the same card or list."""
+
+    def __init__(
+        self, method: str, path: str, params: dict[str, str], board_ids: set[str]
+    ) -> None:
+        """Initialize a write that hasn't been sent yet.
+
+        :param board_ids: Boards to fetch once the write was sent.
+        """
+        self.method = method
+        self.path = path
+        self.params = params
+        self.board_ids = board_ids
+        self.waited = False
+        self._future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+
+    async def async_wait(self) -> Any:
+        """Wait for the write to be sent and return Trello's response."""
+        self.waited = True
+        return await self._future
+
+    def set_result(self, result: Any) -> None:
+        """Resolve the write with Trello's response."""
+        self._future.set_result(result)
+
+    def set_exception(self, ex: Exception) -> None:
+        """Fail the write, logging the error if nobody is waiting on it."""
+        if self.waited:
+            self._future.set_exception(ex)
+        else:
+            LOGGER.error("Unable to %s %s: %s", self.method, self.path, ex)
+
+
+class WriteQueue:
+    """Writes waiting to be sent to Trello.
+
+    Writes queued within a short window are sent concurrently under the rate
+    limit, updates of the same card or list becoming a single request. The
+    boards they touched are then fetched once to replace optimistic data.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: TrelloClient,
+        reconcile: Callable[[list[str]], Awaitable[None]],
+    ) -> None:
+        """Initialize an empty queue.
+
+        :param reconcile: Fetches the given boards after writes were sent.
+        """
+        self.hass = hass
+        self.client = client
+        self._reconcile = reconcile
+        self._writes: dict[str, Write] = {}
+        self._board_ids: set[str] = set()
+        self._flush_task: asyncio.Task[None] | None = None
+        # Expiry of cards and lists written here, to recognize their actions
+        self._written_ids: dict[str, float] = {}
+
+    @callback
+    def async_queue(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, str],
+        board_ids: Iterable[str | None] = (),
+    ) -> Write:
+        """Queue a write, merging an update into a queued one of the same path."""
+        board_ids = {board_id for board_id in board_ids if board_id}
+        if method == "PUT" and (write := self._writes.get(path)) is not None:
+            write.params.update(params)
+            write.board_ids.update(board_ids)
+            return write
+        write = Write(method, path, dict(params), board_ids)
+        # Creates are never merged
+        self._writes[path if method == "PUT" else f"{path}#{id(write)}"] = write
+        self._schedule_flush()
+        return write
+
+    @callback
+    def async_reconcile(self, board_ids: Iterable[str]) -> None:
+        """Fetch the boards along with the next writes."""
+        self._board_ids.update(board_ids)
+        self._schedule_flush()
+
+    def is_echo(self, action: dict[str, Any]) -> bool:
+        """Return whether the action is probably about a write made here."""
+        data = action.get("data", {})
+        model_id = data.get("card", data.get("list", {})).get("id")
+        return self._written_ids.get(model_id, 0) > time.monotonic()
+
+    @callback
+    def _schedule_flush(self) -> None:
+        if self._flush_task is None:
+            self._flush_task = self.hass.async_create_task(self._async_flush())
+
+    async def _async_flush(self) -> None:
+        """Send the queued writes, then fetch the boards they touched."""
+        await asyncio.sleep(WRITE_COALESCE_DELAY)
+        writes = list(self._writes.values())
+        board_ids = self._board_ids
+        self._writes = {}
+        self._board_ids = set()
+        self._flush_task = None
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_WRITES)
+
+        async def send(write: Write) -> Any:
+            async with semaphore:
+                return await self.client.async_fetch_json(
+                    write.path, write.params, http_method=write.method
+                )
+
+        if writes:
+            LOGGER.debug("Sending %s writes", len(writes))
+        results = await asyncio.gather(
+            *(send(write) for write in writes), return_exceptions=True
+        )
+        expires = time.monotonic() + WRITE_ECHO_TTL
+        for write, result in zip(writes, results):
+            board_ids.update(write.board_ids)
+            if isinstance(result, Exception):
+                write.set_exception(result)
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            if isinstance(result, dict):
+                if model_id := result.get("id"):
+                    self._written_ids[model_id] = expires
+                # Writes of cards that aren't indexed don't know their board
+                if board_id := result.get("idBoard"):
+                    board_ids.add(board_id)
+            write.set_result(result)
+
+        now = time.monotonic()
+        self._written_ids = {
+            model_id: expiry
+            for model_id, expiry in self._written_ids.items()
+            if expiry > now
+        }
+        if board_ids:
+            await self._reconcile(sorted(board_ids))
+
+
+@callback
+def async_create_card(
+    coordinator: TrelloDataUpdateCoordinator, list_id: str, name: str
+) -> Write:
+    """Queue creating a card at the bottom of a list, counting it right away."""
+    board_id = _apply_local_action(coordinator, "createCard", {"id": list_id})
+    return coordinator.writes.async_queue(
+        "POST", "/cards", {"idList": list_id, "name": name}, [board_id]
+    )
+
+
+@callback
+def async_update_card(
+    coordinator: TrelloDataUpdateCoordinator,
+    card_id: str,
+    name: str | None = None,
+    list_id: str | None = None,
+    due_complete: bool | None = None,
+) -> Write:
+    """Queue renaming, moving or completing a card, applying it right away.
+
+    A card is only known to be moved from its list when todo lists or card
+    events index it. Its old list is then taken from the index, which card
+    events only update once the board is fetched again.
+    """
+    params: dict[str, str] = {}
+    if name is not None:
+        params["name"] = name
+    if list_id is not None:
+        params["idList"] = list_id
+    if due_complete is not None:
+        params["dueComplete"] = str(due_complete).lower()
+
+    board_ids = [_list_board_id(coordinator, list_id)] if list_id else []
+    if (previous_list_id := _card_list_id(coordinator, card_id)) is not None:
+        board_ids.append(_list_board_id(coordinator, previous_list_id))
+        if list_id and list_id != previous_list_id:
+            _apply_local_action(
+                coordinator, "deleteCard", {"id": previous_list_id}, card_id=card_id
+            )
+            _apply_local_action(coordinator, "createCard", {"id": list_id})
+    if coordinator.card_index is not None and (
+        previous := coordinator.card_index.get(card_id)
+    ):
+        _index_card(
+            coordinator,
+            replace(
+                previous,
+                list_id=list_id or previous.list_id,
+                name=previous.name if name is None else name,
+                due_complete=(
+                    previous.due_complete if due_complete is None else due_complete
+                ),
+            ),
+        )
+    return coordinator.writes.async_queue(
+        "PUT", f"/cards/{card_id}", params, board_ids
+    )
+
+
+@callback
+def async_archive_card(coordinator: TrelloDataUpdateCoordinator, card_id: str) -> Write:
+    """Queue archiving a card, removing it right away if it's indexed."""
+    board_ids = []
+    if (list_id := _card_list_id(coordinator, card_id)) is not None:
+        if coordinator.card_index is not None:
+            coordinator.card_index.remove(card_id)
+        board_ids.append(
+            _apply_local_action(
+                coordinator, "deleteCard", {"id": list_id}, card_id=card_id
+            )
+        )
+    return coordinator.writes.async_queue(
+        "PUT", f"/cards/{card_id}", {"closed": "true"}, board_ids
+    )
+
+
+@callback
+def async_create_list(
+    coordinator: TrelloDataUpdateCoordinator, board_id: str, name: str
+) -> Write:
+    """Queue creating a list at the end of a board.
+
+    The list's ID is only known once created, it appears when the board is
+    fetched after writing.
+    """
+    return coordinator.writes.async_queue(
+        "POST",
+        "/lists",
+        {"idBoard": board_id, "name": name, "pos": "bottom"},
+        [board_id],
+    )
+
+
+@callback
+def async_update_list(
+    coordinator: TrelloDataUpdateCoordinator, list_id: str, name: str
+) -> Write:
+    """Queue renaming a list, applying it right away."""
+    board_id = _apply_local_action(
+        coordinator, "updateList", {"id": list_id, "name": name}, {"name": None}
+    )
+    return coordinator.writes.async_queue(
+        "PUT", f"/lists/{list_id}", {"name": name}, [board_id]
+    )
+
+
+@callback
+def async_archive_list(coordinator: TrelloDataUpdateCoordinator, list_id: str) -> Write:
+    """Queue archiving a list, removing it right away."""
+    board_id = _apply_local_action(
+        coordinator, "updateList", {"id": list_id, "closed": True}, {"closed": False}
+    )
+    return coordinator.writes.async_queue(
+        "PUT", f"/lists/{list_id}", {"closed": "true"}, [board_id]
+    )
+
+
+@callback
+def _index_card(coordinator: TrelloDataUpdateCoordinator, card: Card) -> None:
+    if coordinator.card_index is None:
+        return
+    coordinator.card_index.upsert(card)
+    coordinator.async_update_listeners()
+
+
+def _card_list_id(
+    coordinator: TrelloDataUpdateCoordinator, card_id: str
+) -> str | None:
+    """Return the ID of the card's list, None if its cards aren't indexed."""
+    if coordinator.card_index is not None:
+        card = coordinator.card_index.get(card_id)
+        return card.list_id if card else None
+    if coordinator.card_moves is not None:
+        return coordinator.card_moves.get_list_id(card_id)
+    return None
+
+
+def _list_board_id(
+    coordinator: TrelloDataUpdateCoordinator, list_id: str
+) -> str | None:
+    for board in (coordinator.data or {}).values():
+        if list_id in board.lists:
+            return board.id
+    return None
+
+
+@callback
+def _apply_local_action(
+    coordinator: TrelloDataUpdateCoordinator,
+    action_type: str,
+    list_: dict[str, Any],
+    old: dict[str, Any] | None = None,
+    card_id: str | None = None,
+) -> str | None:
+    """Apply a write made here to a list as if Trello sent its action.
+
+    The action is applied to a copy of the data, replacing it like pushed
+    actions do, so data a refresh already took isn't changed.
+    Return the ID of the list's board, None if the list isn't tracked.
+
+    :param card_id: Open card the write is about.
+    """
+    if (board_id := _list_board_id(coordinator, list_["id"])) is None:
+        return None
+    data = {"board": {"id": board_id}, "list": list_}
+    if old is not None:
+        data["old"] = old
+    if card_id is not None:
+        data["card"] = {"id": card_id}
+    boards = dict(coordinator.data)
+    if apply_action(
+        boards, {"type": action_type, "data": data}, {card_id} if card_id else None
+    ):
+        coordinator.data = boards
+        coordinator.async_update_listeners()
+    return board_id
@@ -0,0 +1,86 @@
+"""Configure benchmarks for the Trello integration.
+
+Benchmarks run against the ``small`` shape by default. Set
+``TRELLO_BENCHMARK_SHAPE`` to run another shape from ``generate.SHAPES``, and
+``TRELLO_BENCHMARK_UPDATE=1`` to record the results as the new baselines.
+Timings depend on the machine's load, so they're only checked with
+``TRELLO_BENCHMARK_TIMINGS=1``, while memory and state writes always are.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from .generate import SHAPES, Shape, generate_batch
+
+BASELINES_PATH = Path(__file__).parent / "baselines.json"
+
+UPDATE = bool(os.environ.get("TRELLO_BENCHMARK_UPDATE"))
+TIMINGS = UPDATE or bool(os.environ.get("TRELLO_BENCHMARK_TIMINGS"))
+
+# Benchmarks that only check timings
+timed = pytest.mark.skipif(
+    not TIMINGS, reason="Timings are checked with TRELLO_BENCHMARK_TIMINGS=1"
+)
+
+# Timings vary between machines, so only flag large slowdowns
+TIME_TOLERANCE = 3.0
+TIME_SLACK = 0.05
+MEMORY_TOLERANCE = 1.5
+
+
+@pytest.fixture(autouse=True)
+def mock_rate_limits():
+    """Lift rate limits, so benchmarks don't include waiting for the budget."""
+    with patch("custom_components.trello.ratelimit.KEY_LIMIT", 1_000_000), patch(
+        "custom_components.trello.ratelimit.TOKEN_LIMIT", 1_000_000
+    ):
+        yield
+
+
+@pytest.fixture(name="shape_name", scope="session")
+def mock_shape_name() -> str:
+    """Name of the shape to benchmark."""
+    return os.environ.get("TRELLO_BENCHMARK_SHAPE", "small")
+
+
+@pytest.fixture(name="shape", scope="session")
+def mock_shape(shape_name: str) -> Shape:
+    """Shape to benchmark."""
+    return SHAPES[shape_name]
+
+
+@pytest.fixture(name="path_responses", scope="session")
+def mock_path_responses(shape: Shape) -> dict[str, dict[str, Any]]:
+    """Batch responses of the benchmarked shape by path."""
+    return generate_batch(shape)
+
+
+@pytest.fixture(name="check_baseline", scope="session")
+def mock_check_baseline(shape_name: str):
+    """Compare a benchmark result with its baseline, or record it."""
+    baselines: dict[str, dict[str, float]] = json.loads(BASELINES_PATH.read_text())
+
+    def check(metric: str, value: float) -> None:
+        if metric.endswith("_seconds") and not TIMINGS:
+            return
+        if UPDATE:
+            baselines.setdefault(shape_name, {})[metric] = round(value, 6)
+            BASELINES_PATH.write_text(json.dumps(baselines, indent=2) + "\n")
+            return
+        if (baseline := baselines.get(shape_name, {}).get(metric)) is None:
+            pytest.skip(f"No {metric} baseline for the {shape_name} shape")
+        if metric.endswith("_seconds"):
+            limit = baseline * TIME_TOLERANCE + TIME_SLACK
+        elif metric.endswith("_bytes"):
+            limit = baseline * MEMORY_TOLERANCE
+        else:
+            limit = baseline
+        assert value <= limit, f"{metric} regressed: {value} > {baseline} baseline"
+
+    return check
@@ -0,0 +1,93 @@
+"""Generate synthetic Trello batch responses of any size.
+
+Responses are keyed by path like ``tests/fixtures/batch.json``, so they can be
+served with ``tests.conftest.mock_batch``. To write one to a file::
+
+    python -m tests.benchmarks.generate 1000 50 1000 --failing-every 10
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+import json
+import sys
+from typing import Any
+
+NOT_FOUND = {
+    "name": "NotFoundError",
+    "message": "The requested resource was not found.",
+    "statusCode": 404,
+}
+
+
+@dataclass(frozen=True)
+class Shape:
+    """Size of a generated set of boards."""
+
+    boards: int
+    lists: int
+    cards: int
+    # Every nth board fails to fetch, 0 for no failures
+    failing_every: int = 0
+
+
+SHAPES = {
+    "small": Shape(boards=20, lists=10, cards=20, failing_every=7),
+    "medium": Shape(boards=200, lists=20, cards=100, failing_every=25),
+    "large": Shape(boards=1000, lists=50, cards=1000, failing_every=100),
+}
+
+
+def board_ids(shape: Shape) -> list[str]:
+    """Return the IDs of the boards generated for a shape."""
+    return [f"board_{i}" for i in range(shape.boards)]
+
+
+def generate_batch(shape: Shape) -> dict[str, dict[str, Any]]:
+    """Generate the batch response for each board and lists path.
+
+    The lists of a board share the same cards, which keeps large shapes cheap
+    to generate. Only the number of cards in a list is used.
+    """
+    cards = [{"id": f"card_{i}"} for i in range(shape.cards)]
+    path_responses: dict[str, dict[str, Any]] = {}
+    for i, board_id in enumerate(board_ids(shape)):
+        failing = shape.failing_every
+        if failing and i % failing == failing - 1:
+            path_responses[f"/boards/{board_id}"] = NOT_FOUND
+            path_responses[f"/boards/{board_id}/lists"] = NOT_FOUND
+            continue
+        path_responses[f"/boards/{board_id}"] = {
+            "200": {
+                "id": board_id,
+                "name": f"Board {i}",
+                "dateLastActivity": "2023-10-01T12:00:00.000Z",
+            }
+        }
+        path_responses[f"/boards/{board_id}/lists"] = {
+            "200": [
+                {"id": f"{board_id}_list_{j}", "name": f"List {j}", "cards": cards}
+                for j in range(shape.lists)
+            ]
+        }
+    return path_responses
+
+
+def main() -> None:
+    """Write a generated batch response as JSON to stdout."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("boards", type=int)
+    parser.add_argument("lists", type=int)
+    parser.add_argument("cards", type=int)
+    parser.add_argument("--failing-every", type=int, default=0)
+    args = parser.parse_args()
+    json.dump(
+        generate_batch(
+            Shape(args.boards, args.lists, args.cards, args.failing_every)
+        ),
+        sys.stdout,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""Benchmark the trello coordinator and sensors against checked-in baselines."""
+from collections.abc import Callable
+import gc
+import json
+import time
+import tracemalloc
+from typing import Any
+from unittest.mock import patch
+
+from custom_components.trello.api import STREAM_CHUNK_SIZE
+from custom_components.trello.const import (
+    BATCH_URL_LIMIT,
+    CONF_BOARD_IDS,
+    CONF_USER_EMAIL,
+    CONF_USER_ID,
+    DOMAIN,
+)
+from custom_components.trello.coordinator import (
+    TrelloDataUpdateCoordinator,
+    _get_boards,
+    _lists_url,
+)
+from custom_components.trello.sensor import TrelloSensor
+from custom_components.trello.stream import BatchParser, get_compact
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import CONF_API_KEY, CONF_API_TOKEN
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util.json import json_loads
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+from ..conftest import BATCH_URL, REFRESH_DUE, mock_batch, mock_client
+from .conftest import timed
+from .generate import Shape, board_ids
+
+REPEATS = 5
+
+CheckBaseline = Callable[[str, float], None]
+
+
+def _batch_responses(
+    shape: Shape, path_responses: dict[str, dict[str, Any]]
+) -> list[dict[str, Any]]:
+    batch_responses = []
+    for board_id in board_ids(shape):
+        batch_responses.append(path_responses[f"/boards/{board_id}"])
+        batch_responses.append(path_responses[f"/boards/{board_id}/lists"])
+    return batch_responses
+
+
+@timed
+def test_parse_time(
+    shape: Shape,
+    path_responses: dict[str, dict[str, Any]],
+    check_baseline: CheckBaseline,
+) -> None:
+    """Benchmark building boards from batch responses."""
+    batch_responses = _batch_responses(shape, path_responses)
+    ids = board_ids(shape)
+
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        _get_boards(batch_responses, ids)
+        timings.append(time.perf_counter() - start)
+
+    check_baseline("parse_seconds", min(timings))
+
+
+def test_parse_peak_memory(
+    shape: Shape,
+    path_responses: dict[str, dict[str, Any]],
+    check_baseline: CheckBaseline,
+) -> None:
+    """Benchmark memory allocated while building boards from batch responses."""
+    batch_responses = _batch_responses(shape, path_responses)
+    ids = board_ids(shape)
+
+    tracemalloc.start()
+    _get_boards(batch_responses, ids)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    check_baseline("parse_peak_bytes", peak)
+
+
+def test_stream_peak_memory(
+    shape: Shape,
+    path_responses: dict[str, dict[str, Any]],
+    check_baseline: CheckBaseline,
+) -> None:
+    """Benchmark memory parsing a batch as it's received against all at once."""
+    ids = board_ids(shape)[: BATCH_URL_LIMIT // 2]
+    urls = []
+    for board_id in ids:
+        urls.extend((f"/boards/{board_id}", _lists_url(board_id)))
+    body = json.dumps([path_responses[url.split("?")[0]] for url in urls]).encode()
+
+    tracemalloc.start()
+    _get_boards(json_loads(body), ids)
+    _, body_peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    parser = BatchParser(get_compact(urls))
+    for i in range(0, len(body), STREAM_CHUNK_SIZE):
+        parser.feed(body[i : i + STREAM_CHUNK_SIZE])
+    _get_boards(parser.close(), ids)
+    _, stream_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert stream_peak < body_peak
+    check_baseline("batch_peak_bytes", body_peak)
+    check_baseline("stream_peak_bytes", stream_peak)
+
+
+@timed
+def test_stream_huge_list(shape: Shape, check_baseline: CheckBaseline) -> None:
+    """Benchmark parsing one list with many cards as it's received.
+
+    Its cards are received over many chunks before the list can be decoded,
+    which must take time linear in the list's size.
+    """
+    cards = shape.lists * shape.cards * 200
+    urls = ["/boards/board_0", _lists_url("board_0")]
+
+    def parse_seconds(card_count: int) -> float:
+        lists = [
+            {
+                "id": "list_0",
+                "name": "A huge list",
+                "cards": [{"id": f"card_{i}"} for i in range(card_count)],
+            }
+        ]
+        body = json.dumps([{"200": {"id": "board_0"}}, {"200": lists}]).encode()
+        del lists
+        timings = []
+        # Like timeit, so collections of other tests' objects don't skew the ratio
+        gc.collect()
+        gc.disable()
+        try:
+            for _ in range(REPEATS):
+                start = time.perf_counter()
+                parser = BatchParser(get_compact(urls))
+                for i in range(0, len(body), STREAM_CHUNK_SIZE):
+                    parser.feed(body[i : i + STREAM_CHUNK_SIZE])
+                assert parser.close()[1]["200"][0]["cardCount"] == card_count
+                timings.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+        return min(timings)
+
+    seconds = parse_seconds(cards)
+    double_seconds = parse_seconds(2 * cards)
+
+    # Twice the cards take about twice as long, where quadratic would be 4x
+    assert double_seconds < seconds * 3
+    check_baseline("huge_list_stream_seconds", seconds)
+
+
+async def test_fetch_large_board(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    shape: Shape,
+    check_baseline: CheckBaseline,
+) -> None:
+    """Benchmark fetching one board with many cards, from its received bytes.
+
+    Time and memory cover streaming the batch body through the parser and
+    building the board's counts, but not generating the body.
+    """
+    lists = [
+        {
+            "id": f"list_{i}",
+            "name": f"List {i}",
+            "cards": [{"id": f"card_{i}_{j}"} for j in range(shape.cards * 50)],
+        }
+        for i in range(shape.lists)
+    ]
+    body = json.dumps(
+        [{"200": {"id": "board_0", "name": "A Board"}}, {"200": lists}]
+    ).encode()
+    del lists
+    aioclient_mock.get(BATCH_URL, content=body)
+    client = mock_client(hass)
+    urls = ["/boards/board_0", _lists_url("board_0")]
+
+    async def fetch() -> None:
+        boards = _get_boards(await client.async_fetch_batch(urls), ["board_0"])
+        assert len(boards["board_0"].lists) == shape.lists
+
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        await fetch()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    await fetch()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    check_baseline("large_board_fetch_seconds", min(timings))
+    check_baseline("large_board_fetch_peak_bytes", peak)
+
+
+@timed
+async def test_refresh_latency(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    shape: Shape,
+    path_responses: dict[str, dict[str, Any]],
+    check_baseline: CheckBaseline,
+) -> None:
+    """Benchmark fetching all boards, including serving the batch responses."""
+    aioclient_mock.get(BATCH_URL, side_effect=mock_batch(path_responses))
+    client = mock_client(hass)
+
+    timings = []
+    for _ in range(REPEATS):
+        coordinator = TrelloDataUpdateCoordinator(hass, client, board_ids(shape))
+        start = time.perf_counter()
+        await coordinator.async_refresh()
+        timings.append(time.perf_counter() - start)
+        assert coordinator.last_update_success
+
+    check_baseline("refresh_seconds", min(timings))
+
+
+async def test_setup_and_state_writes(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    shape: Shape,
+    path_responses: dict[str, dict[str, Any]],
+    check_baseline: CheckBaseline,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Benchmark setting up sensors, then state writes when one list changes."""
+    MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_API_KEY: "abc123",
+            CONF_API_TOKEN: "123abc",
+            CONF_USER_ID: "12345",
+            CONF_USER_EMAIL: "foo@example.com",
+        },
+        options={CONF_BOARD_IDS: board_ids(shape)},
+    ).add_to_hass(hass)
+    path_responses = dict(path_responses)
+    aioclient_mock.get(BATCH_URL, side_effect=mock_batch(path_responses))
+
+    start = time.perf_counter()
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+    check_baseline("setup_seconds", time.perf_counter() - start)
+
+    board_id = "board_0"
+    lists = path_responses[f"/boards/{board_id}/lists"]["200"]
+    path_responses[f"/boards/{board_id}"] = {
+        "200": {
+            **path_responses[f"/boards/{board_id}"]["200"],
+            "dateLastActivity": "2023-10-02T12:00:00.000Z",
+        }
+    }
+    path_responses[f"/boards/{board_id}/lists"] = {
+        "200": [{**lists[0], "cards": []}, *lists[1:]]
+    }
+
+    write_ha_state = TrelloSensor.async_write_ha_state
+    with patch.object(
+        TrelloSensor, "async_write_ha_state", autospec=True, side_effect=write_ha_state
+    ) as mock_write:
+        freezer.tick(REFRESH_DUE)
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.board_0_list_0").state == "0"
+    check_baseline("state_writes_per_refresh", mock_write.call_count)
@@ -1,17 +1,28 @@
 """Configure tests for the Trello integration."""
 from collections.abc import Awaitable, Callable, Coroutine
+from datetime import timedelta
 import json
 from typing import Any
-from unittest.mock import patch
 
 import pytest
 
-from custom_components.trello.const import DOMAIN
+from custom_components.trello.api import TrelloClient
+from custom_components.trello.const import DOMAIN, SCHEDULE_JITTER, UPDATE_INTERVAL
+from custom_components.trello.ratelimit import async_get_governor
 from homeassistant.const import CONF_API_KEY, CONF_API_TOKEN
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.setup import async_setup_component
 
 from pytest_homeassistant_custom_component.common import MockConfigEntry, load_fixture
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+    AiohttpClientMockResponse,
+)
+
+BATCH_URL = "https://api.trello.com/1/batch"
+# Time after which every board is due for a refresh again
+REFRESH_DUE = UPDATE_INTERVAL + timedelta(seconds=SCHEDULE_JITTER)
 
 
 @pytest.fixture(autouse=True)
@@ -31,20 +42,56 @@ def mock_fetch_json(path="batch.json"):
     return json.loads(load_fixture(path))
 
 
+def mock_client(hass: HomeAssistant) -> TrelloClient:
+    """Create a Trello client using the mocked aiohttp session."""
+    return TrelloClient(
+        async_get_clientsession(hass),
+        "abc123",
+        "123abc",
+        async_get_governor(hass, "abc123", "123abc"),
+    )
+
+
+def mock_batch(path_responses: dict[str, dict[str, Any]]):
+    """Mock Trello's batch endpoint, answering each URL by its path.
+
+    :param path_responses: Batch response for each path, either
+        ``{"200": payload}`` or an error object. Unknown paths are not found.
+    """
+
+    async def side_effect(method, url, data):
+        responses = []
+        for batch_url in url.query["urls"].split(","):
+            responses.append(
+                path_responses.get(
+                    batch_url.split("?")[0],
+                    {
+                        "name": "NotFoundError",
+                        "message": "The requested resource was not found.",
+                        "statusCode": 404,
+                    },
+                )
+            )
+        return AiohttpClientMockResponse(method, url, json=responses)
+
+    return side_effect
+
+
 @pytest.fixture(name="setup_integration")
 async def mock_setup_integration(
-    hass: HomeAssistant, config_entry: MockConfigEntry
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    aioclient_mock: AiohttpClientMocker,
 ) -> Callable[[], Coroutine[Any, Any, None]]:
     """Mock a config entry then set up the component."""
     config_entry.add_to_hass(hass)
 
     async def func() -> None:
-        with patch(
-            "custom_components.trello.TrelloClient.fetch_json",
-            return_value=mock_fetch_json("batch.json"),
-        ):
-            assert await async_setup_component(hass, DOMAIN, {})
-            await hass.async_block_till_done()
+        aioclient_mock.get(
+            BATCH_URL, side_effect=mock_batch(mock_fetch_json("batch.json"))
+        )
+        assert await async_setup_component(hass, DOMAIN, {})
+        await hass.async_block_till_done()
 
     return func
 
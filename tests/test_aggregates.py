@@ -0,0 +1,67 @@
+"""Test counting cards for the trello card sensors."""
+from datetime import datetime, timezone
+
+from custom_components.trello.aggregates import aggregate_cards, get_card_fields
+
+BOARD = {
+    "id": "a_board_id",
+    "labels": [{"id": "a_label_id", "name": "", "color": "red"}],
+    "members": [{"id": "a_member_id", "fullName": "Foo Bar"}],
+}
+LISTS = [
+    {
+        "id": "a_list_id",
+        "cards": [
+            {
+                "id": "a_card_id",
+                "idLabels": ["a_label_id"],
+                "idMembers": ["a_member_id"],
+                "due": "2023-10-01T12:00:00.000Z",
+                "dueComplete": False,
+            },
+            {
+                "id": "another_card_id",
+                "idLabels": [],
+                "idMembers": [],
+                "due": "2023-10-02T08:00:00.000Z",
+                "dueComplete": False,
+            },
+        ],
+    },
+    {
+        "id": "another_list_id",
+        "cards": [
+            {
+                "id": "a_done_card_id",
+                "idLabels": ["a_label_id"],
+                "idMembers": [],
+                "due": "2023-09-01T12:00:00.000Z",
+                "dueComplete": True,
+            },
+        ],
+    },
+]
+
+
+def test_aggregate_cards() -> None:
+    """Test all card sensors are counted from one pass over the cards."""
+    aggregates = aggregate_cards(
+        BOARD, LISTS, ["labels", "members", "no_members", "overdue", "due_soon"]
+    )
+    now = datetime(2023, 10, 1, 18, tzinfo=timezone.utc)
+
+    assert aggregates.label_names == {"a_label_id": "red"}
+    assert aggregates.label_counts == {"a_label_id": 2}
+    assert aggregates.member_names == {"a_member_id": "Foo Bar"}
+    assert aggregates.member_counts == {"a_member_id": 1}
+    assert aggregates.no_members == 2
+    assert aggregates.overdue(now) == 1
+    assert aggregates.due_soon(now) == 1
+    assert aggregates.due_soon(datetime(2023, 9, 1, tzinfo=timezone.utc)) == 0
+
+
+def test_aggregate_cards_disabled() -> None:
+    """Test nothing is counted and only card IDs fetched without card sensors."""
+    assert aggregate_cards(BOARD, LISTS, []) is None
+    assert get_card_fields([]) == "id"
+    assert get_card_fields(["overdue"]) == "id,due,dueComplete"
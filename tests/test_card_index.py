@@ -0,0 +1,85 @@
+"""Test the trello card index."""
+from custom_components.trello.card_index import CardIndex
+from custom_components.trello.const import Card
+
+LISTS = [
+    {
+        "id": "a_list_id",
+        "cards": [
+            {"id": "a_card_id", "name": "A card", "due": None, "dueComplete": False},
+            {
+                "id": "another_card_id",
+                "name": "Another card",
+                "due": "2023-10-01T12:00:00.000Z",
+                "dueComplete": True,
+            },
+        ],
+    },
+    {"id": "another_list_id", "cards": []},
+]
+
+
+def test_replace_board_keeps_unchanged_lists() -> None:
+    """Test indexing a board again only replaces lists whose cards changed."""
+    card_index = CardIndex()
+    card_index.replace_board("a_board_id", LISTS)
+    a_list_cards = card_index.list_cards("a_list_id")
+    another_list_cards = card_index.list_cards("another_list_id")
+
+    moved_card = {**LISTS[0]["cards"][0]}
+    card_index.replace_board(
+        "a_board_id",
+        [
+            {"id": "a_list_id", "cards": [LISTS[0]["cards"][1]]},
+            {"id": "another_list_id", "cards": [moved_card]},
+        ],
+    )
+
+    assert a_list_cards[1] == Card(
+        "another_card_id",
+        "a_list_id",
+        "Another card",
+        "2023-10-01T12:00:00.000Z",
+        True,
+    )
+    assert card_index.list_cards("a_list_id") == a_list_cards[1:]
+    assert card_index.list_cards("another_list_id") is not another_list_cards
+    assert card_index.get("a_card_id").list_id == "another_list_id"
+
+    card_index.replace_board("a_board_id", [LISTS[1]])
+
+    assert card_index.list_cards("a_list_id") == ()
+    assert "another_card_id" not in card_index
+    assert card_index.has_board("a_board_id")
+
+
+def test_upsert_and_remove() -> None:
+    """Test cards are added, replaced in place, moved and removed."""
+    card_index = CardIndex()
+    card_index.replace_board("a_board_id", LISTS)
+
+    card_index.upsert(Card("a_card_id", "a_list_id", "Renamed", None, False))
+    card_index.upsert(Card("a_new_card_id", "a_list_id", "New", None, False))
+
+    assert [card.name for card in card_index.list_cards("a_list_id")] == [
+        "Renamed",
+        "Another card",
+        "New",
+    ]
+
+    card_index.upsert(Card("a_card_id", "another_list_id", "Renamed", None, False))
+    removed = card_index.remove("a_new_card_id")
+
+    assert removed.name == "New"
+    assert [card.id for card in card_index.list_cards("a_list_id")] == [
+        "another_card_id"
+    ]
+    assert [card.id for card in card_index.list_cards("another_list_id")] == [
+        "a_card_id"
+    ]
+    assert card_index.remove("a_new_card_id") is None
+
+    card_index.remove_boards(["a_board_id"])
+
+    assert "a_card_id" not in card_index
+    assert not card_index.has_board("a_board_id")
@@ -0,0 +1,74 @@
+"""Test the trello card move index."""
+from custom_components.trello.card_moves import CardMove, CardMoveIndex
+
+LISTS = [
+    {"id": "a_list_id", "cards": [{"id": "a_card_id"}, {"id": "another_card_id"}]},
+    {"id": "another_list_id", "cards": []},
+]
+
+
+def test_replace_board_collects_changes() -> None:
+    """Test cards that changed lists are collected until popped."""
+    card_moves = CardMoveIndex()
+    card_moves.replace_board("a_board_id", LISTS)
+    card_moves.replace_board(
+        "another_board_id", [{"id": "a_third_list_id", "cards": []}]
+    )
+
+    # Nothing changed for boards indexed for the first time
+    assert card_moves.pop_changes() == []
+
+    card_moves.replace_board(
+        "a_board_id",
+        [
+            {"id": "a_list_id", "cards": [{"id": "a_new_card_id"}]},
+            {"id": "another_list_id", "cards": [{"id": "a_card_id"}]},
+        ],
+    )
+    card_moves.replace_board(
+        "another_board_id",
+        [{"id": "a_third_list_id", "cards": [{"id": "another_card_id"}]}],
+    )
+
+    assert sorted(card_moves.pop_changes(), key=lambda move: move.card_id) == [
+        CardMove(
+            "a_card_id", "a_board_id", "another_list_id", "a_board_id", "a_list_id"
+        ),
+        CardMove("a_new_card_id", "a_board_id", "a_list_id", None, None),
+        CardMove(
+            "another_card_id",
+            "another_board_id",
+            "a_third_list_id",
+            "a_board_id",
+            "a_list_id",
+        ),
+    ]
+    assert card_moves.pop_changes() == []
+
+    card_moves.replace_board("a_board_id", [LISTS[1]])
+
+    assert sorted(card_moves.pop_changes(), key=lambda move: move.card_id) == [
+        CardMove("a_card_id", None, None, "a_board_id", "another_list_id"),
+        CardMove("a_new_card_id", None, None, "a_board_id", "a_list_id"),
+    ]
+
+
+def test_remove_boards() -> None:
+    """Test removed boards are indexed again without collecting changes."""
+    card_moves = CardMoveIndex()
+    card_moves.replace_board("a_board_id", LISTS)
+
+    card_moves.remove_boards(["a_board_id"])
+
+    assert not card_moves.has_board("a_board_id")
+    card_moves.replace_board("a_board_id", [LISTS[1]])
+    assert card_moves.pop_changes() == []
+
+
+def test_get_list_id() -> None:
+    """Test an indexed card's list is found, and None for other cards."""
+    card_moves = CardMoveIndex()
+    card_moves.replace_board("a_board_id", LISTS)
+
+    assert card_moves.get_list_id("another_card_id") == "a_list_id"
+    assert card_moves.get_list_id("an_unknown_card_id") is None
@@ -0,0 +1,100 @@
+"""Test sharing batched responses between config entries."""
+import asyncio
+from unittest.mock import patch
+
+from custom_components.trello.api import TrelloClient
+from custom_components.trello.coalesce import async_get_coalescer
+from custom_components.trello.ratelimit import async_get_governor
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+    AiohttpClientMockResponse,
+)
+from .conftest import BATCH_URL
+
+BOARD_URLS = ["/boards/a_board_id?fields=name", "/boards/a_board_id/lists"]
+BOARD_RESPONSES = [{"200": {"id": "a_board_id"}}, {"200": []}]
+NOT_FOUND = {"name": "NotFoundError", "message": "Not found", "statusCode": 404}
+
+
+def coalesced_client(hass: HomeAssistant, api_token: str) -> TrelloClient:
+    """Create a Trello client sharing responses with other clients."""
+    return TrelloClient(
+        async_get_clientsession(hass),
+        "abc123",
+        api_token,
+        async_get_governor(hass, "abc123", api_token),
+        async_get_coalescer(hass),
+    )
+
+
+def mock_batch_by_token(forbidden_token: str | None = None):
+    """Mock the batch endpoint, denying one token access to the board."""
+
+    async def side_effect(method, url, data):
+        await asyncio.sleep(0)
+        if url.query["token"] == forbidden_token:
+            return AiohttpClientMockResponse(method, url, json=[NOT_FOUND] * 2)
+        return AiohttpClientMockResponse(method, url, json=BOARD_RESPONSES)
+
+    return side_effect
+
+
+async def test_recent_responses_shared(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test a recent response is reused by another token that proved access."""
+    aioclient_mock.get(BATCH_URL, side_effect=mock_batch_by_token())
+    client = coalesced_client(hass, "a_token")
+    other_client = coalesced_client(hass, "another_token")
+
+    await client.async_fetch_batch(BOARD_URLS)
+    await other_client.async_fetch_batch(BOARD_URLS)
+    assert aioclient_mock.call_count == 2
+
+    assert await client.async_fetch_batch(BOARD_URLS) == BOARD_RESPONSES
+    assert aioclient_mock.call_count == 2
+
+    # A token's own response isn't reused, it may want current data
+    assert await other_client.async_fetch_batch(BOARD_URLS) == BOARD_RESPONSES
+    assert aioclient_mock.call_count == 3
+
+
+async def test_in_flight_requests_shared(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test concurrent requests for the same URLs are made once."""
+    aioclient_mock.get(BATCH_URL, side_effect=mock_batch_by_token())
+    client = coalesced_client(hass, "a_token")
+    other_client = coalesced_client(hass, "another_token")
+    with patch("custom_components.trello.coalesce.SHARED_RESPONSE_TTL", 0):
+        await client.async_fetch_batch(BOARD_URLS)
+        await other_client.async_fetch_batch(BOARD_URLS)
+
+        actual = await asyncio.gather(
+            client.async_fetch_batch(BOARD_URLS),
+            other_client.async_fetch_batch(BOARD_URLS),
+        )
+
+    assert actual == [BOARD_RESPONSES, BOARD_RESPONSES]
+    assert aioclient_mock.call_count == 3
+
+
+async def test_responses_not_shared_without_access(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test a token without access to a board gets its own response."""
+    aioclient_mock.get(
+        BATCH_URL, side_effect=mock_batch_by_token(forbidden_token="another_token")
+    )
+    client = coalesced_client(hass, "a_token")
+    other_client = coalesced_client(hass, "another_token")
+
+    await client.async_fetch_batch(BOARD_URLS)
+    actual = await other_client.async_fetch_batch(BOARD_URLS)
+    actual_again = await other_client.async_fetch_batch(BOARD_URLS)
+
+    assert actual == actual_again == [NOT_FOUND, NOT_FOUND]
+    assert aioclient_mock.call_count == 3
@@ -1,14 +1,15 @@
 """Test the trello config flow."""
-from types import SimpleNamespace
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 
-from trello import Unauthorized
+import pytest
 
 from homeassistant import config_entries, data_entry_flow
-from custom_components.trello.const import DOMAIN
+from custom_components.trello.api import TrelloError, Unauthorized
+from custom_components.trello.const import DOMAIN, Member
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 from . import BOARD_LISTS
 
 API_KEY = "an_api_key"
@@ -17,6 +18,7 @@ USER_ID = "a_user_id"
 EMAIL_ADDR = "an_email"
 
 BOARD_ID = "a_board_id"
+WORKSPACE_ID = "a_workspace_id"
 
 BOARD_ID_LISTS = {
     BOARD_ID: BOARD_LISTS,
@@ -32,18 +34,22 @@ class MockAdapter:
         """Init mock TrelloAdapter."""
 
     @classmethod
-    def from_creds(cls, api_key: str, api_token: str):
+    def from_creds(cls, hass, api_key: str, api_token: str):
         """Init mock TrelloAdapter."""
         return cls(None)
 
-    def get_member(self):
-        """Mock member object."""
-        return SimpleNamespace(id=USER_ID, email=EMAIL_ADDR)
+    async def async_get_member_boards(self):
+        """Mock member object and board dict."""
+        return Member(USER_ID, EMAIL_ADDR), await self.async_get_boards()
 
-    def get_boards(self):
+    async def async_get_boards(self):
         """Mock board dict."""
         return {BOARD_ID: {"id": BOARD_ID, "name": "a_board_name"}}
 
+    async def async_get_workspaces(self):
+        """Mock workspace dict."""
+        return {WORKSPACE_ID: "a_workspace_name"}
+
     def get_board_lists(self, id_boards, selected_board_ids):
         """Mock board dict."""
         return BOARD_ID_LISTS
@@ -68,7 +74,7 @@ async def test_flow_user(hass: HomeAssistant) -> None:
 
         board_selection_result = await hass.config_entries.flow.async_configure(
             creds_result["flow_id"],
-            user_input={"board_ids": [BOARD_ID]},
+            user_input={"board_ids": [BOARD_ID], "workspace_ids": [WORKSPACE_ID]},
         )
 
     assert init_result["type"] == FlowResultType.FORM
@@ -79,6 +85,9 @@ async def test_flow_user(hass: HomeAssistant) -> None:
     assert creds_result["data_schema"].schema["board_ids"].options == {
         BOARD_ID: "a_board_name"
     }
+    assert creds_result["data_schema"].schema["workspace_ids"].options == {
+        WORKSPACE_ID: "a_workspace_name"
+    }
 
     assert board_selection_result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
     assert board_selection_result["data"] == {
@@ -87,20 +96,32 @@ async def test_flow_user(hass: HomeAssistant) -> None:
         "user_id": USER_ID,
         "user_email": EMAIL_ADDR,
     }
-    assert board_selection_result["options"] == {"board_ids": [BOARD_ID]}
+    assert board_selection_result["options"] == {
+        "board_ids": [BOARD_ID],
+        "workspace_ids": [WORKSPACE_ID],
+    }
     assert board_selection_result["result"].unique_id == USER_ID
     assert board_selection_result["result"].title == EMAIL_ADDR
 
 
-async def test_flow_user_unauthorized(hass: HomeAssistant) -> None:
-    """Test user setup flow when user enters invalid creds."""
+@pytest.mark.parametrize(
+    ("side_effect", "error"),
+    [
+        (Unauthorized("invalid token"), "invalid_auth"),
+        (TrelloError("Server error"), "cannot_connect"),
+    ],
+)
+async def test_flow_user_unauthorized(
+    hass: HomeAssistant, side_effect: Exception, error: str
+) -> None:
+    """Test user setup flow when creds are invalid or Trello can't be reached."""
     init_result = await hass.config_entries.flow.async_init(
         DOMAIN, context={"source": config_entries.SOURCE_USER}
     )
 
     with patch(
-        "custom_components.trello.config_flow.TrelloAdapter.get_member",
-        side_effect=Unauthorized("", Mock(status=123)),
+        "custom_components.trello.config_flow.TrelloAdapter.async_get_member_boards",
+        side_effect=side_effect,
     ), patch(
         "custom_components.trello.async_setup_entry",
         return_value=True,
@@ -112,5 +133,61 @@ async def test_flow_user_unauthorized(hass: HomeAssistant) -> None:
 
     assert creds_result["type"] == FlowResultType.FORM
     assert creds_result["step_id"] == "creds"
-    assert creds_result["errors"] == {"base": "invalid_auth"}
+    assert creds_result["errors"] == {"base": error}
     assert creds_result["last_step"] is False
+
+
+async def test_options_flow(hass: HomeAssistant) -> None:
+    """Test selecting boards and how they're updated in the options flow."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=USER_INPUT_CREDS,
+        options={"board_ids": ["a_removed_board_id"]},
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.trello.config_flow.TrelloAdapter",
+        new=MockAdapter,
+    ), patch(
+        "custom_components.trello.async_setup_entry",
+        return_value=True,
+    ):
+        init_result = await hass.config_entries.options.async_init(
+            config_entry.entry_id
+        )
+        options_result = await hass.config_entries.options.async_configure(
+            init_result["flow_id"],
+            user_input={
+                "board_ids": [BOARD_ID],
+                "workspace_ids": [],
+                "update_mode": "delta",
+                "frequent_board_ids": [BOARD_ID],
+                "infrequent_board_ids": [],
+                "summary_board_ids": [BOARD_ID],
+                "promoted_list_ids": [],
+                "card_sensors": ["labels", "overdue"],
+                "todo_lists": True,
+                "card_events": True,
+                "stale_limit": 10,
+            },
+        )
+
+    assert init_result["step_id"] == "init"
+    assert init_result["data_schema"].schema["board_ids"].options == {
+        BOARD_ID: "a_board_name"
+    }
+    assert options_result["type"] == FlowResultType.CREATE_ENTRY
+    assert config_entry.options == {
+        "board_ids": [BOARD_ID],
+        "workspace_ids": [],
+        "update_mode": "delta",
+        "frequent_board_ids": [BOARD_ID],
+        "infrequent_board_ids": [],
+        "summary_board_ids": [BOARD_ID],
+        "promoted_list_ids": [],
+        "card_sensors": ["labels", "overdue"],
+        "todo_lists": True,
+        "card_events": True,
+        "stale_limit": 10,
+    }
@@ -0,0 +1,744 @@
+"""Test the trello coordinator."""
+import asyncio
+from collections import Counter
+from datetime import timedelta
+from http import HTTPStatus
+import json
+import tracemalloc
+from unittest.mock import patch
+from urllib.parse import parse_qs
+
+import pytest
+
+from custom_components.trello.coordinator import (
+    TrelloDataUpdateCoordinator,
+    _get_board,
+    _get_boards,
+    _lists_url,
+)
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+
+from pytest_homeassistant_custom_component.common import async_capture_events
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+    AiohttpClientMockResponse,
+)
+from .conftest import BATCH_URL, REFRESH_DUE, mock_batch, mock_client
+
+BOARD_IDS = [f"board_{i}" for i in range(12)]
+
+
+def mock_batch_by_board(failing_board_id: str | None = None):
+    """Build a batch side effect answering each batch URL by board ID."""
+
+    async def side_effect(method, url, data):
+        urls = url.query["urls"].split(",")
+        assert len(urls) <= 10
+        board_ids = [path.split("/")[2].split("?")[0] for path in urls]
+        if failing_board_id in board_ids:
+            return AiohttpClientMockResponse(
+                method, url, status=HTTPStatus.INTERNAL_SERVER_ERROR
+            )
+
+        responses = []
+        for path, board_id in zip(urls, board_ids):
+            if "/lists" in path:
+                responses.append(
+                    {"200": [{"id": f"{board_id}_list", "name": "A List", "cards": []}]}
+                )
+            else:
+                responses.append({"200": {"id": board_id, "name": board_id}})
+        return AiohttpClientMockResponse(method, url, json=responses)
+
+    return side_effect
+
+
+async def test_update_chunks_batches(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test boards are fetched in batches within Trello's URL limit."""
+    aioclient_mock.get(BATCH_URL, side_effect=mock_batch_by_board())
+    client = mock_client(hass)
+    coordinator = TrelloDataUpdateCoordinator(hass, client, BOARD_IDS)
+
+    actual = await coordinator._async_update_data()
+
+    assert aioclient_mock.call_count == 3
+    assert list(actual) == BOARD_IDS
+    assert actual["board_11"].lists["board_11_list"].name == "A List"
+
+
+async def test_update_chunk_failure(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test a failed batch only marks the boards in that batch as unavailable."""
+    aioclient_mock.get(
+        BATCH_URL, side_effect=mock_batch_by_board(failing_board_id="board_6")
+    )
+    client = mock_client(hass)
+    coordinator = TrelloDataUpdateCoordinator(hass, client, BOARD_IDS)
+
+    actual = await coordinator._async_update_data()
+
+    assert list(actual) == BOARD_IDS
+    for board_id in BOARD_IDS[5:10]:
+        assert actual[board_id].lists == {}
+    assert actual["board_0"].name == "board_0"
+    assert actual["board_10"].name == "board_10"
+
+
+
+async def test_update_active_boards(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test only boards with new activity have their lists fetched again."""
+    lists = [{"id": "list_0", "name": "To Do", "cards": [{"id": "card_0"}]}]
+    path_responses = {}
+    for board_id in ("board_0", "board_1"):
+        path_responses[f"/boards/{board_id}"] = {
+            "200": {"id": board_id, "name": board_id, "dateLastActivity": "1"}
+        }
+        path_responses[f"/boards/{board_id}/lists"] = {"200": lists}
+    aioclient_mock.get(BATCH_URL, side_effect=mock_batch(path_responses))
+    client = mock_client(hass)
+    coordinator = TrelloDataUpdateCoordinator(hass, client, ["board_0", "board_1"])
+    await coordinator.async_refresh()
+    unchanged_board = coordinator.data["board_0"]
+
+    path_responses["/boards/board_1"]["200"]["dateLastActivity"] = "2"
+    path_responses["/boards/board_1/lists"] = {"200": [{**lists[0], "cards": []}]}
+    aioclient_mock.mock_calls.clear()
+    freezer.tick(REFRESH_DUE)
+    await coordinator.async_refresh()
+
+    requested_urls = ",".join(
+        call[1].query["urls"] for call in aioclient_mock.mock_calls
+    )
+    assert "/boards/board_0/lists" not in requested_urls
+    assert "/boards/board_1/lists" in requested_urls
+    assert coordinator.data["board_0"] is unchanged_board
+    assert coordinator.data["board_1"].lists["list_0"].card_count == 0
+
+
+async def test_scheduler_spreads_boards(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test boards are refreshed on their own interval, spread over it."""
+    aioclient_mock.get(BATCH_URL, side_effect=mock_batch_by_board())
+    coordinator = TrelloDataUpdateCoordinator(
+        hass,
+        mock_client(hass),
+        BOARD_IDS[:5],
+        board_intervals={"board_4": timedelta(seconds=30)},
+    )
+    with patch("custom_components.trello.coordinator.SCHEDULE_JITTER", 0):
+        await coordinator.async_refresh()
+        aioclient_mock.mock_calls.clear()
+
+        refreshed: Counter[str] = Counter()
+        most_refreshed = 0
+        busy_ticks = 0
+        for _ in range(12):
+            freezer.tick(timedelta(seconds=5))
+            call_count = len(aioclient_mock.mock_calls)
+            await coordinator.async_refresh()
+            board_ids = {
+                path.split("/")[2].split("?")[0]
+                for call in aioclient_mock.mock_calls[call_count:]
+                for path in call[1].query["urls"].split(",")
+            }
+            refreshed.update(board_ids)
+            most_refreshed = max(most_refreshed, len(board_ids))
+            busy_ticks += bool(board_ids)
+
+    assert refreshed == {**dict.fromkeys(BOARD_IDS[:4], 1), "board_4": 2}
+    assert most_refreshed <= 2
+    # Ticks without boards due aren't recorded
+    assert len(coordinator.metrics.refreshes) == 1 + busy_ticks < 1 + 12
+
+
+async def test_update_workspaces(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test workspaces' boards are fetched a page per workspace at a time."""
+    workspace_boards = {
+        "workspace_0": ["board_0", "board_1", "board_2"],
+        "workspace_1": ["board_3"],
+    }
+
+    def workspace_board(board_id: str) -> dict:
+        list_id = f"{board_id}_list"
+        return {
+            "id": board_id,
+            "name": board_id,
+            "lists": [{"id": list_id, "name": "A List"}],
+            "cards": [
+                {"id": f"{board_id}_card", "idList": list_id},
+                {"id": f"{board_id}_closed_list_card", "idList": "a_closed_list"},
+            ],
+        }
+
+    batch = mock_batch(
+        {
+            "/boards/board_4": {"200": {"id": "board_4", "name": "board_4"}},
+            "/boards/board_4/lists": {"200": []},
+        }
+    )
+
+    async def side_effect(method, url, data):
+        urls = url.query["urls"].split(",")
+        if not urls[0].startswith("/organizations/"):
+            return await batch(method, url, data)
+        responses = []
+        for workspace_url in urls:
+            path, query = workspace_url.split("?")
+            page = int(parse_qs(query)["page"][0])
+            board_ids = workspace_boards[path.split("/")[2]][2 * page : 2 * page + 2]
+            responses.append({"200": [workspace_board(id_) for id_ in board_ids]})
+        return AiohttpClientMockResponse(method, url, json=responses)
+
+    aioclient_mock.get(BATCH_URL, side_effect=side_effect)
+    coordinator = TrelloDataUpdateCoordinator(
+        hass,
+        mock_client(hass),
+        ["board_4", "board_1"],
+        workspace_ids=list(workspace_boards),
+    )
+    with patch("custom_components.trello.coordinator.WORKSPACE_PAGE_SIZE", 2):
+        await coordinator.async_refresh()
+
+        # Both workspaces' first page, workspace_0's second page and board_4
+        assert aioclient_mock.call_count == 3
+        assert coordinator.board_ids == [
+            "board_4",
+            "board_1",
+            "board_0",
+            "board_2",
+            "board_3",
+        ]
+        assert coordinator.data["board_3"].lists["board_3_list"].card_count == 1
+
+        workspace_boards["workspace_0"].remove("board_0")
+        workspace_boards["workspace_1"].append("board_5")
+        aioclient_mock.mock_calls.clear()
+        freezer.tick(REFRESH_DUE)
+        await coordinator.async_refresh()
+
+    requested_urls = ",".join(
+        call[1].query["urls"] for call in aioclient_mock.mock_calls
+    )
+    assert "/boards/board_1" not in requested_urls
+    assert coordinator.board_ids == [
+        "board_4",
+        "board_1",
+        "board_2",
+        "board_3",
+        "board_5",
+    ]
+    assert list(coordinator.data) == coordinator.board_ids
+
+
+@pytest.mark.parametrize("update_mode", ["poll", "delta"])
+async def test_refresh_keeps_concurrent_changes(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker, update_mode: str
+) -> None:
+    """Test refreshing some boards keeps changes made to others meanwhile."""
+    board = {"id": "board_0", "name": "A Board", "actions": [{"id": "action_0"}]}
+    path_responses = {
+        "/boards/board_0": {"200": board},
+        "/boards/board_0/lists": {
+            "200": [{"id": "list_0", "name": "To Do", "cards": []}]
+        },
+        "/boards/board_1": {"200": {**board, "id": "board_1"}},
+        "/boards/board_1/lists": {"200": []},
+        "/boards/board_1/actions": {"200": []},
+    }
+    batch = mock_batch(path_responses)
+    pushed_actions = [
+        {
+            "id": "action_1",
+            "type": "createCard",
+            "data": {"board": {"id": "board_0"}, "list": {"id": "list_0"}},
+        }
+    ]
+
+    async def side_effect(method, url, data):
+        if "board_1" in url.query["urls"] and coordinator.data and pushed_actions:
+            # Pushed while board_1 is being fetched
+            boards = dict(coordinator.data)
+            assert coordinator.apply_trello_action(boards, pushed_actions.pop())
+            coordinator.data = boards
+        return await batch(method, url, data)
+
+    aioclient_mock.get(BATCH_URL, side_effect=side_effect)
+    coordinator = TrelloDataUpdateCoordinator(
+        hass, mock_client(hass), ["board_0", "board_1"], update_mode
+    )
+    await coordinator.async_refresh()
+    await coordinator.async_request_board_refresh(["board_1"])
+    await hass.async_block_till_done()
+
+    assert not pushed_actions
+    assert coordinator.data["board_0"].lists["list_0"].card_count == 1
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.parametrize("blocked_board_id", ["board_0", "board_1"])
+async def test_set_board_ids_during_refresh(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+    blocked_board_id: str,
+) -> None:
+    """Test boards added while refreshing others keep both of their results.
+
+    Either the refresh of board_0 or the fetch of the added board_1 is held
+    until the other one completed.
+    """
+    path_responses = {}
+    for board_id in ("board_0", "board_1"):
+        path_responses[f"/boards/{board_id}"] = {
+            "200": {"id": board_id, "name": board_id, "dateLastActivity": "1"}
+        }
+        path_responses[f"/boards/{board_id}/lists"] = {
+            "200": [{"id": f"{board_id}_list", "name": "To Do", "cards": []}]
+        }
+    batch = mock_batch(path_responses)
+    release = asyncio.Event()
+
+    async def side_effect(method, url, data):
+        if f"/boards/{blocked_board_id}" in url.query["urls"]:
+            await release.wait()
+        return await batch(method, url, data)
+
+    aioclient_mock.get(BATCH_URL, side_effect=side_effect)
+    coordinator = TrelloDataUpdateCoordinator(hass, mock_client(hass), ["board_0"])
+    release.set()
+    await coordinator.async_refresh()
+    release.clear()
+
+    path_responses["/boards/board_0"]["200"]["dateLastActivity"] = "2"
+    path_responses["/boards/board_0/lists"]["200"][0]["cards"] = [{"id": "card_0"}]
+    freezer.tick(REFRESH_DUE)
+    refresh = hass.async_create_task(coordinator.async_refresh())
+    set_board_ids = hass.async_create_task(
+        coordinator.async_set_board_ids(["board_0", "board_1"])
+    )
+    await asyncio.sleep(0)
+    await (set_board_ids if blocked_board_id == "board_0" else refresh)
+    release.set()
+    await asyncio.gather(refresh, set_board_ids)
+
+    assert coordinator.last_update_success
+    assert list(coordinator.data) == ["board_0", "board_1"]
+    assert coordinator.data["board_0"].lists["board_0_list"].card_count == 1
+    assert coordinator.data["board_1"].available
+
+
+async def test_update_delta(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test delta polling applies actions and rebuilds boards with gaps."""
+    board = {"id": "board_0", "name": "A Board", "actions": [{"id": "action_0"}]}
+    lists = [
+        {"id": "list_0", "name": "To Do", "cards": [{"id": "card_0"}]},
+        {"id": "list_1", "name": "Done", "cards": []},
+    ]
+    path_responses = {
+        "/boards/board_0": {"200": board},
+        "/boards/board_0/lists": {"200": lists},
+        "/boards/board_0/actions": {"200": []},
+        "/boards/board_1": {"200": {**board, "id": "board_1"}},
+        "/boards/board_1/lists": {"200": lists},
+        "/boards/board_1/actions": {"200": []},
+    }
+    aioclient_mock.get(BATCH_URL, side_effect=mock_batch(path_responses))
+    client = mock_client(hass)
+    coordinator = TrelloDataUpdateCoordinator(
+        hass, client, ["board_0", "board_1"], "delta"
+    )
+    await coordinator.async_refresh()
+
+    path_responses["/boards/board_0/actions"] = {
+        "200": [
+            {
+                "id": "action_1",
+                "type": "createCard",
+                "data": {"board": {"id": "board_0"}, "list": {"id": "list_1"}},
+            }
+        ]
+    }
+    path_responses["/boards/board_1/actions"] = {
+        "200": [
+            {
+                "id": "action_1",
+                "type": "moveListToBoard",
+                "data": {"board": {"id": "board_1"}, "list": {"id": "list_2"}},
+            }
+        ]
+    }
+    path_responses["/boards/board_1/lists"] = {
+        "200": [
+            *lists,
+            {"id": "list_2", "name": "Moved", "cards": [{"id": "card_1"}]},
+        ]
+    }
+    aioclient_mock.mock_calls.clear()
+    freezer.tick(REFRESH_DUE)
+    await coordinator.async_refresh()
+
+    assert coordinator.data["board_0"].lists["list_1"].card_count == 1
+    assert coordinator.data["board_1"].lists["list_2"].card_count == 1
+    requested_urls = [call[1].query["urls"] for call in aioclient_mock.mock_calls]
+    assert "/boards/board_0/lists" not in "".join(requested_urls)
+    assert "since=action_0" in requested_urls[0]
+
+
+async def test_update_delta_incomplete_action(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test an action without the data its type should have rebuilds its board."""
+    board = {"id": "board_0", "name": "A Board", "actions": [{"id": "action_0"}]}
+    path_responses = {
+        "/boards/board_0": {"200": board},
+        "/boards/board_0/lists": {
+            "200": [{"id": "list_0", "name": "To Do", "cards": []}]
+        },
+        "/boards/board_0/actions": {"200": []},
+    }
+    aioclient_mock.get(BATCH_URL, side_effect=mock_batch(path_responses))
+    coordinator = TrelloDataUpdateCoordinator(
+        hass, mock_client(hass), ["board_0"], "delta"
+    )
+    await coordinator.async_refresh()
+
+    path_responses["/boards/board_0"] = {
+        "200": {**board, "actions": [{"id": "action_1"}]}
+    }
+    path_responses["/boards/board_0/lists"] = {
+        "200": [{"id": "list_0", "name": "To Do", "cards": [{"id": "card_0"}]}]
+    }
+    path_responses["/boards/board_0/actions"] = {
+        "200": [
+            {
+                "id": "action_1",
+                "type": "createCard",
+                "data": {"board": {"id": "board_0"}, "card": {"id": "card_0"}},
+            }
+        ]
+    }
+    for _ in range(2):
+        aioclient_mock.mock_calls.clear()
+        freezer.tick(REFRESH_DUE)
+        await coordinator.async_refresh()
+
+        assert coordinator.last_update_success
+        assert coordinator.data["board_0"].lists["list_0"].card_count == 1
+
+    # The rebuilt board's actions are applied since its newest action
+    assert "since=action_1" in aioclient_mock.mock_calls[0][1].query["urls"]
+
+
+async def test_update_delta_card_index(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test delta polling applies card actions to the indexed cards."""
+    board = {"id": "board_0", "name": "A Board", "actions": [{"id": "action_0"}]}
+    card = {"id": "card_0", "name": "A card", "due": None, "dueComplete": False}
+    path_responses = {
+        "/boards/board_0": {"200": board},
+        "/boards/board_0/lists": {
+            "200": [
+                {"id": "list_0", "name": "To Do", "cards": [card]},
+                {"id": "list_1", "name": "Done", "cards": []},
+            ]
+        },
+        "/boards/board_0/actions": {"200": []},
+    }
+    aioclient_mock.get(BATCH_URL, side_effect=mock_batch(path_responses))
+    coordinator = TrelloDataUpdateCoordinator(
+        hass, mock_client(hass), ["board_0"], "delta", todo_lists=True
+    )
+    await coordinator.async_refresh()
+
+    board_data = {"board": {"id": "board_0"}}
+    path_responses["/boards/board_0/actions"] = {
+        "200": [
+            {
+                "id": "action_3",
+                "type": "deleteCard",
+                "data": {
+                    **board_data,
+                    "card": {"id": "card_1"},
+                    "list": {"id": "list_0"},
+                },
+            },
+            {
+                "id": "action_2",
+                "type": "updateCard",
+                "data": {
+                    **board_data,
+                    "card": {"id": "card_0", "idList": "list_1", "dueComplete": True},
+                    "old": {"idList": "list_0", "dueComplete": False},
+                    "listBefore": {"id": "list_0"},
+                    "listAfter": {"id": "list_1"},
+                },
+            },
+            {
+                "id": "action_1",
+                "type": "createCard",
+                "data": {
+                    **board_data,
+                    "card": {"id": "card_1", "name": "New card"},
+                    "list": {"id": "list_0"},
+                },
+            },
+        ]
+    }
+    aioclient_mock.mock_calls.clear()
+    freezer.tick(REFRESH_DUE)
+    await coordinator.async_refresh()
+
+    requested_urls = "".join(
+        call[1].query["urls"] for call in aioclient_mock.mock_calls
+    )
+    assert "/boards/board_0/lists" not in requested_urls
+    assert coordinator.card_index.list_cards("list_0") == ()
+    assert [
+        (card.id, card.name, card.due_complete)
+        for card in coordinator.card_index.list_cards("list_1")
+    ] == [("card_0", "A card", True)]
+    assert coordinator.data["board_0"].lists["list_1"].card_count == 1
+
+    # A reopened card's fields aren't in the action, so its board is fetched
+    path_responses["/boards/board_0/actions"] = {
+        "200": [
+            {
+                "id": "action_4",
+                "type": "updateCard",
+                "data": {
+                    **board_data,
+                    "card": {"id": "card_1", "closed": False},
+                    "old": {"closed": True},
+                    "list": {"id": "list_0"},
+                },
+            }
+        ]
+    }
+    aioclient_mock.mock_calls.clear()
+    freezer.tick(REFRESH_DUE)
+    await coordinator.async_refresh()
+
+    requested_urls = "".join(
+        call[1].query["urls"] for call in aioclient_mock.mock_calls
+    )
+    assert "/boards/board_0/lists" in requested_urls
+
+
+async def test_card_events(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test events are fired for cards that changed lists since the last refresh."""
+    lists = [
+        {
+            "id": "list_0",
+            "name": "To Do",
+            "cards": [{"id": "card_0"}, {"id": "card_1"}],
+        },
+        {"id": "list_1", "name": "Done", "cards": []},
+    ]
+    board = {"id": "board_0", "name": "A Board", "dateLastActivity": "2023-10-01"}
+    path_responses = {
+        "/boards/board_0": {"200": board},
+        "/boards/board_0/lists": {"200": lists},
+    }
+    aioclient_mock.get(BATCH_URL, side_effect=mock_batch(path_responses))
+    coordinator = TrelloDataUpdateCoordinator(
+        hass, mock_client(hass), ["board_0"], card_events=True
+    )
+    added = async_capture_events(hass, "trello_card_added")
+    moved = async_capture_events(hass, "trello_card_moved")
+    removed = async_capture_events(hass, "trello_card_removed")
+    await coordinator.async_refresh()
+
+    # Lists aren't reduced to their card count
+    assert "card_fields=id%2CidList" in aioclient_mock.mock_calls[0][1].query["urls"]
+    assert coordinator.data["board_0"].lists["list_0"].card_count == 2
+
+    path_responses["/boards/board_0"] = {
+        "200": {**board, "dateLastActivity": "2023-10-02"}
+    }
+    path_responses["/boards/board_0/lists"] = {
+        "200": [
+            {"id": "list_0", "name": "To Do", "cards": [{"id": "card_2"}]},
+            {"id": "list_1", "name": "Finished", "cards": [{"id": "card_0"}]},
+        ]
+    }
+    freezer.tick(REFRESH_DUE)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert [event.data for event in added] == [
+        {
+            "card_id": "card_2",
+            "board_id": "board_0",
+            "list_id": "list_0",
+            "list_name": "To Do",
+        }
+    ]
+    assert [event.data for event in moved] == [
+        {
+            "card_id": "card_0",
+            "board_id": "board_0",
+            "list_id": "list_1",
+            "list_name": "Finished",
+            "old_board_id": "board_0",
+            "old_list_id": "list_0",
+            "old_list_name": "To Do",
+        }
+    ]
+    assert [event.data for event in removed] == [
+        {
+            "card_id": "card_1",
+            "board_id": "board_0",
+            "list_id": "list_0",
+            "list_name": "To Do",
+        }
+    ]
+
+
+async def test_fetch_large_board(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test fetching a 50k card board doesn't hold its body or cards at once.
+
+    Memory is measured from the received bytes to the board's card counts,
+    while decoding all of its cards at once would take several times the
+    body's size.
+    """
+    lists = [
+        {
+            "id": f"list_{i}",
+            "name": f"List {i}",
+            "cards": [{"id": f"card_{i}_{j}"} for j in range(1000)],
+        }
+        for i in range(50)
+    ]
+    body = json.dumps(
+        [{"200": {"id": "board_0", "name": "A Board"}}, {"200": lists}]
+    ).encode()
+    del lists
+    aioclient_mock.get(BATCH_URL, content=body)
+    client = mock_client(hass)
+
+    tracemalloc.start()
+    responses = await client.async_fetch_batch(
+        ["/boards/board_0", _lists_url("board_0")]
+    )
+    boards = _get_boards(responses, ["board_0"])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert sum(list_.card_count for list_ in boards["board_0"].lists.values()) == (
+        50_000
+    )
+    assert peak < len(body)
+
+
+def test_get_board_reuses_unchanged() -> None:
+    """Test unchanged lists and boards keep their previous instance."""
+    board = {"id": "board_0", "name": "A Board"}
+    lists = [
+        {"id": "list_0", "name": "To Do", "cards": [{"id": "card_0"}]},
+        {"id": "list_1", "name": "Done", "cards": []},
+    ]
+    previous = _get_board(board, lists)
+
+    assert _get_board(board, lists, previous) is previous
+
+    lists[1] = {**lists[1], "cards": [{"id": "card_1"}]}
+    actual = _get_board(board, lists, previous)
+
+    assert actual is not previous
+    assert actual.lists["list_0"] is previous.lists["list_0"]
+    assert actual.lists["list_1"].card_count == 1
+    assert previous.lists["list_1"].card_count == 0
+    assert _get_board({**board, "name": "Renamed"}, lists, actual).lists == (
+        actual.lists
+    )
+
+
+async def test_failed_board_retried_then_kept_while_stale(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test a board failing with server errors is retried, then kept a while."""
+    server_error = {"name": "Error", "message": "Server error", "statusCode": 500}
+    board_1 = {"200": {"id": "board_1", "name": "Another Board"}}
+    board_1_responses = [board_1]
+    path_responses = {
+        "/boards/board_0": {"200": {"id": "board_0", "name": "A Board"}},
+        "/boards/board_0/lists": {"200": []},
+        "/boards/board_1/lists": {
+            "200": [{"id": "list_1", "name": "To Do", "cards": []}]
+        },
+    }
+    batch = mock_batch(path_responses)
+
+    async def side_effect(method, url, data):
+        path_responses["/boards/board_1"] = (
+            board_1_responses.pop(0)
+            if len(board_1_responses) > 1
+            else board_1_responses[0]
+        )
+        return await batch(method, url, data)
+
+    aioclient_mock.get(BATCH_URL, side_effect=side_effect)
+    coordinator = TrelloDataUpdateCoordinator(
+        hass, mock_client(hass), ["board_0", "board_1"]
+    )
+    await coordinator.async_refresh()
+    fetched_board = coordinator.data["board_1"]
+
+    with patch("custom_components.trello.coordinator.BOARD_RETRY_DELAY", 0):
+        board_1_responses[:] = [server_error, board_1]
+        freezer.tick(REFRESH_DUE)
+        await coordinator.async_refresh()
+
+        # Activity, lists and a retry of the failed board on its own
+        assert len(aioclient_mock.mock_calls) == 4
+        assert coordinator.data["board_1"] is fetched_board
+        assert not coordinator.stale_board_ids
+
+        board_1_responses[:] = [server_error]
+        freezer.tick(REFRESH_DUE)
+        await coordinator.async_refresh()
+
+        assert len(aioclient_mock.mock_calls) == 8
+        assert coordinator.last_update_success
+        assert coordinator.data["board_1"] is fetched_board
+        assert coordinator.stale_board_ids == {"board_1"}
+
+        coordinator.stale_limit = timedelta(0)
+        freezer.tick(REFRESH_DUE)
+        await coordinator.async_refresh()
+
+    assert not coordinator.data["board_1"].available
+    assert coordinator.data["board_0"].available
+    assert not coordinator.stale_board_ids
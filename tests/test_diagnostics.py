@@ -0,0 +1,40 @@
+"""Test the trello diagnostics."""
+from custom_components.trello.diagnostics import async_get_config_entry_diagnostics
+from homeassistant.core import HomeAssistant
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from .conftest import ComponentSetup
+
+
+async def test_diagnostics(
+    hass: HomeAssistant,
+    setup_integration: ComponentSetup,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test diagnostics redact credentials and include refresh metrics."""
+    await setup_integration()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+
+    assert diagnostics["entry"]["title"] == "**REDACTED**"
+    assert diagnostics["entry"]["data"]["api_key"] == "**REDACTED**"
+    assert diagnostics["entry"]["data"]["api_token"] == "**REDACTED**"
+    assert diagnostics["entry"]["data"]["user_email"] == "**REDACTED**"
+    assert diagnostics["boards"]["3a634d47a4cb1e9a9886a2e3"] == {
+        "available": True,
+        "stale": False,
+        "list_count": 2,
+    }
+    last_refresh = diagnostics["metrics"]["last_refresh"]
+    assert last_refresh["request_count"] == 1
+    assert last_refresh["bytes_received"] > 0
+    assert last_refresh["failed_requests"] == 0
+    assert len(last_refresh["batches"]) == 1
+    assert last_refresh["batches"][0]["seconds"] <= last_refresh["latency"]
+    assert last_refresh["rate_limit_remaining"] == 94
+    assert set(diagnostics["metrics"]["percentiles"]["latency"]) == {
+        "p50",
+        "p90",
+        "p99",
+    }
+    assert "abc123" not in str(diagnostics)
@@ -1,10 +1,27 @@
 """Test the trello config flow."""
-from unittest.mock import Mock
+import asyncio
+from datetime import timedelta
+import time
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
 
 from custom_components.trello import TrelloAdapter
+from custom_components.trello.api import Unauthorized
+from custom_components.trello.const import DOMAIN, MEMBER_BOARDS_CACHE_TTL, Member
 from homeassistant.core import HomeAssistant
-
+from homeassistant.helpers import device_registry as dr
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
 from . import BOARD_LISTS
+from .conftest import BATCH_URL, ComponentSetup, mock_batch, mock_fetch_json
 
 API_KEY = "an_api_key"
 API_TOKEN = "an_api_token"
@@ -20,32 +37,164 @@ BOARD_ID_LISTS = {
 USER_INPUT_CREDS = {"api_key": API_KEY, "api_token": API_TOKEN}
 
 
-async def test_flow_trello_adapter_get_member(hass: HomeAssistant) -> None:
-    """Test trello adapter returns the client libs authed member."""
-    mock_client = Mock()
-    mock_client.get_member.return_value = "a_member"
-
-    adapter = TrelloAdapter(mock_client)
-
-    actual = adapter.get_member()
-
-    assert actual == "a_member"
-
-
-async def test_flow_trello_adapter_get_boards(hass: HomeAssistant) -> None:
-    """Test trello adapter retrieving the users boards."""
-    mock_client = Mock()
-    mock_board = Mock(id=BOARD_ID)
-    mock_board.name = "a_board_name"
-    mock_board_2 = Mock(id="a_board_id_2")
-    mock_board_2.name = "a_board_name_2"
-    mock_client.list_boards.return_value = [mock_board, mock_board_2]
+async def test_flow_trello_adapter_get_member_boards(hass: HomeAssistant) -> None:
+    """Test trello adapter returns the authed member and their boards."""
+    mock_client = AsyncMock()
+    mock_client.async_fetch_json.return_value = {
+        "id": USER_ID,
+        "email": EMAIL_ADDR,
+        "boards": [
+            {"id": BOARD_ID, "name": "a_board_name"},
+            {"id": "a_board_id_2", "name": "a_board_name_2"},
+        ],
+        "organizations": [{"id": "a_workspace_id", "displayName": "A Workspace"}],
+    }
 
     adapter = TrelloAdapter(mock_client)
 
-    actual = adapter.get_boards()
+    member, boards = await adapter.async_get_member_boards()
+    workspaces = await adapter.async_get_workspaces()
 
-    assert actual == {
+    assert member == Member(USER_ID, EMAIL_ADDR)
+    assert boards == {
         BOARD_ID: {"id": BOARD_ID, "name": "a_board_name"},
         "a_board_id_2": {"id": "a_board_id_2", "name": "a_board_name_2"},
     }
+    assert workspaces == {"a_workspace_id": "A Workspace"}
+    mock_client.async_fetch_json.assert_awaited_once()
+
+
+async def test_flow_trello_adapter_boards_cached(hass: HomeAssistant) -> None:
+    """Test the member's boards are reused by adapters with the same creds."""
+    mock_client = AsyncMock()
+    mock_client.api_key = API_KEY
+    mock_client.api_token = API_TOKEN
+    mock_client.async_fetch_json.return_value = {
+        "id": USER_ID,
+        "email": EMAIL_ADDR,
+        "boards": [{"id": BOARD_ID, "name": "a_board_name"}],
+    }
+    cache: dict = {}
+
+    first = await TrelloAdapter(mock_client, cache).async_get_boards()
+    second = await TrelloAdapter(mock_client, cache).async_get_boards()
+
+    assert first == second == {BOARD_ID: {"id": BOARD_ID, "name": "a_board_name"}}
+    mock_client.async_fetch_json.assert_awaited_once()
+
+    with patch(
+        "custom_components.trello.time.monotonic",
+        return_value=time.monotonic() + MEMBER_BOARDS_CACHE_TTL,
+    ):
+        await TrelloAdapter(mock_client, cache).async_get_boards()
+
+    assert mock_client.async_fetch_json.await_count == 2
+
+    # The same token with another key isn't answered from the cache
+    other_client = AsyncMock()
+    other_client.api_key = "another_api_key"
+    other_client.api_token = API_TOKEN
+    other_client.async_fetch_json.side_effect = Unauthorized("invalid key")
+    with pytest.raises(Unauthorized):
+        await TrelloAdapter(other_client, cache).async_get_boards()
+
+
+async def test_update_entry_board_ids(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    setup_integration: ComponentSetup,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test changing boards fetches only added boards without reloading."""
+    await setup_integration()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    goals_board = coordinator.data["3a634d47a4cb1e9a9886a2e3"]
+
+    path_responses = mock_fetch_json("batch.json")
+    path_responses["/boards/a_new_board_id"] = {
+        "200": {"id": "a_new_board_id", "name": "New"}
+    }
+    path_responses["/boards/a_new_board_id/lists"] = {
+        "200": [{"id": "a_new_list_id", "name": "Backlog", "cards": []}]
+    }
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(BATCH_URL, side_effect=mock_batch(path_responses))
+
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={
+            "board_ids": [
+                "3a634d47a4cb1e9a9886a2e3",
+                "0c6646739c3a12b1bf3dfd3a",
+                "a_new_board_id",
+            ]
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert hass.data[DOMAIN][config_entry.entry_id] is coordinator
+    assert coordinator.data["3a634d47a4cb1e9a9886a2e3"] is goals_board
+    requested_urls = [call[1].query["urls"] for call in aioclient_mock.mock_calls]
+    assert len(requested_urls) == 1
+    assert "3a634d47a4cb1e9a9886a2e3" not in requested_urls[0]
+
+    assert hass.states.get("sensor.new_backlog").state == "0"
+    assert hass.states.get("sensor.ideas_planned") is None
+    device_registry = dr.async_get(hass)
+    assert (
+        device_registry.async_get_device({(DOMAIN, "bea542e091bc1bfe5e780c8f")})
+        is None
+    )
+
+
+async def test_setup_from_snapshot(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    aioclient_mock: AiohttpClientMocker,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test sensors start from saved data while Trello is being fetched."""
+    hass_storage[f"trello.{config_entry.entry_id}"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": f"trello.{config_entry.entry_id}",
+        "data": {
+            "boards": {
+                "3a634d47a4cb1e9a9886a2e3": [
+                    "Goals",
+                    [["c46d44769cdac5020be265db", "To Do", 5]],
+                ]
+            },
+            "last_activity": {},
+            "last_action_ids": {},
+        },
+    }
+    trello_responding = asyncio.Event()
+    batch_side_effect = mock_batch(mock_fetch_json("batch.json"))
+
+    async def slow_batch(method, url, data):
+        await trello_responding.wait()
+        return await batch_side_effect(method, url, data)
+
+    aioclient_mock.get(BATCH_URL, side_effect=slow_batch)
+    config_entry.add_to_hass(hass)
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.goals_to_do").state == "5"
+    assert hass.states.get("sensor.ideas_planned") is None
+
+    trello_responding.set()
+    await asyncio.gather(*config_entry._background_tasks)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.goals_to_do").state == "2"
+    assert hass.states.get("sensor.ideas_planned").state == "1"
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10))
+    await hass.async_block_till_done()
+    saved_boards = hass_storage[f"trello.{config_entry.entry_id}"]["data"]["boards"]
+    assert saved_boards["bea542e091bc1bfe5e780c8f"] == [
+        "Ideas",
+        [["d40f454db7b6e3ea4892c9be", "Planned", 1]],
+    ]
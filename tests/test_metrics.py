@@ -0,0 +1,38 @@
+"""Test the trello refresh metrics."""
+from custom_components.trello.metrics import (
+    BatchMetrics,
+    MetricsHistory,
+    RefreshMetrics,
+    percentiles,
+)
+from homeassistant.util import dt as dt_util
+
+
+def test_percentiles() -> None:
+    """Test nearest-rank percentiles."""
+    assert percentiles(range(1, 101)) == {"p50": 50, "p90": 90, "p99": 99}
+    assert percentiles([3.0]) == {"p50": 3.0, "p90": 3.0, "p99": 3.0}
+    assert percentiles([]) == {}
+
+
+def test_board_latency() -> None:
+    """Test a board's latency adds up the batches requesting it."""
+    history = MetricsHistory(maxlen=2)
+    for seconds in (1.0, 2.0, 3.0):
+        metrics = RefreshMetrics(dt_util.utcnow())
+        metrics.batches = [
+            BatchMetrics(["/boards/a?fields=name", "/boards/b"], seconds, []),
+            BatchMetrics(["/boards/a/lists?cards=open"], 0.5, ["/boards/a/lists"]),
+        ]
+        history.record(metrics)
+
+    assert history.last.board_latency("a") == 3.5
+    assert history.last.board_latency("b") == 3.0
+    assert history.last.board_latency("c") is None
+    assert history.board_latency("b") == 3.0
+    assert history.last.failed_requests == 1
+    assert history.board_latency_percentiles("a") == {
+        "p50": 2.5,
+        "p90": 3.5,
+        "p99": 3.5,
+    }
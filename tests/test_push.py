@@ -0,0 +1,302 @@
+"""Test the trello webhook push mode."""
+from collections.abc import Awaitable, Callable
+
+from aiohttp.test_utils import TestClient
+import pytest
+
+from custom_components.trello.const import DOMAIN
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+from .conftest import BATCH_URL, mock_batch, mock_fetch_json
+
+BOARD_ID = "3a634d47a4cb1e9a9886a2e3"
+TO_DO_LIST_ID = "c46d44769cdac5020be265db"
+DONE_LIST_ID = "07414c5aa9758dcb06022a73"
+
+
+def action(action_type: str, **data) -> dict:
+    """Build a webhook payload for a Trello action."""
+    return {
+        "action": {
+            "id": "an_action_id",
+            "type": action_type,
+            "data": {"board": {"id": BOARD_ID}, **data},
+        }
+    }
+
+
+async def test_push_mode_applies_actions(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    aioclient_mock: AiohttpClientMocker,
+    hass_client_no_auth: Callable[[], Awaitable[TestClient]],
+) -> None:
+    """Test pushed actions update sensors without refetching boards."""
+    webhook_url = await _async_setup_push(hass, config_entry, aioclient_mock)
+    client = await hass_client_no_auth()
+    batch_calls = _batch_call_count(aioclient_mock)
+
+    assert (await client.head(webhook_url)).status == 200
+
+    await client.post(
+        webhook_url,
+        json=action("createCard", card={"id": "new_card"}, list={"id": TO_DO_LIST_ID}),
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.goals_to_do").state == "3"
+
+    await client.post(
+        webhook_url,
+        json=action(
+            "updateCard",
+            card={"id": "new_card", "closed": True},
+            old={"closed": False},
+            list={"id": TO_DO_LIST_ID},
+        ),
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.goals_to_do").state == "2"
+
+    await client.post(
+        webhook_url,
+        json=action(
+            "updateList",
+            list={"id": DONE_LIST_ID, "name": "Finished"},
+            old={"name": "Done"},
+        ),
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.goals_done").name == "Goals Finished"
+
+    assert _batch_call_count(aioclient_mock) == batch_calls
+
+
+async def test_push_mode_updates_card_index(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    aioclient_mock: AiohttpClientMocker,
+    hass_client_no_auth: Callable[[], Awaitable[TestClient]],
+) -> None:
+    """Test pushed card actions update indexed cards without refetching boards."""
+    path_responses = mock_fetch_json("batch.json")
+    for path, response in path_responses.items():
+        if path.endswith("/lists"):
+            for list_ in response["200"]:
+                for card in list_["cards"]:
+                    card.update(name="A card", due=None, dueComplete=False)
+    webhook_url = await _async_setup_push(
+        hass, config_entry, aioclient_mock, {"todo_lists": True}, path_responses
+    )
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    client = await hass_client_no_auth()
+    batch_calls = _batch_call_count(aioclient_mock)
+
+    await client.post(
+        webhook_url,
+        json=action(
+            "createCard",
+            card={"id": "new_card", "name": "New card"},
+            list={"id": TO_DO_LIST_ID},
+        ),
+    )
+    await client.post(
+        webhook_url,
+        json=action(
+            "updateCard",
+            card={"id": "new_card", "name": "Renamed"},
+            old={"name": "New card"},
+            list={"id": TO_DO_LIST_ID},
+        ),
+    )
+    await hass.async_block_till_done()
+
+    assert coordinator.card_index.get("new_card").name == "Renamed"
+    assert hass.states.get("sensor.goals_to_do").state == "3"
+
+    # Cards are archived before they're deleted, which is only counted once
+    await client.post(
+        webhook_url,
+        json=action(
+            "updateCard",
+            card={"id": "new_card", "closed": True},
+            old={"closed": False},
+            list={"id": TO_DO_LIST_ID},
+        ),
+    )
+    await client.post(
+        webhook_url,
+        json=action("deleteCard", card={"id": "new_card"}, list={"id": TO_DO_LIST_ID}),
+    )
+    await hass.async_block_till_done()
+
+    assert "new_card" not in coordinator.card_index
+    assert hass.states.get("sensor.goals_to_do").state == "2"
+    assert _batch_call_count(aioclient_mock) == batch_calls
+
+
+async def test_push_mode_incomplete_action(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    aioclient_mock: AiohttpClientMocker,
+    hass_client_no_auth: Callable[[], Awaitable[TestClient]],
+) -> None:
+    """Test an action without the data its type should have isn't applied."""
+    webhook_url = await _async_setup_push(hass, config_entry, aioclient_mock)
+    client = await hass_client_no_auth()
+
+    response = await client.post(
+        webhook_url, json=action("createCard", card={"id": "new_card"})
+    )
+    await hass.async_block_till_done()
+
+    assert response.status == 200
+    assert hass.states.get("sensor.goals_to_do").state == "2"
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        action(
+            "updateList",
+            list={"id": DONE_LIST_ID, "name": "Done", "closed": False},
+            old={"closed": True},
+        ),
+        # Whether the card was open isn't known without the card index
+        action("deleteCard", card={"id": "a_card"}, list={"id": TO_DO_LIST_ID}),
+        action(
+            "updateCard",
+            card={"id": "a_card", "idList": DONE_LIST_ID},
+            old={"idList": TO_DO_LIST_ID},
+            listBefore={"id": TO_DO_LIST_ID},
+            listAfter={"id": DONE_LIST_ID},
+        ),
+    ],
+)
+async def test_push_mode_refreshes_board(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    aioclient_mock: AiohttpClientMocker,
+    hass_client_no_auth: Callable[[], Awaitable[TestClient]],
+    payload: dict,
+) -> None:
+    """Test an action that can't be applied refreshes its board right away."""
+    webhook_url = await _async_setup_push(hass, config_entry, aioclient_mock)
+    client = await hass_client_no_auth()
+    batch_calls = _batch_call_count(aioclient_mock)
+
+    await client.post(webhook_url, json=payload)
+    await hass.async_block_till_done()
+
+    # Boards aren't due again until the reconcile interval
+    assert _batch_call_count(aioclient_mock) > batch_calls
+
+
+async def test_push_mode_workspace_webhooks(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test workspace boards get webhooks, kept when other options change."""
+    path_responses = mock_fetch_json("batch.json")
+    workspace_boards = [{"id": "a_workspace_board_id", "name": "A Board", "lists": []}]
+    path_responses["/organizations/a_workspace_id/boards"] = {"200": workspace_boards}
+    await _async_setup_push(
+        hass,
+        config_entry,
+        aioclient_mock,
+        {"workspace_ids": ["a_workspace_id"]},
+        path_responses,
+    )
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    assert "a_workspace_board_id" in coordinator.board_ids
+    assert _webhook_call_count(aioclient_mock, "POST") == len(coordinator.board_ids)
+
+    hass.config_entries.async_update_entry(
+        config_entry, options={**config_entry.options, "stale_limit": 10}
+    )
+    await hass.async_block_till_done()
+
+    assert _webhook_call_count(aioclient_mock, "DELETE") == 0
+
+    workspace_boards.append(
+        {"id": "another_workspace_board_id", "name": "Another Board", "lists": []}
+    )
+    await coordinator.async_request_board_refresh(["a_workspace_board_id"])
+    await hass.async_block_till_done()
+
+    assert "another_workspace_board_id" in coordinator.board_ids
+    assert _webhook_call_count(aioclient_mock, "POST") == len(coordinator.board_ids)
+    assert _webhook_call_count(aioclient_mock, "DELETE") == 0
+
+
+async def test_push_mode_unreachable(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test push mode falls back to polling when Trello can't reach HA."""
+    hass.config.external_url = "https://example.com"
+    config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        config_entry, options={**config_entry.options, "update_mode": "push"}
+    )
+    aioclient_mock.get(BATCH_URL, side_effect=mock_batch(mock_fetch_json("batch.json")))
+    aioclient_mock.get("https://api.trello.com/1/tokens/123abc/webhooks", json=[])
+    aioclient_mock.post(
+        "https://api.trello.com/1/webhooks",
+        status=400,
+        text="URL (https://example.com) did not return 200 status code",
+    )
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    assert coordinator.default_interval.total_seconds() == 60
+    assert hass.states.get("sensor.goals_to_do").state == "2"
+
+
+async def _async_setup_push(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    aioclient_mock: AiohttpClientMocker,
+    options: dict | None = None,
+    path_responses: dict | None = None,
+) -> str:
+    """Set up the entry in push mode, returning its webhook's URL."""
+    hass.config.external_url = "https://example.com"
+    config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={**config_entry.options, "update_mode": "push", **(options or {})},
+    )
+    aioclient_mock.get(
+        BATCH_URL,
+        side_effect=mock_batch(path_responses or mock_fetch_json("batch.json")),
+    )
+    aioclient_mock.get("https://api.trello.com/1/tokens/123abc/webhooks", json=[])
+    aioclient_mock.post(
+        "https://api.trello.com/1/webhooks", json={"id": "a_trello_webhook_id"}
+    )
+    aioclient_mock.delete(
+        "https://api.trello.com/1/webhooks/a_trello_webhook_id", json={"_value": None}
+    )
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    return f"/api/webhook/{config_entry.data['webhook_id']}"
+
+
+def _webhook_call_count(aioclient_mock: AiohttpClientMocker, method: str) -> int:
+    return sum(
+        1
+        for call in aioclient_mock.mock_calls
+        if call[0] == method and call[1].path.startswith("/1/webhooks")
+    )
+
+
+def _batch_call_count(aioclient_mock: AiohttpClientMocker) -> int:
+    return sum(1 for call in aioclient_mock.mock_calls if call[1].path == "/1/batch")
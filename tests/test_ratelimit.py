@@ -0,0 +1,89 @@
+"""Test the trello rate limit governor."""
+from http import HTTPStatus
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from custom_components.trello.api import RateLimited
+from custom_components.trello.ratelimit import async_get_governor
+from homeassistant.core import HomeAssistant
+
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+    AiohttpClientMockResponse,
+)
+from .conftest import mock_client
+
+MEMBER_URL = "https://api.trello.com/1/members/me"
+
+RATE_LIMIT_HEADERS = {
+    "x-rate-limit-api-key-interval-ms": "10000",
+    "x-rate-limit-api-key-max": "300",
+    "x-rate-limit-api-key-remaining": "250",
+    "x-rate-limit-api-token-interval-ms": "10000",
+    "x-rate-limit-api-token-max": "100",
+    "x-rate-limit-api-token-remaining": "42",
+}
+
+
+async def test_governor_shared_by_key(hass: HomeAssistant) -> None:
+    """Test tokens using the same API key share the key's budget."""
+    governor = async_get_governor(hass, "a_key", "a_token")
+    other_token_governor = async_get_governor(hass, "a_key", "another_token")
+
+    assert governor.key_bucket is other_token_governor.key_bucket
+    assert governor.token_bucket is not other_token_governor.token_bucket
+    assert async_get_governor(hass, "a_key", "a_token").token_bucket is (
+        governor.token_bucket
+    )
+
+
+async def test_governor_updates_from_headers(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test the budget follows Trello's rate limit headers."""
+    aioclient_mock.get(MEMBER_URL, json={"id": "an_id"}, headers=RATE_LIMIT_HEADERS)
+    client = mock_client(hass)
+
+    await client.async_fetch_json("/members/me")
+
+    assert client.governor.remaining == 42
+
+
+async def test_rate_limited_retries_with_backoff(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test requests are retried with backoff when rate limited."""
+    statuses = [HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.TOO_MANY_REQUESTS]
+
+    async def side_effect(method, url, data):
+        if statuses:
+            return AiohttpClientMockResponse(method, url, status=statuses.pop())
+        return AiohttpClientMockResponse(method, url, json={"id": "an_id"})
+
+    aioclient_mock.get(MEMBER_URL, side_effect=side_effect)
+    client = mock_client(hass)
+
+    with patch(
+        "custom_components.trello.ratelimit.asyncio.sleep", new=AsyncMock()
+    ) as mock_sleep:
+        actual = await client.async_fetch_json("/members/me")
+
+    assert actual == {"id": "an_id"}
+    assert mock_sleep.call_count >= 2
+    assert aioclient_mock.call_count == 3
+
+
+async def test_rate_limited_gives_up(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test requests fail once retries are exhausted."""
+    aioclient_mock.get(MEMBER_URL, status=HTTPStatus.TOO_MANY_REQUESTS)
+    client = mock_client(hass)
+
+    with patch(
+        "custom_components.trello.ratelimit.asyncio.sleep", new=AsyncMock()
+    ), pytest.raises(RateLimited):
+        await client.async_fetch_json("/members/me")
+
+    assert aioclient_mock.call_count == 5
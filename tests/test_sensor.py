@@ -1,17 +1,32 @@
 """Test the trello config flow."""
-from datetime import timedelta
 from unittest.mock import patch
 
-from custom_components.trello.sensor import SensorStateClass
+from custom_components.trello.sensor import SensorStateClass, TrelloSensor
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
-from homeassistant.util import dt as dt_util
-
-from pytest_homeassistant_custom_component.common import async_fire_time_changed
-from .conftest import ComponentSetup, mock_fetch_json
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+from .conftest import (
+    BATCH_URL,
+    REFRESH_DUE,
+    ComponentSetup,
+    mock_batch,
+    mock_fetch_json,
+)
 
 
 async def test_sensor_setup_entry(
-    hass: HomeAssistant, setup_integration: ComponentSetup
+    hass: HomeAssistant,
+    setup_integration: ComponentSetup,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
 ) -> None:
     """Test sensors are set up and updated as expected."""
     await setup_integration()
@@ -20,7 +35,8 @@ async def test_sensor_setup_entry(
     all_devices = hass.data["device_registry"].devices.data.values()
 
     assert len(all_states) == 3
-    assert len(all_devices) == 2
+    # Boards without lists have a device for their diagnostic sensors
+    assert len(all_devices) == 3
 
     ideas_board_device = hass.data["device_registry"].async_get_device(
         {("trello", "bea542e091bc1bfe5e780c8f")}
@@ -52,13 +68,14 @@ async def test_sensor_setup_entry(
         assert entity.attributes["state_class"] == SensorStateClass.MEASUREMENT
         assert entity.attributes["unit_of_measurement"] == "Cards"
 
-    with patch(
-        "custom_components.trello.TrelloClient.fetch_json",
-        return_value=mock_fetch_json(path="update_batch_with_error.json"),
-    ):
-        future = dt_util.utcnow() + timedelta(seconds=60)
-        async_fire_time_changed(hass, future)
-        await hass.async_block_till_done()
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(
+        BATCH_URL,
+        side_effect=mock_batch(mock_fetch_json(path="update_batch_with_error.json")),
+    )
+    freezer.tick(REFRESH_DUE)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
 
     ideas_planned = hass.states.get("sensor.ideas_planned")
     goals_to_do = hass.states.get("sensor.goals_to_do")
@@ -67,3 +84,170 @@ async def test_sensor_setup_entry(
     assert ideas_planned.state == "unavailable"
     assert goals_to_do.state == "1"
     assert goals_done.state == "1"
+
+
+async def test_sensor_writes_only_changed_lists(
+    hass: HomeAssistant,
+    setup_integration: ComponentSetup,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test only sensors of changed lists write state, once each."""
+    await setup_integration()
+
+    path_responses = mock_fetch_json("batch.json")
+    goals = "/boards/3a634d47a4cb1e9a9886a2e3"
+    path_responses[goals]["200"]["dateLastActivity"] = "2023-10-02T08:30:00.000Z"
+    path_responses[f"{goals}/lists"]["200"][0]["cards"].pop()
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(BATCH_URL, side_effect=mock_batch(path_responses))
+
+    with patch.object(
+        TrelloSensor, "async_write_ha_state", autospec=True
+    ) as mock_write_ha_state:
+        freezer.tick(REFRESH_DUE)
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+    assert [call.args[0].entity_id for call in mock_write_ha_state.call_args_list] == [
+        "sensor.goals_to_do"
+    ]
+
+
+async def test_sensor_lists_added_and_removed(
+    hass: HomeAssistant,
+    setup_integration: ComponentSetup,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test sensors are added for new lists and removed for closed lists."""
+    await setup_integration()
+
+    path_responses = mock_fetch_json("batch.json")
+    goals = "/boards/3a634d47a4cb1e9a9886a2e3"
+    path_responses[goals]["200"]["dateLastActivity"] = "2023-10-02T08:30:00.000Z"
+    goals_lists = path_responses[f"{goals}/lists"]["200"]
+    goals_lists.pop()
+    goals_lists.append({"id": "a_new_list_id", "name": "Doing", "cards": []})
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(BATCH_URL, side_effect=mock_batch(path_responses))
+
+    freezer.tick(REFRESH_DUE)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.goals_doing").state == "0"
+    assert hass.states.get("sensor.goals_done") is None
+    assert hass.states.get("sensor.goals_to_do").state == "2"
+    assert hass.states.get("sensor.ideas_planned").state == "1"
+    entity_registry = er.async_get(hass)
+    assert entity_registry.async_get("sensor.goals_done") is None
+
+
+async def test_sensor_refresh_latency(
+    hass: HomeAssistant,
+    setup_integration: ComponentSetup,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test the diagnostic refresh latency sensors once enabled."""
+    entity_registry = er.async_get(hass)
+    entity_registry.async_get_or_create(
+        "sensor",
+        "trello",
+        "board_3a634d47a4cb1e9a9886a2e3_refresh_latency",
+        suggested_object_id="goals_refresh_latency",
+        config_entry=config_entry,
+    )
+
+    await setup_integration()
+
+    goals_latency = hass.states.get("sensor.goals_refresh_latency")
+    assert float(goals_latency.state) >= 0
+    assert set(goals_latency.attributes) >= {"p50", "p90", "p99"}
+    assert goals_latency.attributes["unit_of_measurement"] == "ms"
+    ideas_latency = entity_registry.async_get("sensor.ideas_refresh_latency")
+    assert ideas_latency.disabled_by == er.RegistryEntryDisabler.INTEGRATION
+    assert ideas_latency.entity_category == EntityCategory.DIAGNOSTIC
+    assert hass.states.get("sensor.ideas_refresh_latency") is None
+
+
+async def test_sensor_card_sensors(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test card sensors are counted from the cards and follow labels."""
+    config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={
+            **config_entry.options,
+            "card_sensors": [
+                "labels",
+                "members",
+                "no_members",
+                "overdue",
+                "due_soon",
+            ],
+        },
+    )
+    path_responses = mock_fetch_json("card_sensors_batch.json")
+    aioclient_mock.get(BATCH_URL, side_effect=mock_batch(path_responses))
+    assert await async_setup_component(hass, "trello", {})
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.goals_label_urgent").state == "2"
+    assert hass.states.get("sensor.goals_label_green").state == "0"
+    assert hass.states.get("sensor.goals_assigned_to_foo_bar").state == "1"
+    assert hass.states.get("sensor.goals_cards_without_members").state == "1"
+    assert hass.states.get("sensor.goals_overdue_cards").state == "1"
+    assert hass.states.get("sensor.goals_cards_due_soon").state == "0"
+    assert hass.states.get("sensor.ideas_cards_without_members").state == "1"
+    assert hass.states.get("sensor.ideas_overdue_cards").state == "0"
+    assert "idLabels" in aioclient_mock.mock_calls[0][1].query["urls"]
+
+    goals = "/boards/3a634d47a4cb1e9a9886a2e3"
+    path_responses[goals]["200"]["dateLastActivity"] = "2023-10-02T08:30:00.000Z"
+    path_responses[goals]["200"]["labels"].pop()
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(BATCH_URL, side_effect=mock_batch(path_responses))
+    freezer.tick(REFRESH_DUE)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.goals_label_green") is None
+    assert hass.states.get("sensor.goals_label_urgent").state == "2"
+
+
+async def test_sensor_summarized_boards(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    setup_integration: ComponentSetup,
+) -> None:
+    """Test a summarized board has one sensor besides its promoted lists."""
+    config_entry.add_to_hass(hass)
+    summary_options = {
+        **config_entry.options,
+        "summary_board_ids": ["3a634d47a4cb1e9a9886a2e3"],
+        "promoted_list_ids": ["c46d44769cdac5020be265db"],
+    }
+    hass.config_entries.async_update_entry(config_entry, options=summary_options)
+    await setup_integration()
+
+    goals_cards = hass.states.get("sensor.goals_cards")
+    assert goals_cards.state == "2"
+    assert goals_cards.attributes["lists"] == {"To Do": 2, "Done": 0}
+    assert hass.states.get("sensor.goals_to_do").state == "2"
+    assert hass.states.get("sensor.goals_done") is None
+    assert hass.states.get("sensor.ideas_planned").state == "1"
+
+    # Options are applied without reloading
+    hass.config_entries.async_update_entry(
+        config_entry, options={**summary_options, "summary_board_ids": []}
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.goals_done").state == "0"
+    assert hass.states.get("sensor.goals_to_do").state == "2"
+    assert er.async_get(hass).async_get("sensor.goals_cards") is None
@@ -0,0 +1,107 @@
+"""Test the trello services."""
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.trello.const import DOMAIN
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+from .conftest import ComponentSetup
+
+BOARD_ID = "3a634d47a4cb1e9a9886a2e3"
+TO_DO_LIST_ID = "c46d44769cdac5020be265db"
+DONE_LIST_ID = "07414c5aa9758dcb06022a73"
+
+
+async def test_services_write_together(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    setup_integration: ComponentSetup,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test writes update sensors right away and the board is fetched once."""
+    await setup_integration()
+    aioclient_mock.post(
+        "https://api.trello.com/1/cards", json={"id": "new_card", "idBoard": BOARD_ID}
+    )
+    aioclient_mock.put(
+        "https://api.trello.com/1/cards/a_card",
+        json={"id": "a_card", "idBoard": BOARD_ID},
+    )
+    aioclient_mock.put(
+        f"https://api.trello.com/1/lists/{DONE_LIST_ID}",
+        json={"id": DONE_LIST_ID, "idBoard": BOARD_ID},
+    )
+    call_count = len(aioclient_mock.mock_calls)
+
+    with patch("custom_components.trello.writes.WRITE_COALESCE_DELAY", 0):
+        for name in ("A card", "Another card"):
+            await hass.services.async_call(
+                DOMAIN,
+                "create_card",
+                {"list_id": TO_DO_LIST_ID, "name": name},
+                blocking=True,
+            )
+        await hass.services.async_call(
+            DOMAIN,
+            "update_card",
+            {"card_id": "a_card", "list_id": DONE_LIST_ID},
+            blocking=True,
+        )
+        await hass.services.async_call(
+            DOMAIN,
+            "update_card",
+            {"card_id": "a_card", "name": "Renamed"},
+            blocking=True,
+        )
+        await hass.services.async_call(
+            DOMAIN,
+            "update_list",
+            {"list_id": DONE_LIST_ID, "name": "Finished"},
+            blocking=True,
+        )
+
+        assert hass.states.get("sensor.goals_to_do").state == "4"
+        assert hass.states.get("sensor.goals_done").name == "Goals Finished"
+
+        await hass.async_block_till_done()
+
+    writes = aioclient_mock.mock_calls[call_count:]
+    assert sorted(call[0] for call in writes) == ["GET", "POST", "POST", "PUT", "PUT"]
+    card_put = next(call for call in writes if call[1].path == "/1/cards/a_card")
+    assert card_put[1].query["idList"] == DONE_LIST_ID
+    assert card_put[1].query["name"] == "Renamed"
+    # Fetching the board again replaces what was applied right away
+    assert hass.states.get("sensor.goals_to_do").state == "2"
+
+
+async def test_services_unknown_list(
+    hass: HomeAssistant, setup_integration: ComponentSetup
+) -> None:
+    """Test writing to a list on an untracked board fails right away."""
+    await setup_integration()
+
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN,
+            "delete_list",
+            {"list_id": "an_unknown_list_id"},
+            blocking=True,
+        )
+
+
+async def test_services_removed_on_unload(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    setup_integration: ComponentSetup,
+) -> None:
+    """Test the services are removed with the last config entry."""
+    await setup_integration()
+    assert hass.services.has_service(DOMAIN, "create_card")
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+
+    assert not hass.services.has_service(DOMAIN, "create_card")
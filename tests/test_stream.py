@@ -0,0 +1,68 @@
+"""Test parsing batch responses as they are received."""
+import json
+
+import pytest
+
+from custom_components.trello.stream import BatchParser, get_compact
+
+BATCH = [
+    {"200": {"id": "board_0", "name": 'A "quoted" [board] {name}'}},
+    {
+        "200": [
+            {
+                "id": "list_0",
+                "name": "Tâches ✓",
+                "cards": [{"id": "a"}, {"id": "b"}],
+            },
+            {"id": "list_1", "name": "Done", "cards": []},
+        ]
+    },
+    {"200": []},
+    {"200": [12.5, 'C:\\ "]}" \\', True, None]},
+    {"name": "NotFoundError", "message": "Not found", "statusCode": 404},
+]
+
+
+def test_parse_any_chunks() -> None:
+    """Test the same responses are parsed however the body is split."""
+    body = json.dumps(BATCH, ensure_ascii=False, indent=1).encode()
+
+    for size in (1, 2, 7, len(body)):
+        parser = BatchParser()
+        for i in range(0, len(body), size):
+            parser.feed(body[i : i + size])
+
+        assert parser.close() == BATCH
+
+
+def test_parse_counting_cards() -> None:
+    """Test lists fetched only to count their cards keep only the count."""
+    parser = BatchParser(
+        get_compact(
+            [
+                "/boards/board_0?fields=name",
+                "/boards/board_0/lists?fields=name&cards=open&card_fields=id",
+                "/boards/board_1/lists?cards=open&card_fields=name%2Cdue",
+            ]
+        )
+    )
+    parser.feed(json.dumps(BATCH[:2] + [BATCH[1]]).encode())
+
+    responses = parser.close()
+
+    assert responses[0] == BATCH[0]
+    assert responses[1]["200"] == [
+        {"id": "list_0", "name": "Tâches ✓", "cardCount": 2},
+        {"id": "list_1", "name": "Done", "cardCount": 0},
+    ]
+    assert responses[2] == BATCH[1]
+
+
+@pytest.mark.parametrize("body", [b'[{"200": [{"id": "a"}', b'[{"200": 1}] x', b"{}"])
+def test_parse_invalid(body: bytes) -> None:
+    """Test a body that isn't a complete batch response fails to parse."""
+    parser = BatchParser()
+
+    with pytest.raises(ValueError):
+        parser.feed(body)
+        parser.close()
@@ -0,0 +1,142 @@
+"""Test the trello writes."""
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.trello.api import TrelloError
+from custom_components.trello.coordinator import TrelloDataUpdateCoordinator
+from custom_components.trello.writes import (
+    async_archive_card,
+    async_create_card,
+    async_update_card,
+)
+from homeassistant.core import HomeAssistant
+
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+from .conftest import BATCH_URL, mock_batch, mock_client
+
+
+async def test_card_index_writes(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test writes are applied right away, sent together and reconciled once."""
+    path_responses = {
+        "/boards/board_0": {"200": {"id": "board_0", "name": "A Board"}},
+        "/boards/board_0/lists": {
+            "200": [
+                {
+                    "id": "list_0",
+                    "name": "To Do",
+                    "cards": [
+                        {
+                            "id": "card_0",
+                            "name": "A card",
+                            "due": None,
+                            "dueComplete": False,
+                        }
+                    ],
+                }
+            ]
+        },
+    }
+    aioclient_mock.get(BATCH_URL, side_effect=mock_batch(path_responses))
+    aioclient_mock.post(
+        "https://api.trello.com/1/cards",
+        json={"id": "card_1", "idBoard": "board_0", "name": "New card"},
+    )
+    aioclient_mock.put(
+        "https://api.trello.com/1/cards/card_0",
+        json={"id": "card_0", "idBoard": "board_0"},
+    )
+    aioclient_mock.put(
+        "https://api.trello.com/1/cards/card_1",
+        status=HTTPStatus.INTERNAL_SERVER_ERROR,
+    )
+    coordinator = TrelloDataUpdateCoordinator(
+        hass, mock_client(hass), ["board_0"], todo_lists=True
+    )
+    await coordinator.async_refresh()
+
+    assert "name%2Cdue%2CdueComplete" in aioclient_mock.mock_calls[0][1].query["urls"]
+    assert [card.name for card in coordinator.card_index.list_cards("list_0")] == [
+        "A card"
+    ]
+
+    data = coordinator.data
+    with patch("custom_components.trello.writes.WRITE_COALESCE_DELAY", 0):
+        create = async_create_card(coordinator, "list_0", "New card")
+        rename = async_update_card(coordinator, "card_0", name="Renamed")
+        complete = async_update_card(coordinator, "card_0", due_complete=True)
+
+        assert complete is rename
+        assert coordinator.data["board_0"].lists["list_0"].card_count == 2
+        # Data a refresh may have taken is replaced rather than changed
+        assert data["board_0"].lists["list_0"].card_count == 1
+        assert coordinator.card_index.get("card_0").name == "Renamed"
+        assert coordinator.card_index.get("card_0").due_complete
+
+        path_responses["/boards/board_0/lists"]["200"][0]["cards"] = [
+            {"id": "card_0", "name": "Renamed", "due": None, "dueComplete": True},
+            {"id": "card_1", "name": "New card", "due": None, "dueComplete": False},
+        ]
+        await create.async_wait()
+        await rename.async_wait()
+        await hass.async_block_till_done()
+
+        methods = sorted(call[0] for call in aioclient_mock.mock_calls[1:])
+        assert methods == ["GET", "POST", "PUT"]
+        put_call = next(
+            call for call in aioclient_mock.mock_calls if call[0] == "PUT"
+        )
+        assert put_call[1].query["name"] == "Renamed"
+        assert put_call[1].query["dueComplete"] == "true"
+        cards = coordinator.card_index.list_cards("list_0")
+        assert [(card.id, card.due_complete) for card in cards] == [
+            ("card_0", True),
+            ("card_1", False),
+        ]
+
+        archive = async_archive_card(coordinator, "card_1")
+
+        assert coordinator.data["board_0"].lists["list_0"].card_count == 1
+        with pytest.raises(TrelloError):
+            await archive.async_wait()
+        await hass.async_block_till_done()
+
+    # The failed write is undone by fetching the board again
+    assert coordinator.data["board_0"].lists["list_0"].card_count == 2
+    assert "card_1" in coordinator.card_index
+    assert len(aioclient_mock.mock_calls) == 6
+
+
+async def test_card_moves_writes(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test cards indexed for card events are moved and archived right away."""
+    path_responses = {
+        "/boards/board_0": {"200": {"id": "board_0", "name": "A Board"}},
+        "/boards/board_0/lists": {
+            "200": [
+                {"id": "list_0", "name": "To Do", "cards": [{"id": "card_0"}]},
+                {"id": "list_1", "name": "Done", "cards": [{"id": "card_1"}]},
+            ]
+        },
+    }
+    aioclient_mock.get(BATCH_URL, side_effect=mock_batch(path_responses))
+    coordinator = TrelloDataUpdateCoordinator(
+        hass, mock_client(hass), ["board_0"], card_events=True
+    )
+    await coordinator.async_refresh()
+
+    with patch("custom_components.trello.writes.WRITE_COALESCE_DELAY", 60):
+        async_update_card(coordinator, "card_0", list_id="list_1")
+
+        lists = coordinator.data["board_0"].lists
+        assert (lists["list_0"].card_count, lists["list_1"].card_count) == (0, 2)
+
+        async_archive_card(coordinator, "card_1")
+        async_update_card(coordinator, "unknown_card", list_id="list_0")
+
+        lists = coordinator.data["board_0"].lists
+        assert (lists["list_0"].card_count, lists["list_1"].card_count) == (0, 1)